@@ -0,0 +1,69 @@
+#This code developed by Vahid Vahidinasab
+#LC4HW: lifecycle costs and emissions of hot water heating technologies, as one multipage Streamlit app.
+#Run with `streamlit run app.py`. The pages are listed in app_pages/__init__.py; only the selected page's
+#script runs on a rerun, on top of the sidebar built here.
+
+import time
+import uuid
+
+import streamlit as st
+
+from app_pages import pages
+from app_pages.common import load_logo, profiling_enabled, scenario_store
+from lc4hw.cache import cache_stats
+from lc4hw.export import formats as export_formats
+from lc4hw.profiling import Profiler, changed_inputs
+
+st.set_page_config(page_title="LC4HW", layout="wide")
+rerun_cpu_start = time.thread_time()  # CPU of this script run, see app_pages.common.fragment
+
+# Optional per-rerun profiling (sidebar "Debug" checkbox or LC4HW_PROFILE=1), appended to logs/profile.jsonl
+profiler = Profiler(enabled=profiling_enabled())
+st.session_state["profiler"] = profiler
+if "session_id" not in st.session_state:
+    st.session_state["session_id"] = uuid.uuid4().hex[:12]
+
+with profiler.stage("logo"):
+    load_logo()
+
+page = st.navigation([st.Page(path, title=title, icon=icon, default=i == 0) for i, (path, title, icon) in enumerate(pages)])
+chart_backend = st.sidebar.radio("📊 Chart Style", ["Static", "Interactive"], index=0, horizontal=True, key="chart_backend")
+export_format = st.sidebar.radio("📥 Export Format", list(export_formats), index=0, horizontal=True, key="export_format")
+page_inputs = {"page": page.title, "chart_backend": chart_backend}
+st.session_state["page_inputs"] = page_inputs
+
+# The rerun is finished and logged even when the page ends early (st.stop, an error or a rerun request),
+# which also stops memory tracing
+record = None
+try:
+    page.run()
+finally:
+    st.session_state["rerun_cpu"] = time.thread_time() - rerun_cpu_start
+    if profiler.enabled:
+        profiler.lap("(rest of page)")
+        changed = changed_inputs(st.session_state.get("profile_inputs"), page_inputs)
+        st.session_state["profile_inputs"] = page_inputs
+        record = profiler.finish(st.session_state["session_id"], page.title, changed)
+        st.session_state["profiler"] = Profiler()  # finished; a fragment rerun until the next full rerun profiles itself
+
+# Debug panel: stages of this rerun, logged with the session id, page and the inputs that changed
+st.sidebar.markdown("---")
+st.sidebar.checkbox("🛠️ Debug: profile reruns", key="debug_profile", help="Record wall time and memory of each stage of every rerun in logs/profile.jsonl")
+if record is not None:
+    import pandas as pd
+
+    with st.sidebar.expander(f"Rerun profile: {record['total_s'] * 1000:,.0f} ms", expanded=True):
+        st.dataframe(pd.DataFrame(record["stages"]).set_index("stage").round(3))
+        st.caption(f"Session {st.session_state['session_id']}; changed: {', '.join(changed[:8]) or 'nothing'}{' ...' if len(changed) > 8 else ''}")
+        if page.title == "Main Calculator":
+            if st.session_state.get("calculation_source") == "store":
+                st.caption("Calculation graph: not run, the scenario store served this scenario")
+            else:
+                counters = st.session_state["calculation_graph"].counters()
+                st.caption(f"Calculation graph: {counters['computed']} of {counters['nodes']} nodes recomputed, {counters['reused']} reused")
+        store_stats = scenario_store().stats()
+        st.caption(f"Scenario store: {store_stats['entries']} scenarios ({store_stats['bytes'] / 1024:,.0f} KB), "
+                   f"{store_stats['hits']} hits and {store_stats['misses']} misses in this process")
+        shared_stats = cache_stats()
+        st.caption(f"Shared caches: {shared_stats['total']['bytes'] / 1024 ** 2:,.1f} of {shared_stats['total']['max_bytes'] / 1024 ** 2:,.0f} MB; "
+                   + ", ".join(f"{name} {stats['entries']}" for name, stats in shared_stats.items() if name != "total" and stats["entries"]))
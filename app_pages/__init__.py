@@ -0,0 +1,13 @@
+#Pages of the LC4HW app (app.py). Each page is a script of its own, executed only while it is the selected
+#page, so the imports and calculations of one page are never paid for on another.
+
+# (file relative to the repository root, title, icon); the first page is the default
+pages = [
+    ("app_pages/main_calculator.py", "Main Calculator", "🏠"),
+    ("app_pages/lpg_vs_electric.py", "LPG vs Electric", "🔥"),
+    ("app_pages/h2_comparison.py", "Hydrogen Comparison", "💨"),
+    ("app_pages/energy_calculator.py", "Hot Water Energy Calculator", "💧"),
+    ("app_pages/loan_calculator.py", "Loan Calculator", "🏦"),
+    ("app_pages/portfolio.py", "Portfolio Assessment", "🏢"),
+    ("app_pages/time_of_use.py", "Time-of-Use Simulation", "⏱️"),
+]
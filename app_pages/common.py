@@ -0,0 +1,116 @@
+#Streamlit helpers shared by the pages of app.py.
+#app.py creates the sidebar settings (chart style, export format) and the rerun profiler before it runs the
+#selected page; the pages reach them through st.session_state, since each page file is executed on its own.
+
+import functools
+import os
+import time
+
+import streamlit as st
+
+from lc4hw.cache import load_image
+from lc4hw.export import formats as export_formats, to_bytes
+from lc4hw.profiling import Profiler
+from lc4hw.store import ScenarioStore, prewarm
+
+
+def load_logo():
+    # Decoded and downsized once per server process (see lc4hw.cache.load_image), not on every rerun
+    logo_path1 = "salford_logo.png"
+    logo_path2 = "V.png"
+    try:
+        logo1 = load_image(logo_path1)
+        logo2 = load_image(logo_path2)
+        st.sidebar.image(logo1, width="stretch")
+        st.sidebar.image(logo2, width="stretch")
+    except Exception:
+        st.sidebar.error("❌ Logo not found. Please make sure the logo file is in the same directory as the script.")
+    st.sidebar.markdown("©2025 Vahid Vahidinasab. Follow me on: [LinkedIn](https://www.linkedin.com/in/vahid-vahidinasab/) | [GitHub](https://github.com/vahidinasab)", unsafe_allow_html=True)
+    st.sidebar.markdown("---")
+
+
+@st.cache_resource
+def scenario_store():
+    # One SQLite scenario store per server process, pre-warmed with the default scenario of every calculator page
+    store = ScenarioStore()
+    prewarm(store)
+    return store
+
+
+def profiling_enabled():
+    # Sidebar "Debug" checkbox or LC4HW_PROFILE=1
+    return st.session_state.get("debug_profile", False) or os.environ.get("LC4HW_PROFILE") == "1"
+
+
+def current_profiler():
+    # The Profiler of the current rerun (lc4hw.profiling), created by app.py, or of the running fragment
+    return st.session_state["profiler"]
+
+
+def current_page_inputs():
+    # Inputs of the current rerun, compared with the previous rerun's in the debug panel; pages add their own
+    return st.session_state["page_inputs"]
+
+
+def fragment(func):
+    """st.fragment that also records the CPU time of each run of func.
+
+    A widget inside a fragment reruns only that function instead of the whole page. The CPU seconds of the
+    latest run are kept in st.session_state["fragment_cpu"][func.__name__], next to the full rerun's
+    st.session_state["rerun_cpu"] set by app.py (see benchmarks/interactions.py). When profiling is on,
+    every run has its own Profiler, logged with func.__name__ as the page; within a full rerun the fragment
+    is also one stage of the rerun's profile.
+    """
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        outer = st.session_state.get("profiler") or Profiler()
+        profiler = Profiler(enabled=profiling_enabled())
+        st.session_state["profiler"] = profiler
+        start = time.thread_time()
+        try:
+            with outer.stage(f"fragment: {func.__name__}"):
+                return func(*args, **kwargs)
+        finally:
+            st.session_state.setdefault("fragment_cpu", {})[func.__name__] = time.thread_time() - start
+            st.session_state["profiler"] = outer
+            profiler.lap("(rest of fragment)")
+            profiler.finish(st.session_state.get("session_id"), func.__name__)
+
+    return st.fragment(timed)
+
+
+def show_chart(chart, *args, native=None, **kwargs):
+    # Static charts are rendered to PNG once per distinct data/selection and cached (see lc4hw.charts.render_chart);
+    # the interactive backend draws the same data with Streamlit's native charts instead
+    from lc4hw.charts import render_chart
+
+    with current_profiler().stage(f"chart: {chart.__name__}"):
+        if native is not None and st.session_state.get("chart_backend") == "Interactive":
+            native()
+        else:
+            st.image(render_chart(chart, *args, **kwargs))
+
+
+def download_button(label, file_stem, make_chunks, key=None):
+    # The file is only generated when the button is clicked, streamed chunk by chunk into one buffer (see lc4hw.export)
+    fmt = st.session_state.get("export_format", "csv")
+    mime, extension = export_formats[fmt]
+    # Streamlit generates the file on its own thread after the rerun has finished, so it is profiled as a run of its own
+    enabled, session = profiling_enabled(), st.session_state.get("session_id")
+
+    def export():
+        profiler = Profiler(enabled=enabled)
+        try:
+            with profiler.stage(f"export: {file_stem}"):
+                return to_bytes(make_chunks(), fmt)
+        finally:
+            profiler.finish(session, f"export: {file_stem}")
+
+    st.download_button(label, data=export, file_name=f"{file_stem}.{extension}", mime=mime, key=key)
+
+
+def wide_series(results, systems, column):
+    # Year-indexed table with one column per system, for the native line charts
+    import pandas as pd
+
+    return pd.DataFrame({system: results[system].set_index("Year")[column] for system in systems})
@@ -0,0 +1,14 @@
+#Hot Water Energy Calculator: input energy needed per litre of hot water.
+
+import streamlit as st
+
+from lc4hw.core import calculate_energy_needed, lpg_energy_content
+
+st.title("🔥 Hot Water Boiler Energy Calculator 💧")
+cold_temp = st.number_input("🌡️ Cold Water Temperature (°C)", value=10.0)
+hot_temp = st.number_input("🔥 Hot Water Temperature (°C)", value=65.0)
+efficiency = st.number_input("⚙️ Boiler Efficiency (decimal)", value=0.9, min_value=0.1, max_value=1.0)
+
+if st.button("🚀 Calculate Energy per Liter"):
+    energy_needed = calculate_energy_needed(hot_temp, cold_temp, efficiency)
+    st.success(f"💡 Energy Required per 100 Litres of Hot Water is: {100*energy_needed:.4f} kWh which is equivalent of {100*(energy_needed/lpg_energy_content):.4f} litres of LPG")
@@ -0,0 +1,66 @@
+#Hydrogen Comparison: total cost of the heating technologies for a daily hot water demand over a custom life cycle.
+
+import pandas as pd
+import streamlit as st
+
+from app_pages.common import scenario_store
+from lc4hw.charts import render_chart, line_chart
+from lc4hw.scenarios import h2_record
+
+st.title("Heating System Cost Comparison")
+st.markdown("Compare the cost of different heating technologies over a custom life cycle.")
+
+# User inputs
+years = st.number_input("Life Cycle (years)", min_value=5, max_value=30, value=10)
+daily_water_usage = st.number_input("Daily Hot Water Usage (Litres)", min_value=50, max_value=1000, value=400, help="Litres per day")
+temp_rise = st.slider("Temperature Rise (°C)", min_value=30, max_value=60, value=55, help="From cold to required temperature")
+
+# Default installation costs
+st.subheader("Installation Costs (After Grants)")
+install_costs = {
+    "Electric Boiler": st.number_input("Electric Boiler (£)", min_value=500, max_value=5000, value=2000),
+    "LPG Boiler": st.number_input("LPG Boiler (£)", min_value=1000, max_value=5000, value=3000),
+    "Heat Pump": st.number_input("Heat Pump (£, after grants)", min_value=2000, max_value=12000, value=2500),
+    "Hydrogen Boiler": st.number_input("Hydrogen Boiler (£)", min_value=2000, max_value=6000, value=3500),
+}
+
+# Efficiency of each system
+efficiencies = {
+    "Electric Boiler": 1.0,
+    "LPG Boiler": st.slider("LPG Boiler Efficiency (%)", 50, 100, 90) / 100,
+    "Heat Pump": st.slider("Heat Pump Efficiency (COP)", 2.0, 5.0, 3.5, step=0.1),
+    "Hydrogen Boiler": st.slider("Hydrogen Boiler Efficiency (%)", 50, 100, 85) / 100,
+}
+
+# Energy prices & escalation
+st.subheader("Energy Prices & Escalation Rates")
+fuel_costs = {
+    "Electric Boiler": st.number_input("Electricity (£/kWh)", min_value=0.1, max_value=1.0, value=0.28),
+    "LPG Boiler": st.number_input("LPG (£/litre)", min_value=0.3, max_value=2.0, value=0.8),
+    "Heat Pump": st.number_input("Electricity for Heat Pump (£/kWh)", min_value=0.1, max_value=1.0, value=0.28),
+    "Hydrogen Boiler": st.number_input("Hydrogen (£/kWh)", min_value=0.5, max_value=3.0, value=2.5),
+}
+
+escalation_rate = st.slider("Energy Price Escalation (% per year)", 0, 10, 2, help="Annual increase in energy costs")
+
+# Calculation, loaded from the scenario store when this scenario was computed before (see lc4hw.store)
+inputs = {"years": years, "daily_water_usage": daily_water_usage, "temp_rise": temp_rise, "install_costs": install_costs,
+          "efficiencies": efficiencies, "fuel_costs": fuel_costs, "escalation_rate": escalation_rate}
+record = scenario_store().fetch("h2_comparison", inputs, h2_record)
+results = {system: pd.DataFrame({"Year": range(1, years + 1), "Cost": record["annual_costs"][i]}) for i, system in enumerate(install_costs)}
+total_costs = dict(zip(install_costs, record["total_costs"].tolist()))
+
+# Display Results
+st.subheader(f"{years}-Year Total Cost Comparison")
+cost_df = pd.DataFrame.from_dict(total_costs, orient='index', columns=['Total Cost (£)']).sort_values(by='Total Cost (£)')
+st.table(cost_df)
+
+# Plot results
+st.subheader("Annual Running Costs Over Time")
+st.image(render_chart(line_chart, results, list(results), legend_loc="best"))
+
+# Verbal explanation
+cheapest_system = cost_df.index[0]
+st.subheader("Final Recommendation")
+st.markdown(f"**{cheapest_system} is the most cost-effective choice over {years} years.**")
+st.markdown(f"This is based on a total estimated cost of **£{total_costs[cheapest_system]:,.2f}**, including installation and energy expenses.")
@@ -0,0 +1,65 @@
+#Loan Calculator: monthly payment and amortization schedule of a loan, and a comparison of loan products
+#for financing the installation of each technology.
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from app_pages.common import current_profiler, download_button
+from lc4hw.cache import cached_call
+from lc4hw.core import calculate_loan_payment
+from lc4hw.defaults import main_calculator_defaults
+from lc4hw.finance import amortization_schedule, yearly_schedule, financing_grid, grid_to_frame
+
+profiler = current_profiler()
+
+st.title("🏦 Loan Assessment")
+loan_system = st.selectbox("🔧 Finance the installation of", ["Custom amount"] + main_calculator_defaults["systems"])
+default_amount = 10000 if loan_system == "Custom amount" else main_calculator_defaults["install_costs"][loan_system]
+loan_amount = st.number_input("💰 Loan Amount (£)", value=default_amount, key=f"loan_amount_{loan_system}")
+interest_rate = st.number_input("📈 Annual Interest Rate (%)", value=5.0) / 100
+loan_term = st.number_input("📅 Loan Term (years)", min_value=1, value=10)
+
+monthly_payment = calculate_loan_payment(loan_amount, interest_rate, loan_term)
+st.metric("💳 Monthly Loan Payment (£)", f"{monthly_payment:,.2f}")
+
+profiler.lap("inputs")
+schedule = amortization_schedule(loan_amount, interest_rate, loan_term)
+yearly = yearly_schedule(schedule)
+profiler.lap("calculation")
+st.subheader("📑 Amortization Schedule")
+yearly_df = pd.DataFrame({"Payments (£)": yearly["payment"], "Interest (£)": yearly["interest"], "Principal Repaid (£)": yearly["principal"],
+                          "Closing Balance (£)": yearly["balance"]}, index=pd.Index(yearly["year"], name="Year"))
+st.metric("💷 Total Interest (£)", f"{schedule['interest'].sum():,.2f}")
+st.line_chart(pd.DataFrame({"Balance (£)": schedule["balance"]}, index=pd.Index(schedule["month"], name="Month")))
+st.dataframe(yearly_df.style.format("{:,.2f}"))
+monthly_df = pd.DataFrame({"Month": schedule["month"], "Payment (£)": schedule["payment"], "Interest (£)": schedule["interest"],
+                           "Principal (£)": schedule["principal"], "Balance (£)": schedule["balance"]})
+download_button("📥 Download Monthly Schedule", "Amortization_Schedule", lambda df=monthly_df: [df])
+
+st.markdown("---")
+st.subheader("📊 Loan Product Comparison")
+st.markdown("Every combination of interest rate, term and deposit below is applied to the installation cost of each technology "
+            "(Main Calculator defaults) and ranked by the present value of all costs over the project lifetime.")
+col1, col2 = st.columns(2)
+with col1:
+    rate_range = st.slider("Interest rates (% per year)", min_value=0.0, max_value=20.0, value=(3.0, 12.0), step=0.5)
+    rate_step = st.number_input("Interest rate step (%)", min_value=0.1, max_value=5.0, value=0.5, step=0.1)
+    comparison_discount = st.number_input("Discount Rate (% per year)", min_value=0.0, max_value=20.0, value=3.5, step=0.5) / 100
+with col2:
+    terms = st.multiselect("Terms (years)", list(range(1, 31)), default=[3, 5, 7, 10, 15, 20])
+    deposits = st.multiselect("Deposits (% of installation cost)", list(range(0, 101, 5)), default=[0, 10, 20, 30, 100])
+    comparison_systems = st.multiselect("Technologies", main_calculator_defaults["systems"], default=main_calculator_defaults["systems"])
+
+if terms and deposits and comparison_systems:
+    rates = np.arange(rate_range[0], rate_range[1] + rate_step / 2, rate_step) / 100
+    with profiler.stage("calculation: loan products"):
+        grid = cached_call(financing_grid, main_calculator_defaults, rates, terms, np.array(deposits) / 100, comparison_discount)
+    with profiler.stage("tables: loan products"):
+        products_df = grid_to_frame(grid, main_calculator_defaults["systems"])
+    products_df = products_df[products_df["System"].isin(comparison_systems)].sort_values("NPV of Costs (£)")
+    st.markdown(f"{len(products_df) // len(comparison_systems):,} loan products x {len(comparison_systems)} technologies")
+    st.dataframe(products_df.style.format("{:,.2f}", subset=products_df.columns[1:]).format("{:.4f}", subset=["LCOH (£/kWh)"]), hide_index=True)
+    download_button("📥 Download Loan Comparison", "Loan_Comparison", lambda df=products_df: [df])
+else:
+    st.warning("Please select at least one term, deposit and technology.")
@@ -0,0 +1,606 @@
+#Main Calculator: lifecycle costs and emissions of every hot water technology, with grid pathways, stochastic demand, sensitivity,
+#payback, financing and the technology catalog.
+
+import io
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from app_pages.common import current_page_inputs, current_profiler, download_button, fragment, scenario_store, show_chart, wide_series
+from lc4hw.breakeven import pair_table, payback_grid
+from lc4hw.cache import cached_call, cached_file
+from lc4hw.charts import bar_chart, line_chart, tornado_chart, sweep_chart, cheapest_map, payback_map, RED_COLOR, NAVY_COLOR
+from lc4hw.demand import assess_profiles, stream_profiles
+from lc4hw.emissions import load_pathways, pathway_multipliers, trajectories, default_pathways_path
+from lc4hw.export import series_chunks, cube_chunks
+from lc4hw.finance import financed_costs
+from lc4hw.graph import main_calculator_graph, main_calculator_record, record_frames
+from lc4hw.heatpump import default_curve_path, default_weather_path, demand_weights, flow_approach, hourly_cop, load_curve, load_weather, parse_weather, seasonal_cop
+from lc4hw.montecarlo import build_model, run_monte_carlo, spread_spec
+from lc4hw.registry import TechnologyRegistry, default_catalog_path
+from lc4hw.scenarios import main_calculator_inputs
+from lc4hw.sweep import default_scenario, parameters, parameter_label, base_value, tornado, grid_sweep, grid_series, crossover_points
+from lc4hw.tou import load_demand_profile
+
+profiler = current_profiler()
+page_inputs = current_page_inputs()
+
+st.title("Hot Water Techynologies Lifecycle Sustainability Calculator")
+st.markdown("Using this calculator, you are able to compare the costs, fuel consumption, and sustainability impact of switching hot water heating systems from LPG to electricity. You are able to update the numbers with your specific case or you can use the provided typical data.")
+
+# Default installation costs
+st.subheader("⚙️ Technical Inputs")
+with st.form("technology_inputs"):
+    st.subheader("Installation Costs (Values considering any potential grants or support mechanisms)")
+    install_costs = {
+        "LPG Boiler": st.number_input("LPG Boiler (£)", min_value=0, max_value=5000, value=2000, step=50, help="Put zero if you already have one and assesing the replacemnt."),
+        "Electric Boiler": st.number_input("Electric Boiler (£)", min_value=500, max_value=10000, value=3000, step=50, help="Installation cost of an electric boiler."),
+        "Heat Pump": st.number_input("Heat Pump (£, after grants)", min_value=2000, max_value=12000, value=2500, step=50, help="Installation cost of Heat Pumb."),
+        "Hydrogen Boiler": st.number_input("Hydrogen Boiler (£)", min_value=2000, max_value=6000, value=3500, step=50, help="Installation cost of a Hydrogen boiler."),
+    }
+
+    # Efficiency of each system
+    efficiencies = {
+        "Electric Boiler": st.number_input("Electric Boiler Efficienct (%)", min_value=50, max_value=100, value=100, step=5, help="The efficiency of Electric Boilers are 100%.") / 100,
+        "LPG Boiler": st.number_input("LPG Boiler Efficiency (%)", min_value=50, max_value=100, value=85, step=5, help="The efficiency of LPG Boiler is between 70-90 percent based on boiler Efficiency Rating.") / 100,
+        "Heat Pump": st.number_input("Heat Pump Efficiency (CoP)", min_value=2.00, max_value=5.00, value=2.50, step=0.10, help="The Coefficient of Performance (CoP) for Heat Pumps is between 2.00-5.00"),
+        "Hydrogen Boiler": st.number_input("Hydrogen Boiler Efficiency (%)", min_value=50, max_value=100, value=85, step=5, help="The efficiency of Hydrogen Boiler is between 50-100 percent based on boiler Efficiency Rating.") / 100,
+    }
+    heat_pump_mode = st.radio("Heat Pump CoP", ["Fixed CoP above", "Hourly from weather"], horizontal=True, key="heat_pump_mode",
+                              help="Hourly: the CoP follows the outdoor temperature of a weather year and the hot water temperature, through a manufacturer curve")
+    weather_file = st.file_uploader("Weather file (EPW, or CSV with an hourly temperature column; default: illustrative UK year)", type=["epw", "csv"], key="weather_file")
+    curve_file = st.file_uploader("Heat pump curve (CSV: outdoor_temp and one flow_<°C> CoP column per flow temperature)", type="csv", key="heat_pump_curve")
+    st.form_submit_button("✔️ Apply installation costs and efficiencies", key="apply_technology_inputs")
+
+# Energy prices & escalation
+with st.form("price_inputs"):
+    st.subheader("Energy Prices")
+    fuel_costs = {
+        "Electric Boiler": st.number_input("Electricity (£/kWh)", min_value=0.00, max_value=10.00, value=0.18, step=0.01, help="Electricity price tariff that is using for water heater"),
+        "LPG Boiler": st.number_input("LPG (£/litre)", min_value=0.00, max_value=10.00, value=0.70, step=0.10, help="LPG price that is using for water heater"),
+        "Heat Pump": st.number_input("Electricity for Heat Pump (£/kWh)", min_value=0.00, max_value=10.00, value=0.28, step=0.01, help="Electricity price tariff that is using for Heat Pump"),       
+        "Hydrogen Boiler": st.number_input("Hydrogen (£/kWh)", min_value=0.5, max_value=3.0, value=2.5, step=0.1, help="Hydrogen price that is using for water heater"),
+    }
+
+    st.subheader("Escalation Rates")
+    escalation_rates = {
+        "Electric Boiler": st.number_input("Electricity Price Escalation (% per year)", 0.00, 10.00, 1.50, help="Annual increase in electricity prices"),
+        "LPG Boiler": st.number_input("LPG Price Escalation (% per year)", 0.00, 10.00, 3.00, help="Annual increase in LPG prices"),
+        "Heat Pump": st.number_input("Heat Pump Electricity Price Escalation (% per year)", 0.00, 10.00, 2.50, help="Annual increase in electricity prices"),
+        "Hydrogen Boiler": st.number_input("Hydrogen Price Escalation (% per year)", 0.00, 15.00, 2.50, help="Annual increase in Hydrogen prices"),
+    }
+    st.form_submit_button("✔️ Apply energy prices and escalation rates", key="apply_price_inputs")
+
+st.markdown("---")  # Optional: Add a horizontal line for separation
+
+st.subheader("⚙️ Estimated Hot Water Demand")
+
+with st.form("demand_inputs"):
+    tank_size = st.number_input("🛁 Hot Water Demand/Tank (litres)", value=400, step=50, help="This is usually the capacity of the hot water tank.")
+    range_values = st.slider("Select a range", min_value=0, max_value=80, value=(10, 65))
+    st.write(f"Selected range: {range_values[0]} to {range_values[1]}")
+    heating_days = st.number_input("📅 Days per year that tank is being heated", min_value=0, max_value=365, value=270, step=5, help="Number of days per year you need to have the tank heated.")
+    heating_days_topup = st.number_input("📅 Days per year that tank needs to be heated during the day", min_value=0, max_value=365, value=20, step=1, help="Number of days per year you need to have the tank heated agian during the day.")
+    st.form_submit_button("✔️ Apply hot water demand", key="apply_demand_inputs")
+
+st.markdown("---")  # Optional: Add a horizontal line for separation
+
+st.subheader("🌍 Environmental and 💰 Economic Inputs")
+pathway_file = st.file_uploader("Grid decarbonisation pathways (CSV: year and one column of grid kg CO2e/kWh per pathway)", type="csv", key="pathway_file")
+pathway_names, pathway_years, pathway_intensity = load_pathways(io.StringIO(pathway_file.getvalue().decode("utf-8"))) if pathway_file is not None else cached_file(load_pathways, default_pathways_path)
+pathway_labels = {name: name.replace("_", " ").capitalize() for name in pathway_names}
+with st.form("environment_inputs"):
+    project_lifetime = st.number_input("🕰️ Project Lifetime (years)", min_value=0, max_value=50, value=15, step=1)
+    emission_factors = {
+        "Electric Boiler": st.number_input("Electricity Emission Factor", 0.0, 0.6, 0.25, step=0.01, help="Lifecycle emission of PVs is typically about 40-50 grams per kWh"),
+        "LPG Boiler": st.number_input("LPG Emission Factor", 0.0, 0.3, 0.21, step=0.01, help="This is typically about 1.5 kg CO2 per litre or 210 grams per kWh"),
+        "Heat Pump": st.number_input("Heat Pump Emission Factor", 0.0, 0.6, 0.08, step=0.01, help="Lifecycle emission of PVs is typically about 40-50 grams per kWh"),
+        "Hydrogen Boiler": st.number_input("Hydrogen Emission Factor", 0.0, 0.3, 0.15, step=0.01, help="Lifecycle emission of H2 is typically about ?? grams per kWh"),
+    }
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        grid_pathway = st.selectbox("Grid decarbonisation pathway", [None] + pathway_names, format_func=lambda name: "Constant emission factors" if name is None else pathway_labels[name],
+                                    key="grid_pathway", help="Emission factors of technologies on grid electricity follow the pathway's carbon intensity relative to the start year")
+    with col2:
+        start_year = st.number_input("Start year", min_value=int(pathway_years[0]), max_value=int(pathway_years[-1]), value=max(int(pathway_years[0]), 2025), step=1, key="start_year")
+    with col3:
+        on_grid = st.multiselect("Technologies on grid electricity", list(emission_factors), default=[s for s in ["Electric Boiler", "Heat Pump"] if s in emission_factors], key="on_grid")
+    col1, col2 = st.columns(2)
+    with col1:
+        carbon_price = st.number_input("Carbon Price (£/tCO2e)", min_value=0.0, value=0.0, step=5.0, key="carbon_price", help="Added to the annual costs of every technology")
+    with col2:
+        carbon_escalation = st.number_input("Carbon Price Escalation (%)", min_value=-10.0, max_value=30.0, value=0.0, step=0.5, key="carbon_escalation")
+    st.form_submit_button("✔️ Apply environmental and economic inputs", key="apply_environment_inputs")
+
+# Weather-driven Heat Pump: the seasonal CoP of the weather year at the selected hot water temperature replaces the fixed CoP
+if heat_pump_mode == "Hourly from weather":
+    weather = parse_weather(io.BytesIO(weather_file.getvalue())) if weather_file is not None else cached_file(load_weather, default_weather_path)
+    heat_pump_curve = load_curve(io.StringIO(curve_file.getvalue().decode("utf-8"))) if curve_file is not None else cached_file(load_curve, default_curve_path)
+    hour_weights = cached_call(demand_weights, range_values[1], range_values[0], 5.0, cached_file(load_demand_profile, "data/demand_profile.csv"))
+    efficiencies["Heat Pump"] = float(seasonal_cop(weather, range_values[1], heat_pump_curve, hour_weights))
+    hour_cop = hourly_cop(weather, range_values[1] + flow_approach, heat_pump_curve)
+    st.caption(f"Heat Pump seasonal CoP **{efficiencies['Heat Pump']:.2f}** at a {range_values[1] + flow_approach:g} °C flow temperature "
+               f"(hourly {hour_cop.min():.2f} to {hour_cop.max():.2f}, outdoor {weather.min():.1f} to {weather.max():.1f} °C).")
+
+profiler.lap("inputs")
+
+# Calculation Section
+# Dependency graph kept per session (see lc4hw.graph): only the nodes downstream of a changed input are recomputed
+systems = list(install_costs.keys())
+scenario = default_scenario(systems, install_costs, efficiencies, fuel_costs, escalation_rates, emission_factors,
+                            tank_size, range_values[1], range_values[0], heating_days, heating_days_topup, project_lifetime)
+if "calculation_graph" not in st.session_state:
+    st.session_state["calculation_graph"] = main_calculator_graph(systems)
+graph = st.session_state["calculation_graph"]
+pathway_index = pathway_names.index(grid_pathway) if grid_pathway is not None else None
+try:
+    all_pathway_multipliers = pathway_multipliers(pathway_years, pathway_intensity, start_year, project_lifetime)
+except ValueError as error:
+    st.error(f"❌ {error}. Please check the pathway file or the start year.")
+    st.stop()
+multipliers = all_pathway_multipliers[pathway_index] if grid_pathway is not None else ()
+calculation_inputs = main_calculator_inputs(scenario, on_grid, multipliers, carbon_price, carbon_escalation)
+page_inputs.update(calculation_inputs)
+
+
+def compute_scenario(inputs):
+    # Only on a store miss: the graph is brought up to the new inputs, recomputing what they changed
+    graph.update({name: value for name, value in inputs.items() if name != "systems"})
+    st.session_state["calculation_source"] = "graph"
+    return main_calculator_record(graph)
+
+
+# Scenarios computed before, in any session or before a restart, are loaded from the scenario store (lc4hw.store)
+st.session_state["calculation_source"] = "store"
+scenario_record = scenario_store().fetch("main_calculator", calculation_inputs, compute_scenario)
+with profiler.stage("tables"):
+    results, cost_table, emission_table = record_frames(systems, scenario_record)
+annual_energy_kWh = float(scenario_record["annual_energy_kwh"])
+total_costs = dict(zip(systems, scenario_record["total_costs"].tolist()))
+annual_emissions = dict(zip(systems, scenario_record["annual_emissions"]))
+profiler.lap("calculation")
+
+# The analysis sections further down evaluate `scenario`, which has no carbon price or grid pathway, and report
+# annual (first-year) emissions; each says so, since the lifecycle tables include both
+excluded = f"the carbon cost at £{carbon_price:g}/tCO2e" if carbon_price else "any carbon cost"
+if grid_pathway is not None:
+    excluded += f" and the {pathway_labels[grid_pathway]} grid pathway"
+scenario_note = (f"Costs in this section are installation and fuel only, without {excluded}, and emissions are annual "
+                 f"at constant emission factors, unlike the lifecycle tables above.")
+
+
+# Display Results
+@fragment
+def comparison_bar_chart(table, column, title, color, key):
+    # Owns its selection of technologies, so changing the selection reruns only this chart
+    st.subheader("Select Options to Display in Graph")
+    selected_options = st.multiselect("Choose options to visualize:", table.index.tolist(), default=table.index.tolist(), key=key)
+
+    # Filter data based on selection
+    filtered_df = table.loc[selected_options]
+
+    # Plot bar chart
+    if not filtered_df.empty:
+        st.subheader(f"{title} - Bar Chart")
+        show_chart(bar_chart, filtered_df, column, title, color=color,
+                   native=lambda: st.bar_chart(filtered_df, color=color))
+    else:
+        st.warning("Please select at least one option to display the graph.")
+
+
+st.subheader("Lifecycle Cost Comparison")
+cost_df = cost_table
+comparison_bar_chart(cost_df, "Total Cost (£)", "Lifecycle Cost Comparison", RED_COLOR, "cost_bar_systems")
+
+st.subheader("Lifecycle Emission Comparison")
+emission_df = emission_table
+comparison_bar_chart(emission_df, "Total Emission (CO2e)", "Lifecycle Emission Comparison", NAVY_COLOR, "emission_bar_systems")
+
+
+@fragment
+def annual_cost_chart(results):
+    # User selection
+    available_systems = list(results.keys())  # Get system names
+    selected_systems = st.multiselect("Select systems to display:", available_systems, default=available_systems)
+
+    # Plot the selected systems
+    if selected_systems:
+        # Show plot
+        show_chart(line_chart, {system: results[system] for system in selected_systems}, selected_systems,
+                   native=lambda: st.line_chart(wide_series(results, selected_systems, "Cost"), x_label="Year", y_label="Annual Cost (£)"))
+    else:
+        st.warning("Please select at least one system to display the graph.")
+
+
+annual_cost_chart(results)
+
+
+# Verbal explanation
+cheapest_system = cost_df.index[0]
+st.subheader("Final Recommendation")
+st.markdown(f"**{cheapest_system} is the most cost-effective choice over {project_lifetime} years.**")
+st.markdown(f"This is based on a total estimated cost of **£{total_costs[cheapest_system]:,.2f}**, including installation and energy expenses.")
+
+# Would youlike to know how much is the average cost of taking a shower in the UK?
+st.markdown("---")  # Optional: Add a horizontal line for separation
+st.subheader("🚿 Average Cost of Taking a Shower with such a system in the UK:")
+
+st.title("Lifecycle Cost and Emission Analysis")
+export_layout = st.radio("Export layout", ["long", "wide"], horizontal=True, key="export_layout",
+                         help="long: one row per technology and year; wide: one row per year with a column per technology")
+# --- Tabs for Organization ---
+tab1, tab2, tab3 = st.tabs(["💰 Annual Costs", "🌱 Emissions Over Time", "🔌 Grid Pathways"])
+
+
+@fragment
+def annual_cost_tab(results, annual_emissions, export_layout):
+    st.subheader("Annual Running Costs Over Time")
+    selected_systems = st.multiselect(
+    "Select systems to display:", 
+    list(results.keys()),  # Convert keys to a list
+    default=list(results.keys()),  # Default to all available systems
+    key="tab_cost_systems"
+    )
+
+    if selected_systems:
+        show_chart(line_chart, {system: results[system] for system in selected_systems}, selected_systems,
+                   native=lambda: st.line_chart(wide_series(results, selected_systems, "Cost"), x_label="Year", y_label="Annual Cost (£)"))
+
+        # Export Cost Data
+        download_button("📥 Download Cost Data", "Annual_Costs", partial(
+            series_chunks, selected_systems, np.array([results[system]["Cost"].to_numpy() for system in selected_systems]),
+            np.array([annual_emissions[system] for system in selected_systems]), layout=export_layout))
+    else:
+        st.warning("Please select at least one system to display the graph.")
+
+
+@fragment
+def emission_tab(results, emission_df, export_layout):
+    st.subheader("CO2 Emissions Over Time")
+    selected_emission_systems = st.multiselect(
+    "Select systems to display (CO2 Emissions):", 
+    list(emission_df.index), 
+    default=list(emission_df.index)
+    )
+
+    if selected_emission_systems:
+        show_chart(line_chart, {system: results[system] for system in selected_emission_systems}, selected_emission_systems,
+                   column='CO2 Emission', ylabel="CO2 Emission (kg)", linestyle="--", marker="o",
+                   native=lambda: st.line_chart(wide_series(results, selected_emission_systems, "CO2 Emission"), x_label="Year", y_label="CO2 Emission (kg)"))
+
+        # Export Emission Data
+        download_button("📥 Download Emission Data", "CO2_Emissions", partial(
+            series_chunks, selected_emission_systems, np.array([results[system]["CO2 Emission"].to_numpy() for system in selected_emission_systems]),
+            layout=export_layout))
+    else:
+        st.warning("Please select at least one system to display the graph.")
+
+
+@fragment
+def pathway_chart(comparison, systems, on_grid, pathway_columns, project_lifetime):
+    pathway_system = st.selectbox("Annual emissions of", systems, index=systems.index(on_grid[0]) if on_grid else 0, key="pathway_system")
+    i = systems.index(pathway_system)
+    pathway_results = {label: pd.DataFrame({"Year": np.arange(1, project_lifetime + 1), "CO2 Emission": comparison["annual_emissions"][i, k]})
+                       for k, label in enumerate(pathway_columns)}
+    show_chart(line_chart, pathway_results, pathway_columns, column="CO2 Emission", ylabel="CO2 Emission (kg)",
+               native=lambda: st.line_chart(wide_series(pathway_results, pathway_columns, "CO2 Emission"), x_label="Year", y_label="CO2 Emission (kg)"))
+
+
+# --- Cost Analysis Tab ---
+with tab1:
+    annual_cost_tab(results, annual_emissions, export_layout)
+
+# --- Emission Analysis Tab ---
+with tab2:
+    emission_tab(results, emission_df, export_layout)
+
+# --- Grid Pathway Comparison Tab ---
+with tab3:
+    st.subheader("Lifecycle Emissions and Costs under each Grid Pathway")
+    # Every pathway (plus constant factors) for every technology in one call
+    all_multipliers = np.vstack([np.ones((1, project_lifetime)), all_pathway_multipliers])
+    pathway_columns = ["Constant emission factors"] + [pathway_labels[name] for name in pathway_names]
+    comparison = cached_call(trajectories, scenario, all_multipliers, [system in on_grid for system in systems], carbon_price, carbon_escalation)
+    st.markdown(f"**Lifecycle emissions (kg CO2e over {project_lifetime} years)**")
+    st.dataframe(pd.DataFrame(comparison["lifecycle_emissions"], index=systems, columns=pathway_columns).style.format("{:,.0f}"))
+    st.markdown(f"**Total cost including installation{' and carbon' if carbon_price else ''} (£)**")
+    st.dataframe(pd.DataFrame(comparison["total_costs"], index=systems, columns=pathway_columns).style.format("£{:,.0f}"))
+    pathway_chart(comparison, systems, on_grid, pathway_columns, project_lifetime)
+
+# --- Monte Carlo Uncertainty Analysis ---
+st.markdown("---")
+st.subheader("🎲 Monte Carlo Uncertainty Analysis")
+st.caption(scenario_note)
+
+
+@fragment
+def monte_carlo(scenario, annual_energy_kWh):
+    # Settings and the Run button rerun only this section
+    systems = scenario["systems"]
+    st.markdown("Each input is centred on the value entered above with the selected relative spread.")
+    distributions = ["normal", "uniform", "triangular", "lognormal", "fixed"]
+    mc_settings = {}
+    col1, col2, col3, col4 = st.columns(4)
+    for col, (name, label, default_spread) in zip((col1, col2, col3, col4), [
+            ("fuel_costs", "Energy Prices", 15), ("escalation_rates", "Escalation Rates", 30),
+            ("efficiencies", "Efficiencies (CoP)", 10), ("emission_factors", "Emission Factors", 20)]):
+        with col:
+            kind = st.selectbox(f"{label} distribution", distributions, index=0, key=f"mc_kind_{name}")
+            spread = st.number_input(f"{label} spread (%)", min_value=0.0, max_value=100.0, value=float(default_spread), step=1.0, key=f"mc_spread_{name}")
+            mc_settings[name] = (kind, spread)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        n_draws = st.number_input("Number of draws per technology", min_value=1_000, max_value=1_000_000, value=100_000, step=10_000)
+    with col2:
+        mc_seed = st.number_input("Random seed", min_value=0, value=42, step=1)
+
+    if st.button("🎲 Run Monte Carlo"):
+        specs = {name: {system: spread_spec(scenario[name][system], *mc_settings[name]) for system in systems} for name in mc_settings}
+        mc_model = build_model(systems, scenario["install_costs"], annual_energy_kWh, scenario["project_lifetime"], **specs)
+
+        progress = st.progress(0.0)
+        mc_table = st.empty()
+        for summary in run_monte_carlo(mc_model, int(n_draws), seed=int(mc_seed), chunk_size=50_000):
+            progress.progress(summary["draws"] / n_draws, text=f"{summary['draws']:,} of {int(n_draws):,} draws")
+            mc_df = pd.DataFrame(summary["cost_percentiles"], index=[f"P{p} Total Cost (£)" for p in summary["percentiles"]]).T
+            mc_df["Mean Total Cost (£)"] = pd.Series(summary["mean_cost"])
+            mc_df["Probability of being cheapest"] = pd.Series(summary["p_cheapest"])
+            mc_table.dataframe(mc_df.style.format("{:,.2f}").format("{:.1%}", subset=["Probability of being cheapest"]))
+
+        most_likely = max(summary["p_cheapest"], key=summary["p_cheapest"].get)
+        st.markdown(f"**{most_likely} is the cheapest option in {summary['p_cheapest'][most_likely]:.1%} of the {int(n_draws):,} sampled scenarios.**")
+
+
+with st.expander("Sample the inputs above from probability distributions instead of single values"):
+    monte_carlo(scenario, annual_energy_kWh)
+
+
+# --- Stochastic Demand ---
+st.markdown("---")
+st.subheader("🚿 Stochastic Hot Water Demand")
+st.caption(scenario_note)
+
+
+@fragment
+def demand_section(scenario, total_costs):
+    # Households are generated and assessed a block at a time; only their per-household totals are kept
+    systems = scenario["systems"]
+    st.markdown("Instead of one tank a day, every household draws hot water in random showers, baths, basin and kitchen uses, "
+                f"and the cold water temperature varies over the year around the {scenario['cold_temp']} °C selected above.")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        n_households = st.number_input("Households", min_value=100, max_value=200_000, value=2_000, step=1_000, key="demand_households")
+    with col2:
+        occupancy = st.selectbox("Occupants per household", ["Mixed (England household sizes)", 1, 2, 3, 4, 5], key="demand_occupants")
+    with col3:
+        cold_amplitude = st.number_input("Seasonal cold water swing (± °C)", min_value=0.0, max_value=10.0, value=5.0, step=0.5, key="demand_cold_amplitude")
+    with col4:
+        demand_seed = st.number_input("Random seed", min_value=0, value=7, step=1, key="demand_seed")
+
+    if st.button("🚿 Simulate Households"):
+        n_households = int(n_households)
+        occupants = None if isinstance(occupancy, str) else np.full(n_households, occupancy)
+        progress = st.progress(0.0)
+        demand_table = st.empty()
+        household_costs, household_kwh, cheapest = [], [], np.zeros(len(systems))
+        daily_kwh = np.zeros(365)
+        for profiles in stream_profiles(n_households, scenario["project_lifetime"], seed=int(demand_seed), occupants=occupants,
+                                        hot_temp=scenario["hot_temp"], cold_temp=scenario["cold_temp"], cold_amplitude=cold_amplitude):
+            assessed = assess_profiles(profiles, scenario)
+            household_costs.append(assessed["total_costs"])
+            household_kwh.append(profiles["annual_kwh"].mean(axis=1))
+            cheapest += np.bincount(assessed["cheapest"], minlength=len(systems))
+            daily_kwh += profiles["daily_kwh"].sum(axis=(0, 1), dtype=float)
+            done = profiles["first"] + len(profiles["occupants"])
+            progress.progress(done / n_households, text=f"{done:,} of {n_households:,} households")
+            costs = np.concatenate(household_costs, axis=1)
+            demand_df = pd.DataFrame(np.percentile(costs, [10, 50, 90], axis=1).T, index=systems,
+                                     columns=["P10 Total Cost (£)", "P50 Total Cost (£)", "P90 Total Cost (£)"])
+            demand_df["Total Cost at Fixed Demand (£)"] = pd.Series(total_costs)
+            demand_df["Share of households cheapest"] = cheapest / done
+            demand_table.dataframe(demand_df.style.format("{:,.2f}").format("{:.1%}", subset=["Share of households cheapest"]))
+
+        annual_kwh = np.concatenate(household_kwh)
+        st.markdown(f"Median household heat demand: **{np.median(annual_kwh):,.0f} kWh per year** "
+                    f"(P10 {np.percentile(annual_kwh, 10):,.0f}, P90 {np.percentile(annual_kwh, 90):,.0f}).")
+        st.line_chart(pd.DataFrame({"Mean Heat Demand (kWh/day)": daily_kwh / (n_households * scenario["project_lifetime"])},
+                                   index=pd.Index(np.arange(1, 366), name="Day of Year")))
+
+
+with st.expander("Simulate many households with random draw-offs and seasonal cold water temperature"):
+    demand_section(scenario, total_costs)
+
+# Sections below the results. Each is a fragment: its own widgets rerun only that section, with the
+# scenario of the last full run
+
+
+@fragment
+def tornado_section(scenario, sweep_params, cheapest_system, total_costs):
+    systems = scenario["systems"]
+    col1, col2 = st.columns(2)
+    with col1:
+        tornado_system = st.selectbox("Technology", systems, index=systems.index(cheapest_system))
+    with col2:
+        tornado_pct = st.number_input("Change of each input (±%)", min_value=1.0, max_value=100.0, value=10.0, step=1.0)
+    low, high = cached_call(tornado, scenario, sweep_params, tornado_pct)
+    i = systems.index(tornado_system)
+    # Only inputs that move this technology's cost, the 12 with the widest swing
+    swing = np.abs(high[i] - low[i])
+    shown = [j for j in np.argsort(swing)[::-1][:12] if swing[j] > 0]
+    show_chart(tornado_chart, [parameter_label(sweep_params[j]) for j in shown], low[i, shown], high[i, shown],
+               total_costs[tornado_system], f"{tornado_system} Total Cost Sensitivity (±{tornado_pct:g}%)")
+
+
+def sweep_axis(scenario, sweep_params, label, default, key):
+    param = st.selectbox(label, sweep_params, index=default, format_func=parameter_label, key=f"{key}_param")
+    base = float(base_value(scenario, param))
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        low = st.number_input("From", value=base * 0.5, key=f"{key}_from_{param}")
+    with col2:
+        high = st.number_input("To", value=base * 1.5 if base else 1.0, key=f"{key}_to_{param}")
+    with col3:
+        points = st.number_input("Points", min_value=2, max_value=1000, value=100, key=f"{key}_points_{param}")
+    values = np.linspace(low, high, int(points))
+    if param == "project_lifetime":
+        values = np.unique(np.round(values))
+    return param, values
+
+
+@fragment
+def sweep_section(scenario, sweep_params):
+    systems = scenario["systems"]
+    x_param, x_values = sweep_axis(scenario, sweep_params, "Input to sweep", sweep_params.index(("fuel_costs", systems[1])), "sweep_x")
+    two_d = st.checkbox("Sweep a second input (2-D grid)")
+    axes = {x_param: x_values}
+    if two_d:
+        y_param, y_values = sweep_axis(scenario, sweep_params, "Second input", sweep_params.index(("escalation_rates", systems[0])), "sweep_y")
+        if y_param != x_param:
+            axes[y_param] = y_values
+    cube = cached_call(grid_sweep, scenario, axes)
+
+    if len(axes) == 1:
+        crossings = crossover_points(x_values, cube["total_costs"], systems)
+        show_chart(sweep_chart, x_values, cube["total_costs"], systems, parameter_label(x_param), crossings,
+                   native=lambda: st.line_chart(pd.DataFrame(cube["total_costs"].T, index=pd.Index(x_values, name=parameter_label(x_param)), columns=systems), y_label="Total Cost (£)"))
+        for crossing in crossings:
+            st.markdown(f"At **{parameter_label(x_param)} = {crossing['value']:,.3f}** the cheapest option changes from **{crossing['from']}** to **{crossing['to']}**.")
+        if not crossings:
+            st.markdown(f"**{systems[cube['cheapest'][0]]}** stays the cheapest option over the whole range.")
+    else:
+        show_chart(cheapest_map, x_values, y_values, cube["cheapest"], systems, parameter_label(x_param), parameter_label(y_param))
+
+    col1, col2 = st.columns(2)
+    with col1:
+        sweep_export = st.radio("Export", ["Totals", "Annual series"], horizontal=True, key="sweep_export")
+    with col2:
+        sweep_layout = st.radio("Layout", ["long", "wide"], horizontal=True, key="sweep_layout")
+    axis_labels = [parameter_label(param) for param in axes]
+    if sweep_export == "Totals":
+        download_button("📥 Download Sweep Results", "Sweep_Results", partial(cube_chunks, cube, systems, axis_labels, layout=sweep_layout))
+    else:
+        def sweep_series_chunks(scenario=scenario, axes=axes, labels=axis_labels, layout=sweep_layout):
+            # Annual series of every grid point, computed only when the download is requested
+            annual_costs, annual_emissions = grid_series(scenario, axes)
+            grids = np.meshgrid(*axes.values(), indexing="ij")
+            return series_chunks(scenario["systems"], annual_costs, annual_emissions, dict(zip(labels, (grid.ravel() for grid in grids))), layout=layout)
+        download_button("📥 Download Sweep Series", "Sweep_Series", sweep_series_chunks)
+
+
+@fragment
+def payback_section(scenario, sweep_params):
+    systems = scenario["systems"]
+    project_lifetime = scenario["project_lifetime"]
+    reference_system = st.selectbox("Compare against", systems, index=systems.index("LPG Boiler") if "LPG Boiler" in systems else 0, key="payback_reference")
+    st.dataframe(cached_call(pair_table, scenario, reference_system).style.format(
+        {"Payback Year": "{:.0f}", "Payback (years)": "{:.1f}", f"Saving vs {reference_system} (£)": "£{:,.0f}", "Energy Price": "{:.3f}",
+         "Break-even Energy Price": "{:.3f}", "Escalation Rate (%)": "{:.2f}", "Break-even Escalation Rate (%)": "{:.2f}"}, na_rep="never"))
+    st.caption(f"Payback: first year at whose end the cumulative cost (including installation) is no more than the {reference_system}'s. "
+               f"Break-even price and escalation: the value of that technology's own input at which it costs the same as the {reference_system} over {project_lifetime} years.")
+
+    with st.expander("Break-even map over two inputs"):
+        alternatives = [system for system in systems if system != reference_system]
+        payback_system = st.selectbox("Technology", alternatives, index=alternatives.index("Heat Pump") if "Heat Pump" in alternatives else 0, key="payback_system")
+        px_param, px_values = sweep_axis(scenario, sweep_params, "Input on the x axis", sweep_params.index(("fuel_costs", payback_system)), "payback_x")
+        py_param, py_values = sweep_axis(scenario, sweep_params, "Input on the y axis", sweep_params.index(("escalation_rates", reference_system)), "payback_y")
+        if px_param == py_param:
+            st.warning("Choose two different inputs.")
+        else:
+            grid = cached_call(payback_grid, scenario, {px_param: px_values, py_param: py_values}, payback_system, reference_system)
+            show_chart(payback_map, px_values, py_values, grid["time"], grid["saving"], parameter_label(px_param), parameter_label(py_param),
+                       f"{payback_system} Payback against {reference_system}")
+            st.markdown(f"Blank areas: no payback within the project lifetime. Red line: lifetime break-even "
+                        f"({payback_system} and {reference_system} cost the same over {project_lifetime} years).")
+
+
+@fragment
+def financing_section(scenario):
+    systems = scenario["systems"]
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        finance_rate = st.number_input("Loan Interest Rate (% per year)", min_value=0.0, max_value=30.0, value=6.0, step=0.1, key="finance_rate") / 100
+    with col2:
+        finance_term = st.number_input("Loan Term (years)", min_value=1, max_value=30, value=10, step=1, key="finance_term")
+    with col3:
+        finance_deposit = st.number_input("Deposit (% of installation cost)", min_value=0.0, max_value=100.0, value=10.0, step=5.0, key="finance_deposit") / 100
+    with col4:
+        discount_rate = st.number_input("Discount Rate (% per year)", min_value=0.0, max_value=20.0, value=3.5, step=0.5, key="finance_discount") / 100
+
+    # Paying cash is the deposit = 100% case of the same calculation
+    financed = cached_call(financed_costs, scenario, finance_rate, finance_term, [1.0, finance_deposit], discount_rate)
+    finance_df = pd.DataFrame({
+        "Monthly Payment (£)": financed["monthly_payment"][:, 1],
+        "Total Interest (£)": financed["total_interest"][:, 1],
+        "Total Cost, Cash (£)": financed["total_cost"][:, 0],
+        "Total Cost, Financed (£)": financed["total_cost"][:, 1],
+        "NPV, Cash (£)": financed["npv"][:, 0],
+        "NPV, Financed (£)": financed["npv"][:, 1],
+        "LCOH, Cash (£/kWh)": financed["lcoh"][:, 0],
+        "LCOH, Financed (£/kWh)": financed["lcoh"][:, 1],
+    }, index=systems).sort_values("NPV, Financed (£)")
+    st.dataframe(finance_df.style.format("{:,.2f}").format("{:.4f}", subset=["LCOH, Cash (£/kWh)", "LCOH, Financed (£/kWh)"]))
+    st.markdown(f"**{finance_df.index[0]}** has the lowest present value of costs when financed: "
+                f"**£{finance_df['NPV, Financed (£)'].iloc[0]:,.2f}** at a {discount_rate:.1%} discount rate.")
+
+
+@fragment
+def catalog_section(scenario):
+    project_lifetime = scenario["project_lifetime"]
+    st.markdown("Each row is one technology or model; add rows in the table or upload a catalog CSV with the columns "
+                "`name, category, install_cost, efficiency, fuel_cost, escalation_rate, emission_factor`. "
+                "All entries are evaluated in one vectorized call.")
+    catalog_file = st.file_uploader("📂 Catalog (CSV)", type=["csv"], key="catalog_file")
+    catalog = TechnologyRegistry.from_csv(io.StringIO(catalog_file.getvalue().decode("utf-8"))) if catalog_file is not None else cached_file(TechnologyRegistry.from_csv, default_catalog_path)
+    catalog_df = st.data_editor(catalog.to_frame(), num_rows="dynamic", hide_index=True, key=f"catalog_editor_{catalog_file.name if catalog_file is not None else 'default'}")
+    catalog = TechnologyRegistry.from_records(catalog_df.dropna().to_dict("records"))
+    categories = sorted(set(catalog.categories.tolist()))
+    shown_categories = st.multiselect("Categories", categories, default=categories, key="catalog_categories")
+    catalog = catalog.select(np.isin(catalog.categories, shown_categories))
+
+    if len(catalog):
+        evaluated = catalog.evaluate(scenario["tank_size"], scenario["hot_temp"], scenario["cold_temp"], scenario["heating_days"], scenario["heating_days_topup"], project_lifetime)
+        ranking_df = pd.DataFrame({"Category": catalog.categories, "Total Cost (£)": evaluated["total_cost"],
+                                   "First Year Running Cost (£)": evaluated["first_year_cost"],
+                                   "Annual Emission (CO2e)": evaluated["annual_emission"]}, index=catalog.names).sort_values("Total Cost (£)")
+        st.dataframe(ranking_df.style.format("{:,.2f}", subset=["Total Cost (£)", "First Year Running Cost (£)", "Annual Emission (CO2e)"]))
+        top_df = ranking_df.head(15)
+        show_chart(bar_chart, top_df, "Total Cost (£)", f"Lifecycle Cost over {project_lifetime} years (cheapest {len(top_df)})", color=RED_COLOR, xlabel="Model",
+                   native=lambda: st.bar_chart(top_df["Total Cost (£)"], color=RED_COLOR))
+        st.markdown(f"**{ranking_df.index[0]}** is the cheapest of the {len(ranking_df)} catalog entries: **£{ranking_df['Total Cost (£)'].iloc[0]:,.2f}**.")
+    else:
+        st.warning("The catalog has no entries in the selected categories.")
+
+
+# --- Sensitivity Analysis ---
+st.markdown("---")
+st.subheader("📈 Sensitivity Analysis and Parameter Sweeps")
+st.caption(scenario_note)
+sweep_params = parameters(scenario)
+with st.expander("Tornado chart: one-at-a-time ±x% changes of every input"):
+    tornado_section(scenario, sweep_params, cheapest_system, total_costs)
+
+with st.expander("Sweep one or two inputs over a range"):
+    sweep_section(scenario, sweep_params)
+
+# --- Payback and Break-even ---
+st.markdown("---")
+st.subheader("⚖️ Payback and Break-even")
+st.caption(scenario_note)
+payback_section(scenario, sweep_params)
+
+# --- Financing and Discounting ---
+st.markdown("---")
+st.subheader("💳 Financing and Discounted Costs")
+st.caption(scenario_note)
+with st.expander("Finance the installation costs with a loan and compare present values"):
+    financing_section(scenario)
+
+# --- Technology Catalog ---
+st.markdown("---")
+st.subheader("🗂️ Technology Catalog")
+st.caption(scenario_note)
+with st.expander("Compare product variants from a catalog with the demand and lifetime above"):
+    catalog_section(scenario)
@@ -0,0 +1,32 @@
+#Portfolio Assessment: every technology compared for each site of an uploaded estate file.
+
+import io
+
+import streamlit as st
+
+from lc4hw.export import formats as export_formats
+
+st.title("🏢 Portfolio Assessment")
+st.markdown("Upload a CSV or Parquet file with one row per site to compare the technologies for a whole estate. "
+            "Columns override the Main Calculator defaults for each site: `tank_size`, `hot_temp`, `cold_temp`, `heating_days`, "
+            "`heating_days_topup`, `project_lifetime` and per-technology inputs such as `fuel_costs[Electric Boiler]` or `efficiencies[Heat Pump]`.")
+sites_file = st.file_uploader("📂 Site file", type=["csv", "parquet"])
+col1, col2, col3 = st.columns(3)
+with col1:
+    output_format = st.selectbox("Output format", list(export_formats), index=list(export_formats).index(st.session_state.get("export_format", "csv")))
+with col2:
+    portfolio_chunk = st.number_input("Sites per chunk", min_value=1_000, max_value=1_000_000, value=50_000, step=10_000)
+with col3:
+    portfolio_processes = st.number_input("Worker processes", min_value=1, max_value=64, value=1, step=1)
+
+if sites_file is not None and st.button("🚀 Assess Portfolio"):
+    from lc4hw.portfolio import process_portfolio
+
+    progress_text = st.empty()
+    portfolio_output = io.BytesIO()
+    stats = process_portfolio(sites_file, portfolio_output, chunk_size=int(portfolio_chunk), processes=int(portfolio_processes),
+                              input_format="parquet" if sites_file.name.lower().endswith(".parquet") else "csv", output_format=output_format,
+                              progress=lambda rows, seconds: progress_text.text(f"{rows:,} sites assessed ({rows / max(seconds, 1e-9):,.0f} rows/s)"))
+    st.success(f"Assessed {stats['rows']:,} sites in {stats['seconds']:.2f} s ({stats['rows_per_second']:,.0f} rows/s)")
+    st.download_button("📥 Download Portfolio Results", data=portfolio_output.getbuffer(), file_name=f"Portfolio_Results.{export_formats[output_format][1]}",
+                       mime=export_formats[output_format][0])
@@ -0,0 +1,90 @@
+#Time-of-Use Simulation: half-hourly tank simulation under time-of-use tariffs.
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from app_pages.common import current_profiler
+from lc4hw.cache import cached_call, cached_file
+from lc4hw.defaults import main_calculator_defaults as defaults
+from lc4hw.tou import load_tariffs, load_demand_profile, simulate_lifetime, slots_per_day
+
+profiler = current_profiler()
+
+st.title("⏱️ Time-of-Use Tariff Simulation")
+st.markdown("Simulates the tank every half hour of the year: heater input, standing losses and hot water draw-offs. "
+            "Electric boilers and heat pumps heat in the off-peak (lowest-price) slots of each tariff and only top up at other times when the tank runs low; "
+            "LPG and hydrogen boilers pay their flat fuel price.")
+
+col1, col2 = st.columns(2)
+with col1:
+    tariff_file = st.file_uploader("📂 Tariff table (CSV, one column per tariff in £/kWh)", type=["csv"])
+with col2:
+    profile_file = st.file_uploader("📂 Demand profile (CSV with a 'fraction' column)", type=["csv"])
+tariff_names, tariff_prices = load_tariffs(tariff_file) if tariff_file is not None else cached_file(load_tariffs, "data/tariffs.csv")
+demand_profile = load_demand_profile(profile_file) if profile_file is not None else cached_file(load_demand_profile, "data/demand_profile.csv")
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    tank_size = st.number_input("🛁 Tank Size (litres)", min_value=50, max_value=5000, value=defaults["tank_size"], step=50)
+    range_values = st.slider("Cold and hot water temperature (°C)", min_value=0, max_value=80, value=(defaults["cold_temp"], defaults["hot_temp"]))
+with col2:
+    daily_draw = st.number_input("🚿 Hot Water Drawn per Day (litres)", min_value=0.0, max_value=5000.0,
+                                 value=round(defaults["tank_size"] * (defaults["heating_days"] + defaults["heating_days_topup"]) / 365, 1), step=10.0)
+    standing_loss = st.number_input("🌡️ Standing Loss of a Full Tank (kWh/day)", min_value=0.0, max_value=10.0, value=1.5, step=0.1)
+with col3:
+    project_lifetime = st.number_input("🕰️ Project Lifetime (years)", min_value=1, max_value=50, value=defaults["project_lifetime"], step=1)
+
+systems = defaults["systems"]
+uses_tariff = [system in ("Electric Boiler", "Heat Pump") for system in systems]
+st.subheader("Heater Power (kW)")
+power_kw = []
+for col, system, default_power in zip(st.columns(len(systems)), systems, [24.0, 3.0, 2.0, 24.0]):
+    with col:
+        power_kw.append(st.number_input(f"{system} (kW)", min_value=0.5, max_value=50.0, value=default_power, step=0.5))
+
+profiler.lap("inputs")
+sim = cached_call(simulate_lifetime, tank_size, range_values[1], range_values[0], daily_draw, demand_profile, tariff_prices, uses_tariff,
+                        [defaults["fuel_costs"][system] for system in systems], power_kw,
+                        [defaults["efficiencies"][system] for system in systems],
+                        [defaults["escalation_rates"][system] for system in systems], project_lifetime, standing_loss)
+profiler.lap("calculation")
+
+st.subheader(f"Lifecycle Cost over {project_lifetime} years (£, including installation)")
+tou_df = pd.DataFrame(sim["total_cost"] + np.array([defaults["install_costs"][system] for system in systems])[:, None],
+                      index=systems, columns=tariff_names)
+st.dataframe(tou_df.style.format("{:,.2f}"))
+
+st.subheader("Annual Energy Balance (kWh)")
+scenario_name = st.selectbox("Tariff", tariff_names)
+j = tariff_names.index(scenario_name)
+balance_df = pd.DataFrame({"Heater Input (kWh)": sim["annual_input_kwh"][:, j], "Standing Losses (kWh)": sim["standing_loss_kwh"][:, j],
+                           "Unmet Demand (kWh)": sim["unmet_kwh"][:, j], "First Year Cost (£)": sim["annual_cost"][:, j]}, index=systems)
+st.dataframe(balance_df.style.format("{:,.1f}"))
+
+st.subheader("Stored Heat over the First Two Days (kWh)")
+hours = np.arange(2 * slots_per_day) / 2
+st.line_chart(pd.DataFrame(sim["stored_kwh"][:2 * slots_per_day, :, j], index=pd.Index(hours, name="Hour"), columns=systems))
+
+with st.expander("📉 Optimal Heating Schedule"):
+    st.markdown("Cheapest heating schedule for the electric boiler and heat pump under each tariff, found by dynamic programming "
+                "over the tank's stored heat, compared with heating once a day from midnight at full power.")
+    if st.button("Optimise Schedules"):
+        from lc4hw.schedule import optimal_schedule
+
+        tariff_systems = [system for system, flag in zip(systems, uses_tariff) if flag]
+        demand_kwh = demand_profile * daily_draw * sim["capacity_kwh"] / tank_size
+        schedule_rows = []
+        with st.spinner("Optimising..."):
+            for system in tariff_systems:
+                i = systems.index(system)
+                schedule = optimal_schedule(tariff_prices.T, demand_kwh, sim["capacity_kwh"], power_kw[i],
+                                            defaults["efficiencies"][system], standing_loss)
+                for k, name in enumerate(tariff_names):
+                    schedule_rows.append({"Technology": system, "Tariff": name,
+                                          "Heat Once a Day (£/year)": schedule["baseline_cost"][k],
+                                          "Optimal Schedule (£/year)": schedule["cost"][k],
+                                          "Savings (£/year)": schedule["savings"][k],
+                                          "Unmet Demand (kWh)": schedule["unmet_kwh"][k]})
+        st.dataframe(pd.DataFrame(schedule_rows).style.format("{:,.2f}", subset=["Heat Once a Day (£/year)", "Optimal Schedule (£/year)",
+                                                                                  "Savings (£/year)", "Unmet Demand (kWh)"]))
@@ -0,0 +1,147 @@
+#Server CPU per interaction of a typical Main Calculator editing session, with and without forms and fragments.
+#The session below is replayed twice through streamlit.testing's AppTest, each time in a fresh process with an
+#empty scenario store so that neither replay profits from the other's caches:
+#  full rerun: every widget change reruns the whole page, as before the inputs were grouped in forms and the
+#              charts and sections became fragments: each edit is submitted on its own;
+#  batched:    the edits of one input group are made together and submitted once (one full rerun), and a
+#              change of a chart selection or of a section's own input reruns only the fragment owning it.
+#app.py keeps the thread CPU time of the full rerun in st.session_state["rerun_cpu"] and app_pages.common.fragment
+#that of each fragment run in st.session_state["fragment_cpu"]. AppTest always runs the whole script, so the
+#cost of a fragment rerun is taken as the CPU of the fragment's body alone, which is what Streamlit executes
+#when a widget inside it changes.
+#
+#Usage (from the repository root):
+#    python -m benchmarks.interactions
+#    python -m benchmarks.interactions --repeats 3 --output benchmarks/results/interactions.json
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root not in sys.path:
+    sys.path.insert(0, root)
+
+app = "app.py"  # opens on the Main Calculator
+
+# A typical editing session: ("form", submit button key, [(widget type, key or label, value), ...]) edits an
+# input group; ("fragment", fragment name, (widget type, key or label, value)) changes one fragment widget
+session = [
+    ("form", "apply_price_inputs", [("number_input", "Electricity (£/kWh)", 0.24), ("number_input", "LPG (£/litre)", 0.8),
+                                    ("number_input", "Electricity for Heat Pump (£/kWh)", 0.30)]),
+    ("fragment", "comparison_bar_chart", ("multiselect", "cost_bar_systems", ["LPG Boiler", "Heat Pump"])),
+    ("fragment", "annual_cost_tab", ("multiselect", "tab_cost_systems", ["LPG Boiler", "Heat Pump", "Electric Boiler"])),
+    ("form", "apply_demand_inputs", [("number_input", "🛁 Hot Water Demand/Tank (litres)", 300),
+                                     ("number_input", "📅 Days per year that tank is being heated", 300)]),
+    ("fragment", "pathway_chart", ("selectbox", "pathway_system", "Heat Pump")),
+    ("fragment", "tornado_section", ("selectbox", "Technology", "Heat Pump")),
+    ("fragment", "payback_section", ("selectbox", "payback_reference", "Electric Boiler")),
+    ("form", "apply_technology_inputs", [("number_input", "Heat Pump (£, after grants)", 4000), ("number_input", "Heat Pump Efficiency (CoP)", 3.0)]),
+    ("fragment", "financing_section", ("number_input", "finance_rate", 5.0)),
+    ("fragment", "comparison_bar_chart", ("multiselect", "emission_bar_systems", ["LPG Boiler", "Heat Pump"])),
+    ("form", "apply_environment_inputs", [("number_input", "🕰️ Project Lifetime (years)", 20), ("number_input", "carbon_price", 50.0)]),
+    ("fragment", "pathway_chart", ("selectbox", "pathway_system", "Electric Boiler")),
+]
+
+
+def find(at, kind, name):
+    # Widget by key, else the first one with that label
+    widgets = getattr(at, kind)
+    for widget in widgets:
+        if widget.key == name:
+            return widget
+    for widget in widgets:
+        if widget.label == name:
+            return widget
+    raise LookupError(f"No {kind} {name!r} on the page")
+
+
+def replay(batched, repeats, timeout):
+    """CPU seconds of each interaction of `repeats` sessions: [(step, widget, seconds)]."""
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(root)  # the app loads its logos and data files from relative paths
+    at = AppTest.from_file(os.path.join(root, app), default_timeout=timeout)
+    at.run()
+    samples = []
+
+    def run():
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+
+    for _ in range(repeats):
+        for step, owner, edits in session:
+            if step == "form" and batched:
+                for kind, name, value in edits:
+                    find(at, kind, name).set_value(value)
+                at.button(key=owner).click()
+                run()
+                samples.append((owner, ", ".join(name for _, name, _ in edits), at.session_state["rerun_cpu"]))
+            elif step == "form":
+                for kind, name, value in edits:
+                    find(at, kind, name).set_value(value)
+                    at.button(key=owner).click()
+                    run()
+                    samples.append((owner, name, at.session_state["rerun_cpu"]))
+            else:
+                kind, name, value = edits
+                find(at, kind, name).set_value(value)
+                run()
+                seconds = at.session_state["fragment_cpu"][owner] if batched else at.session_state["rerun_cpu"]
+                samples.append((owner, name, seconds))
+        # Back to the defaults, so that every repeat makes the same changes
+        at = AppTest.from_file(os.path.join(root, app), default_timeout=timeout)
+        at.run()
+    return samples
+
+
+def replay_isolated(batched, repeats, timeout):
+    # In a fresh process with its own empty scenario store: no caches warmed by the other replay
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["LC4HW_STORE"] = os.path.join(directory, "scenarios.sqlite")
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            return pool.apply(replay, (batched, repeats, timeout))
+
+
+def summary(samples, edits):
+    seconds = sum(s for _, _, s in samples)
+    return {"reruns": len(samples), "cpu_s": seconds, "cpu_per_edit_ms": seconds / edits * 1000,
+            "samples": [{"owner": owner, "widget": name, "cpu_ms": s * 1000} for owner, name, s in samples]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Server CPU per interaction of a Main Calculator editing session, full reruns vs forms and fragments.")
+    parser.add_argument("--repeats", type=int, default=1, help="Times the session is replayed (default 1)")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds allowed per rerun (default 300)")
+    parser.add_argument("--output", help="Also write the results to this file (JSON)")
+    args = parser.parse_args(argv)
+
+    edits = args.repeats * sum(len(changes) if step == "form" else 1 for step, _, changes in session)
+    full = summary(replay_isolated(False, args.repeats, args.timeout), edits)
+    batched = summary(replay_isolated(True, args.repeats, args.timeout), edits)
+
+    print(f"{'interaction':<26s} {'widgets':>7s} {'full rerun ms':>14s} {'batched ms':>11s}")
+    by_owner = {}
+    for name, result in (("full", full), ("batched", batched)):
+        for sample in result["samples"]:
+            totals = by_owner.setdefault(sample["owner"], {"full": 0.0, "batched": 0.0, "widgets": 0})
+            totals[name] += sample["cpu_ms"]
+            totals["widgets"] += name == "full"
+    for owner, totals in by_owner.items():
+        print(f"{owner:<26s} {totals['widgets']:7d} {totals['full']:14.1f} {totals['batched']:11.1f}")
+    saved = 1 - batched["cpu_s"] / full["cpu_s"]
+    print(f"\n{edits} widget changes: {full['reruns']} full reruns, {full['cpu_s']:.2f} s CPU ({full['cpu_per_edit_ms']:.1f} ms per change); "
+          f"batched: {batched['reruns']} reruns, {batched['cpu_s']:.2f} s CPU ({batched['cpu_per_edit_ms']:.1f} ms per change)")
+    print(f"Server CPU saved per interaction: {saved:.0%}")
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"edits": edits, "full_rerun": full, "batched": batched, "saved": saved}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#Load test of the calculation service (lc4hw.service) running locally.
+#Opens `concurrency` keep-alive connections that send requests back to back, with inputs drawn at random
+#around the defaults; `repeat` is the share of requests that reuse an earlier body and so hit the cache.
+#Reports p50/p90/p99 latency and requests per second, per endpoint and overall.
+#
+#Usage (from the repository root):
+#    python -m lc4hw.service --port 8765 &
+#    python -m benchmarks.load_test --port 8765 --requests 20000 --concurrency 64
+#or let the script start its own instance with --spawn.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def random_body(endpoint, rng):
+    if endpoint == "/lifecycle":
+        return {"tank_size": rng.choice([150, 200, 250, 300, 400, 500]), "hot_temp": rng.randint(55, 70), "cold_temp": rng.randint(5, 15),
+                "fuel_costs": {"Electric Boiler": round(rng.uniform(0.1, 0.4), 3), "Heat Pump": round(rng.uniform(0.1, 0.4), 3)},
+                "escalation_rates": {"LPG Boiler": round(rng.uniform(0, 6), 2)}, "project_lifetime": rng.randint(10, 25)}
+    if endpoint == "/energy":
+        return {"hot_temp": rng.randint(45, 75), "cold_temp": rng.randint(2, 20), "efficiency": round(rng.uniform(0.6, 1.0), 2)}
+    return {"principal": rng.randrange(1000, 20000, 100), "rate": round(rng.uniform(0, 0.15), 4), "term": rng.randint(1, 25)}
+
+
+async def client(host, port, jobs, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while jobs:
+            endpoint, body = jobs.pop()
+            content = json.dumps(body).encode()
+            start = time.perf_counter()
+            writer.write(f"POST {endpoint} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(content)}\r\n\r\n".encode() + content)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            latencies[endpoint].append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run(host, port, n_requests, concurrency, repeat, endpoints, seed):
+    rng = random.Random(seed)
+    jobs = []
+    for _ in range(n_requests):
+        if jobs and rng.random() < repeat:
+            jobs.append(rng.choice(jobs))
+        else:
+            endpoint = rng.choice(endpoints)
+            jobs.append((endpoint, random_body(endpoint, rng)))
+    jobs.reverse()
+    latencies = {endpoint: [] for endpoint in endpoints}
+    errors = []
+    start = time.perf_counter()
+    await asyncio.gather(*[client(host, port, jobs, latencies, errors) for _ in range(concurrency)])
+    return latencies, errors, time.perf_counter() - start
+
+
+async def fetch_stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET /stats HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+def report(latencies, errors, seconds):
+    every = np.concatenate([np.asarray(values) for values in latencies.values()])
+    print(f"{'endpoint':12s} {'requests':>9s} {'p50 ms':>8s} {'p90 ms':>8s} {'p99 ms':>8s}")
+    for name, values in list(latencies.items()) + [("all", every)]:
+        if len(values):
+            p50, p90, p99 = np.percentile(np.asarray(values) * 1000, [50, 90, 99])
+            print(f"{name:12s} {len(values):9,d} {p50:8.2f} {p90:8.2f} {p99:8.2f}")
+    print(f"\n{len(every):,} requests in {seconds:.2f} s: {len(every) / seconds:,.0f} requests/s, {len(errors)} errors")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test a local lc4hw.service instance.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=20_000, help="Total requests (default 20000)")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent keep-alive connections (default 64)")
+    parser.add_argument("--repeat", type=float, default=0.5, help="Share of requests repeating an earlier body (default 0.5)")
+    parser.add_argument("--endpoints", nargs="+", default=["/lifecycle", "/energy", "/loan"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spawn", action="store_true", help="Start a service instance for the duration of the test")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen([sys.executable, "-m", "lc4hw.service", "--host", args.host, "--port", str(args.port)],
+                                  cwd=root, stdout=subprocess.DEVNULL)
+        time.sleep(1.5)
+    try:
+        latencies, errors, seconds = asyncio.run(run(args.host, args.port, args.requests, args.concurrency, args.repeat, args.endpoints, args.seed))
+        report(latencies, errors, seconds)
+        stats = asyncio.run(fetch_stats(args.host, args.port))
+        cache = stats["cache"]
+        print(f"Cache: {cache['hits']:,} hits, {cache['misses']:,} misses")
+        for endpoint, batches in stats["batches"].items():
+            if batches["batches"]:
+                print(f"{endpoint}: {batches['items']:,} evaluations in {batches['batches']:,} batches (mean {batches['mean_size']:.1f})")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#Benchmarks of the calculation core and of full-page rerun latency of the pages of the Streamlit app.
+#Core functions are timed on a single scenario (with the memoization cache cleared, and with a cache hit) and
+#their vectorized engine counterparts on batches of up to a million scenarios. Pages are rerun headless through
+#streamlit.testing's AppTest, which executes the script exactly as a browser interaction would.
+#
+#Usage (from the repository root):
+#    python -m benchmarks.run --output benchmarks/results/latest.json
+#    python -m benchmarks.run --compare benchmarks/results/baseline.json --threshold 0.2
+#Any result whose median is more than `threshold` slower than the baseline is flagged and the exit code is 1.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root not in sys.path:
+    sys.path.insert(0, root)
+
+from app_pages import pages  # noqa: E402
+from lc4hw import breakeven, core, demand, engine, finance, heatpump  # noqa: E402
+from lc4hw.defaults import main_calculator_defaults  # noqa: E402
+
+app = "app.py"
+
+# Main Calculator defaults, used for every scenario
+tank_size, hot_temp, cold_temp = 400, 65, 10
+heating_days, heating_days_topup, project_lifetime = 270, 20, 15
+
+
+def measure(func, repeats=7, min_time=0.05):
+    # Median/min seconds per call; fast calls are looped so that each sample takes at least min_time
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+    number = max(1, int(min_time / first)) if first > 0 else 1000
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return {"median_s": statistics.median(samples), "min_s": min(samples), "repeats": repeats, "number": number}
+
+
+def uncached(func, *args):
+    # Call a memoized function with its cache cleared so the calculation itself is timed
+    def call():
+        func.cache_clear()
+        func(*args)
+    return call
+
+
+def core_benchmarks(sizes, repeats):
+    results = {}
+    running_args = (tank_size, hot_temp, cold_temp, 0.85, 0.70, 3.0, project_lifetime, heating_days, heating_days_topup)
+    lifecycle_args = (0.70, 0.03, 12_000.0, project_lifetime, 0.85)
+
+    results["calculate_running_costs[single]"] = measure(uncached(core.calculate_running_costs, *running_args), repeats)
+    results["calculate_running_costs[cached]"] = measure(lambda: core.calculate_running_costs(*running_args), repeats)
+    results["calculate_lifecycle_cost[single]"] = measure(uncached(core.calculate_lifecycle_cost, *lifecycle_args), repeats)
+    results["calculate_lifecycle_cost[cached]"] = measure(lambda: core.calculate_lifecycle_cost(*lifecycle_args), repeats)
+    results["calculate_emissions[single]"] = measure(lambda: core.calculate_emissions(12_000.0, 0.21), repeats)
+    results["calculate_loan_payment[single]"] = measure(lambda: core.calculate_loan_payment(10_000, 0.05, 10), repeats)
+
+    # The page functions take one scenario; batches go through the engine functions they are built on
+    rng = np.random.default_rng(0)
+    for n in sizes:
+        efficiency = rng.uniform(0.7, 4.0, n)
+        fuel_cost = rng.uniform(0.1, 2.5, n)
+        escalation = rng.uniform(0.0, 6.0, n)
+        emission_factor = rng.uniform(0.0, 0.3, n)
+        energy = engine.annual_energy_kwh(rng.uniform(50, 1000, n), hot_temp, cold_temp, heating_days, heating_days_topup)
+        principal = rng.uniform(1_000, 20_000, n)
+        rate = rng.uniform(0.0, 0.15, n)
+        term = rng.integers(1, 26, n)
+        results[f"running_costs[batch={n}]"] = measure(
+            lambda: engine.running_costs(energy, efficiency, fuel_cost, escalation, project_lifetime), repeats)
+        results[f"total_running_cost[batch={n}]"] = measure(
+            lambda: engine.total_running_cost(energy, efficiency, fuel_cost, escalation, project_lifetime), repeats)
+        results[f"calculate_emissions[batch={n}]"] = measure(lambda: core.calculate_emissions(energy, emission_factor), repeats)
+        results[f"monthly_payment[batch={n}]"] = measure(lambda: finance.monthly_payment(principal, rate, term), repeats)
+        # All technology pairs at n points of one input
+        overrides = {("fuel_costs", "Heat Pump"): fuel_cost}
+        results[f"payback[batch={n}]"] = measure(lambda: breakeven.payback(main_calculator_defaults, overrides), repeats)
+        results[f"break_even_escalation[batch={n}]"] = measure(lambda: breakeven.break_even_escalation(main_calculator_defaults, overrides), repeats)
+        for name in list(results)[-6:]:
+            results[name]["items"] = n
+
+    # Stochastic demand of whole households x project lifetime; the largest block is the streaming default
+    for households in (100, 2_000):
+        profiles = demand.generate_profiles(households, project_lifetime, seed=0)
+        results[f"generate_profiles[households={households}]"] = measure(
+            lambda: demand.generate_profiles(households, project_lifetime, seed=0), max(1, repeats // 2))
+        results[f"assess_profiles[households={households}]"] = measure(lambda: demand.assess_profiles(profiles, main_calculator_defaults), repeats)
+        for name in list(results)[-2:]:
+            results[name]["items"] = households
+
+    # Weather files: text parse against the binary cache, and seasonal CoP of many locations at once
+    weather_path = os.path.join(root, heatpump.default_weather_path)
+    results["parse_weather[csv]"] = measure(lambda: heatpump.parse_weather(weather_path), repeats)
+    results["load_weather[cached]"] = measure(lambda: heatpump.load_weather(weather_path), repeats)
+    curve = heatpump.load_curve(os.path.join(root, heatpump.default_curve_path))
+    locations = heatpump.parse_weather(weather_path) + np.linspace(-5, 5, 500)[:, None]
+    results["seasonal_cop[locations=500]"] = measure(lambda: heatpump.seasonal_cop(locations, hot_temp, curve), repeats)
+    results["seasonal_cop[locations=500]"]["items"] = 500
+    return results
+
+
+def page_benchmarks(repeats, timeout=300):
+    # Rerun latency of every page of the app: the first run (default page) is reported separately as cold start
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    cwd = os.getcwd()
+    os.chdir(root)  # the app loads its logos and data files from relative paths
+    try:
+        at = AppTest.from_file(os.path.join(root, app), default_timeout=timeout)
+        start = time.perf_counter()
+        at.run()
+        results[f"{app}[cold start]"] = {"median_s": time.perf_counter() - start, "repeats": 1}
+        for path, title, _ in pages:
+            at.switch_page(path).run()
+            if at.exception:
+                results[f"{app}[{title}]"] = {"error": str(at.exception[0].value)}
+                continue
+            samples = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                at.run()
+                samples.append(time.perf_counter() - start)
+            results[f"{app}[{title}]"] = {"median_s": statistics.median(samples), "min_s": min(samples), "repeats": repeats}
+    finally:
+        os.chdir(cwd)
+    return results
+
+
+def environment():
+    import numpy
+
+    info = {"python": platform.python_version(), "numpy": numpy.__version__, "platform": platform.platform(),
+            "processor": platform.processor(), "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+    try:
+        import streamlit
+
+        info["streamlit"] = streamlit.__version__
+    except ImportError:
+        pass
+    return info
+
+
+def compare(results, baseline, threshold):
+    # Rows of (name, baseline, current, ratio, regressed) for every benchmark present in both runs
+    rows = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or "median_s" not in previous or "median_s" not in current:
+            continue
+        ratio = current["median_s"] / previous["median_s"] if previous["median_s"] else float("inf")
+        rows.append((name, previous["median_s"], current["median_s"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def format_seconds(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:,.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:,.2f} ms"
+    return f"{seconds:,.3f} s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the LC4HW calculation core and page rerun latency.")
+    parser.add_argument("--output", default=os.path.join(root, "benchmarks", "results", "latest.json"), help="Where to write the results (JSON)")
+    parser.add_argument("--compare", help="Baseline results file (JSON) to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown against the baseline (default 0.2 = 20%%)")
+    parser.add_argument("--repeats", type=int, default=7, help="Samples per benchmark (default 7)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 1_000, 100_000, 1_000_000], help="Batch sizes for the vectorized functions")
+    parser.add_argument("--skip-core", action="store_true", help="Do not run the calculation core benchmarks")
+    parser.add_argument("--skip-pages", action="store_true", help="Do not run the page rerun benchmarks")
+    args = parser.parse_args(argv)
+
+    results = {}
+    if not args.skip_core:
+        results.update(core_benchmarks(args.sizes, args.repeats))
+    if not args.skip_pages:
+        results.update(page_benchmarks(max(1, args.repeats // 2)))
+
+    for name, result in results.items():
+        print(f"{name:60s} {result['error'] if 'error' in result else format_seconds(result['median_s'])}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        rows = compare(results, baseline, args.threshold)
+        regressions = [row for row in rows if row[4]]
+        print(f"\nComparison with {args.compare} (threshold +{args.threshold:.0%}):")
+        for name, before, after, ratio, regressed in rows:
+            flag = "REGRESSION" if regressed else ""
+            print(f"{name:60s} {format_seconds(before):>12s} -> {format_seconds(after):>12s} {ratio:6.2f}x {flag}")
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) found")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#Concurrent-session load harness for the Main Calculator page of app.py.
+#Each simulated session is a headless streamlit.testing AppTest of the page, run in its own thread: it opens
+#the page, then changes and submits one Main Calculator input at a time (tank size, energy prices, lifetime,
+#pathway, carbon price), drawn at random from a few values per input so that sessions overlap as real users around
+#the defaults do. Every rerun is timed. For each number of sessions N the harness reports rerun latency
+#percentiles, reruns per second and the resident memory of the process, which hosts all sessions and the
+#shared caches just as a Streamlit server process does.
+#
+#Usage (from the repository root):
+#    python -m benchmarks.sessions --sessions 1 2 4 8 16 --interactions 20
+#    LC4HW_CACHE_MB=128 python -m benchmarks.sessions --sessions 8 --output benchmarks/results/sessions.json
+
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import threading
+import time
+
+import numpy as np
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root not in sys.path:
+    sys.path.insert(0, root)
+
+app = "app.py"  # opens on the Main Calculator
+
+# (widget type, label, values drawn from, key of the form whose submit button applies the change)
+interactions = [
+    ("number_input", "🛁 Hot Water Demand/Tank (litres)", [200, 300, 400, 500], "apply_demand_inputs"),
+    ("number_input", "Electricity (£/kWh)", [0.15, 0.18, 0.24, 0.30], "apply_price_inputs"),
+    ("number_input", "LPG (£/litre)", [0.6, 0.7, 0.8], "apply_price_inputs"),
+    ("number_input", "Electricity for Heat Pump (£/kWh)", [0.22, 0.28, 0.34], "apply_price_inputs"),
+    ("number_input", "LPG Price Escalation (% per year)", [2.0, 3.0, 4.0], "apply_price_inputs"),
+    ("number_input", "🕰️ Project Lifetime (years)", [10, 15, 20], "apply_environment_inputs"),
+    ("selectbox", "Grid decarbonisation pathway", None, "apply_environment_inputs"),  # options read from the page
+    ("number_input", "Carbon Price (£/tCO2e)", [0.0, 50.0, 80.0], "apply_environment_inputs"),
+]
+
+
+def memory_mb():
+    # Current and peak resident memory of this process in MB (peak only where /proc is unavailable)
+    try:
+        with open("/proc/self/status") as status:
+            fields = dict(line.split(":", 1) for line in status if line.startswith(("VmRSS", "VmHWM")))
+        return int(fields["VmRSS"].split()[0]) / 1024, int(fields["VmHWM"].split()[0]) / 1024
+    except (OSError, KeyError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak = peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KB on Linux
+        return float("nan"), peak
+
+
+def find(at, kind, label):
+    widgets = [widget for widget in getattr(at, kind) if widget.label == label]
+    return widgets[0] if widgets else None
+
+
+def session(seed, n_interactions, timeout, samples, errors, start_barrier):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    at = AppTest.from_file(os.path.join(root, app), default_timeout=timeout)
+    start_barrier.wait()
+    start = time.perf_counter()
+    at.run()
+    samples["open"].append(time.perf_counter() - start)
+    for _ in range(n_interactions):
+        kind, label, values, form = rng.choice(interactions)
+        widget = find(at, kind, label)
+        if widget is None:
+            continue
+        widget.set_value(rng.choice(values if values is not None else widget.options))
+        at.button(key=form).click()
+        start = time.perf_counter()
+        at.run()
+        samples["rerun"].append(time.perf_counter() - start)
+        if at.exception:
+            errors.append(f"{label}: {at.exception[0].value}")
+            break
+
+
+def run(n_sessions, n_interactions, timeout, seed):
+    samples = {"open": [], "rerun": []}  # list.append is atomic, so the threads share the lists
+    errors = []
+    barrier = threading.Barrier(n_sessions)
+    threads = [threading.Thread(target=session, args=(seed + i, n_interactions, timeout, samples, errors, barrier)) for i in range(n_sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    rss, peak = memory_mb()
+    result = {"sessions": n_sessions, "seconds": seconds, "reruns": len(samples["rerun"]), "errors": errors,
+              "reruns_per_s": (len(samples["open"]) + len(samples["rerun"])) / seconds, "rss_mb": rss, "peak_rss_mb": peak}
+    for name, values in samples.items():
+        if values:
+            p50, p90, p99 = np.percentile(np.asarray(values) * 1000, [50, 90, 99])
+            result[name] = {"p50_ms": p50, "p90_ms": p90, "p99_ms": p99, "max_ms": max(values) * 1000}
+    return result
+
+
+def report(results):
+    print(f"{'sessions':>8s} {'open p50':>9s} {'rerun p50':>10s} {'p90':>8s} {'p99':>8s} {'reruns/s':>9s} {'RSS MB':>8s} {'peak MB':>8s} {'errors':>7s}")
+    for r in results:
+        opened, rerun = r.get("open", {}), r.get("rerun", {})
+        print(f"{r['sessions']:8d} {opened.get('p50_ms', float('nan')):9.0f} {rerun.get('p50_ms', float('nan')):10.0f} "
+              f"{rerun.get('p90_ms', float('nan')):8.0f} {rerun.get('p99_ms', float('nan')):8.0f} {r['reruns_per_s']:9.2f} "
+              f"{r['rss_mb']:8.0f} {r['peak_rss_mb']:8.0f} {len(r['errors']):7d}")
+    print("(latencies in ms)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent Main Calculator sessions and report latency and memory.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8], help="Numbers of concurrent sessions to run, in turn")
+    parser.add_argument("--interactions", type=int, default=20, help="Widget changes per session (default 20)")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds allowed per rerun (default 300)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the results, with the cache statistics, to this file (JSON)")
+    args = parser.parse_args(argv)
+
+    from lc4hw.cache import cache_stats
+
+    os.chdir(root)  # the app loads its logos and data files from relative paths
+    results = []
+    for n in args.sessions:
+        results.append(run(n, args.interactions, args.timeout, args.seed))
+        for error in results[-1]["errors"]:
+            print(f"{n} sessions: {error}", file=sys.stderr)
+    report(results)
+    stats = cache_stats()
+    print(f"\nShared caches: {stats['total']['bytes'] / 1024 ** 2:,.1f} MB of {stats['total']['max_bytes'] / 1024 ** 2:,.0f} MB")
+    for name, cache in stats.items():
+        if name != "total" and cache["entries"]:
+            print(f"  {name}: {cache['entries']} entries, {cache['bytes'] / 1024 ** 2:,.1f} MB, "
+                  f"{cache['hits']:,} hits, {cache['misses']:,} misses, {cache['evictions']:,} evictions")
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"results": results, "caches": stats}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#Scaling of the national stock engine (lc4hw.stock) with the number of worker processes.
+#The same synthetic stock is evaluated with 1, 2, 4, ... workers; for each the harness reports throughput,
+#speedup and parallel efficiency against one worker, and the spread of the per-shard timings. With --pickled
+#the shards are also sent to the workers as pickled copies of their rows instead of through shared memory,
+#to show what the shared block saves.
+#
+#Usage (from the repository root):
+#    python -m benchmarks.stock --dwellings 5000000 --processes 1 2 4 8
+#    python -m benchmarks.stock --pickled --output benchmarks/results/stock.json
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root not in sys.path:
+    sys.path.insert(0, root)
+
+from lc4hw.defaults import main_calculator_defaults  # noqa: E402
+from lc4hw.stock import default_regions, evaluate_shard, run_stock, synthetic_stock  # noqa: E402
+
+
+def run_pickled(columns, n_regions, processes, shards):
+    # The same shards, each sent to a worker as a copy of its rows
+    bounds = np.linspace(0, len(columns["region"]), shards + 1).astype(int)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(evaluate_shard, main_calculator_defaults, n_regions, i, 0, bounds[i + 1] - bounds[i],
+                               {name: values[bounds[i]:bounds[i + 1]] for name, values in columns.items()}) for i in range(shards)]
+        timings = [future.result()["timing"] for future in futures]
+    return {"seconds": time.perf_counter() - start, "timings": timings}
+
+
+def summary(n, processes, result, single=None):
+    shard_seconds = np.array([timing["seconds"] for timing in result["timings"]])
+    row = {"processes": processes, "seconds": result["seconds"], "rows_per_second": n / result["seconds"],
+           "shard_ms": {"min": shard_seconds.min() * 1000, "median": float(np.median(shard_seconds)) * 1000, "max": shard_seconds.max() * 1000}}
+    if single is not None:
+        row["speedup"] = single / result["seconds"]
+        row["efficiency"] = row["speedup"] / processes
+    return row
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput of the national stock engine against the number of worker processes.")
+    parser.add_argument("--dwellings", type=int, default=2_000_000, help="Dwellings in the stock (default 2000000)")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8], help="Numbers of workers to run, in turn")
+    parser.add_argument("--shards-per-process", type=int, default=4, help="Shards per worker (default 4)")
+    parser.add_argument("--pickled", action="store_true", help="Also run each case with pickled shards instead of shared memory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the results to this file (JSON)")
+    args = parser.parse_args(argv)
+
+    columns = synthetic_stock(args.dwellings, args.seed)
+    n_regions = len(default_regions)
+    rows, single = [], None
+    for processes in args.processes:
+        shards = args.shards_per_process * processes
+        # One worker runs in-process: the baseline without pool start-up or shared memory
+        result = run_stock(columns, n_regions, processes=processes, shards=shards)
+        single = single or result["seconds"]
+        rows.append(dict(summary(args.dwellings, processes, result, single), transport="shared memory"))
+        if args.pickled and processes > 1:
+            rows.append(dict(summary(args.dwellings, processes, run_pickled(columns, n_regions, processes, shards), single), transport="pickled"))
+
+    print(f"{args.dwellings:,} dwellings on {os.cpu_count()} cores")
+    print(f"{'workers':>7s} {'transport':>13s} {'seconds':>8s} {'dwellings/s':>12s} {'speedup':>8s} {'efficiency':>10s} {'shard ms min/median/max':>24s}")
+    for row in rows:
+        shard = row["shard_ms"]
+        print(f"{row['processes']:7d} {row['transport']:>13s} {row['seconds']:8.2f} {row['rows_per_second']:12,.0f} {row['speedup']:8.2f} "
+              f"{row['efficiency']:10.0%} {shard['min']:8.1f}/{shard['median']:.1f}/{shard['max']:.1f}")
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"dwellings": args.dwellings, "cpu_count": os.cpu_count(), "results": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+#Computation core of the LC4HW hot water lifecycle calculators.
+#Submodules are imported explicitly (e.g. `from lc4hw.engine import running_costs`) so that importing the
+#package stays cheap for batch workers.
@@ -0,0 +1,141 @@
+#Payback and break-even analysis between every pair of technologies.
+#The cumulative cost of a technology after t years is install_cost + first_year_cost * S(g, t), with S the
+#geometric sum of lc4hw.engine. For technology i against a reference j (e.g. the incumbent LPG boiler):
+#    payback year          first year whose cumulative cost of i is at or below that of j
+#    break-even fuel price fuel price of i at which both cost the same over the project lifetime (closed form)
+#    break-even escalation escalation rate of i at which both cost the same (vectorized bisection, S is
+#                          increasing in g)
+#Everything is evaluated for all pairs at once, with the same overrides as lc4hw.sweep.evaluate, so results
+#have shape (technologies i, references j, *grid).
+
+import numpy as np
+
+from lc4hw.engine import geometric_sum
+from lc4hw.sweep import broadcast_inputs, grid_overrides
+
+escalation_bracket = (-99.0, 1000.0)  # % per year searched for a break-even escalation rate
+bisection_steps = 45  # brackets the rate to within 1e-10 % per year
+
+
+def _pairs(scenario, overrides):
+    # Per-technology terms (technologies, *grid) and the project lifetime (*grid); callers pair them up
+    shared, per_tech = broadcast_inputs(scenario, overrides or {})
+    fuel_cost = per_tech("fuel_costs")
+    first_year = shared["energy"] / per_tech("efficiencies") * fuel_cost
+    install, escalation, fuel_cost, first_year = np.broadcast_arrays(per_tech("install_costs"), per_tech("escalation_rates"), fuel_cost, first_year)
+    lifetime = shared["project_lifetime"][0]
+    return {
+        "install": install, "first_year": first_year, "escalation": escalation,
+        "energy_per_price": first_year / np.where(fuel_cost == 0, np.nan, fuel_cost),
+        "total": install + first_year * geometric_sum(escalation, lifetime), "lifetime": lifetime,
+    }
+
+
+def payback(scenario, overrides=None):
+    """Payback of each technology i against each reference j.
+
+    Returns a dict of arrays of shape (technologies, technologies, *grid):
+    year      first whole year (0 = cheaper to install) at whose end i has cost no more than j, NaN if never
+              within the project lifetime
+    time      the same with the crossing interpolated within that year (costs accrue evenly over a year)
+    saving    total cost of j minus total cost of i over the project lifetime
+    The diagonal (i == j) is NaN.
+    """
+    terms = _pairs(scenario, overrides)
+    lifetime = terms["lifetime"]
+    n_years = int(np.max(lifetime))
+    years = np.arange(n_years + 1)
+    # Cumulative cost at the end of years 0..n of every technology: (technologies, *grid, n + 1)
+    cumulative = terms["install"][..., None] + terms["first_year"][..., None] * geometric_sum(terms["escalation"][..., None], years)
+    gap = cumulative[:, None] - cumulative[None, :]
+    gap = np.where(years <= lifetime[..., None], gap, np.nan)
+
+    ahead = gap <= 0
+    found = ahead.any(axis=-1)
+    year = np.argmax(ahead, axis=-1)
+    before = np.take_along_axis(gap, np.maximum(year - 1, 0)[..., None], axis=-1)[..., 0]
+    at = np.take_along_axis(gap, year[..., None], axis=-1)[..., 0]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fraction = np.where(year > 0, before / (before - at), 0.0)
+    time = np.where(year > 0, year - 1 + fraction, 0.0)
+
+    diagonal = np.eye(len(scenario["systems"]), dtype=bool).reshape((len(scenario["systems"]),) * 2 + (1,) * (gap.ndim - 3))
+    missing = ~found | diagonal
+    return {
+        "year": np.where(missing, np.nan, year.astype(float)),
+        "time": np.where(missing, np.nan, time),
+        "saving": np.where(diagonal, np.nan, terms["total"][None, :] - terms["total"][:, None]),
+    }
+
+
+def break_even_fuel_price(scenario, overrides=None):
+    # Fuel price of i at which its lifetime total equals that of reference j: (technologies, technologies, *grid)
+    terms = _pairs(scenario, overrides)
+    target = terms["total"][None, :] - terms["install"][:, None]
+    per_price = (terms["energy_per_price"] * geometric_sum(terms["escalation"], terms["lifetime"]))[:, None]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        price = target / per_price
+    n = len(scenario["systems"])
+    price = np.where(np.eye(n, dtype=bool).reshape((n, n) + (1,) * (price.ndim - 2)), np.nan, price)
+    return np.where(price >= 0, price, np.nan)
+
+
+def break_even_escalation(scenario, overrides=None, bracket=escalation_bracket, steps=bisection_steps):
+    """Escalation rate of i (% per year) at which its lifetime total equals that of reference j.
+
+    Solves first_year_i * S(g, lifetime) = total_j - install_i by bisection on all pairs and grid points at
+    once; NaN where no rate within `bracket` gets there (e.g. i already costs more in its first year alone).
+    Shape (technologies, technologies, *grid).
+    """
+    terms = _pairs(scenario, overrides)
+    n = len(scenario["systems"])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        target = (terms["total"][None, :] - terms["install"][:, None]) / terms["first_year"][:, None]
+    lifetime = np.broadcast_to(terms["lifetime"], target.shape)
+    diagonal = np.eye(n, dtype=bool).reshape((n, n) + (1,) * (target.ndim - 2))
+    solvable = (geometric_sum(bracket[0], lifetime) <= target) & (target <= geometric_sum(bracket[1], lifetime)) & ~diagonal
+    # Bisect only the solvable points, as flat arrays
+    target, lifetime = target[solvable], lifetime[solvable]
+    low = np.full(target.shape, float(bracket[0]))
+    high = np.full(target.shape, float(bracket[1]))
+    for _ in range(steps):
+        middle = (low + high) / 2
+        below = geometric_sum(middle, lifetime) < target
+        low = np.where(below, middle, low)
+        high = np.where(below, high, middle)
+    rate = np.full(solvable.shape, np.nan)
+    rate[solvable] = (low + high) / 2
+    return rate
+
+
+def pair_table(scenario, reference):
+    # One row per technology against `reference` at the scenario's own inputs
+    import pandas as pd
+
+    systems = scenario["systems"]
+    j = systems.index(reference)
+    result = payback(scenario)
+    price = break_even_fuel_price(scenario)
+    escalation = break_even_escalation(scenario)
+    rows = [i for i in range(len(systems)) if i != j]
+    return pd.DataFrame({
+        "Payback Year": result["year"][rows, j],
+        "Payback (years)": result["time"][rows, j],
+        f"Saving vs {reference} (£)": result["saving"][rows, j],
+        "Energy Price": [scenario["fuel_costs"][systems[i]] for i in rows],
+        "Break-even Energy Price": price[rows, j],
+        "Escalation Rate (%)": [scenario["escalation_rates"][systems[i]] for i in rows],
+        "Break-even Escalation Rate (%)": escalation[rows, j],
+    }, index=pd.Index([systems[i] for i in rows], name="Technology"))
+
+
+def payback_grid(scenario, axes, technology, reference):
+    """Payback of `technology` against `reference` over the Cartesian grid of `axes` (as lc4hw.sweep.grid_sweep).
+
+    Returns a dict with year, time and saving, each of shape (len(values) of each axis, in the order given).
+    """
+    # Only the pair is evaluated: the scenario is narrowed to the two technologies
+    pair = dict(scenario, systems=[technology, reference])
+    result = payback(pair, grid_overrides(axes))
+    shape = tuple(len(values) for values in axes.values())
+    return {name: np.broadcast_to(values[0, 1], shape) for name, values in result.items()}
@@ -0,0 +1,236 @@
+#Bounded in-process caches for the LC4HW calculators.
+#Streamlit reruns the page script on every interaction but keeps imported modules alive, so caches held
+#here survive reruns and are shared by all sessions of the same server process: the first session computes
+#or renders a default result and every other session gets the same (immutable) object back.
+#
+#Every cache is bounded by its number of entries and, optionally, by the bytes its values hold; on top of
+#that all caches of the process share one memory budget (LC4HW_CACHE_MB, default 512 MB). When the total goes
+#over the budget, least recently used entries of the largest cache are evicted first. cache_stats() reports
+#every cache by name.
+
+import functools
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+process_budget = int(float(os.environ.get("LC4HW_CACHE_MB", 512)) * 1024 * 1024)
+_caches = {}  # name -> LRUCache, for the process budget and cache_stats()
+_caches_lock = threading.Lock()
+
+
+def sizeof(value):
+    # Approximate bytes held by a cached value (arrays, DataFrames, bytes, strings and containers of them)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray, memoryview, str)):
+        return len(value)
+    if hasattr(value, "memory_usage") and hasattr(value, "index"):
+        # pandas DataFrame or Series
+        usage = value.memory_usage(deep=True, index=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    # Thread-safe least-recently-used mapping with a maximum number of entries and, optionally, of bytes
+
+    def __init__(self, maxsize=256, max_bytes=None, name=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.name = name
+        self.data = OrderedDict()
+        self.sizes = {}
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if name is not None:
+            with _caches_lock:
+                _caches[name] = self
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key in self.data:
+                self.data.move_to_end(key)
+                self.hits += 1
+                return self.data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        size = sizeof(value) if self.name is not None or self.max_bytes is not None else 0
+        with self.lock:
+            if key in self.data:
+                self.bytes -= self.sizes[key]
+            self.data[key] = value
+            self.data.move_to_end(key)
+            self.sizes[key] = size
+            self.bytes += size
+            self._shrink(self.maxsize, self.max_bytes)
+        if self.name is not None:
+            _enforce_budget()
+
+    def _shrink(self, maxsize, max_bytes=None):
+        # Evict from the old end until both bounds hold, always keeping the newest entry (lock held by the caller)
+        while len(self.data) > 1 and (len(self.data) > maxsize or (max_bytes is not None and self.bytes > max_bytes)):
+            key, _ = self.data.popitem(last=False)
+            self.bytes -= self.sizes.pop(key)
+            self.evictions += 1
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.data
+
+    def __len__(self):
+        return len(self.data)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+            self.sizes.clear()
+            self.bytes = 0
+
+    def stats(self):
+        return {"entries": len(self.data), "maxsize": self.maxsize, "bytes": self.bytes, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+def _enforce_budget():
+    # Evict from the largest named caches until all of them together fit in process_budget
+    with _caches_lock:
+        caches = list(_caches.values())
+    total = sum(cache.bytes for cache in caches)
+    while total > process_budget:
+        largest = max(caches, key=lambda cache: cache.bytes)
+        with largest.lock:
+            before = largest.bytes
+            largest._shrink(largest.maxsize, max(0, largest.bytes - (total - process_budget)))
+            freed = before - largest.bytes
+        if freed <= 0:
+            break
+        total -= freed
+
+
+def cache_stats():
+    # {name: stats} of every named cache, plus the process total
+    with _caches_lock:
+        caches = dict(_caches)
+    stats = {name: cache.stats() for name, cache in sorted(caches.items())}
+    stats["total"] = {"bytes": sum(cache.bytes for cache in caches.values()), "max_bytes": process_budget}
+    return stats
+
+
+def make_key(value):
+    # Hashable, order-preserving key for nested lists, tuples and dicts of numbers, strings and NumPy arrays
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return ("ndarray", "O", value.shape) + tuple(make_key(v) for v in value.ravel().tolist())
+        digest = hashlib.blake2b(np.ascontiguousarray(value).reshape(-1).view(np.uint8), digest_size=16).hexdigest()
+        return ("ndarray", value.dtype.str, value.shape, digest)
+    if hasattr(value, "index") and hasattr(value, "to_numpy"):
+        # pandas Series or DataFrame
+        columns = tuple(value.columns) if hasattr(value, "columns") else (value.name,)
+        return (type(value).__name__, columns, make_key(value.index.to_numpy()), make_key(value.to_numpy()))
+    if isinstance(value, dict):
+        return ("dict",) + tuple((make_key(k), make_key(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__,) + tuple(make_key(v) for v in value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _freeze(value):
+    # Results are shared between callers, so cached arrays are made read-only
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            _freeze(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _freeze(item)
+    return value
+
+
+def memoize(maxsize=256, max_bytes=None):
+    """Decorator caching a pure function's results in an LRUCache keyed on its arguments.
+
+    The cache is named after the function (module.name) in cache_stats() and counts towards the process
+    budget. The wrapper exposes the cache as `.cache` and a `.cache_clear()` method.
+    """
+    def decorator(func):
+        cache = LRUCache(maxsize, max_bytes, name=f"{func.__module__}.{func.__qualname__}")
+        missing = object()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (make_key(args), make_key(kwargs))
+            result = cache.get(key, missing)
+            if result is missing:
+                result = _freeze(func(*args, **kwargs))
+                cache.put(key, result)
+            return result
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+# Results of page-level calculations and files read by the pages, shared by all sessions
+shared_results = LRUCache(maxsize=256, max_bytes=128 * 1024 * 1024, name="shared results")
+shared_files = LRUCache(maxsize=64, max_bytes=64 * 1024 * 1024, name="shared files")
+
+
+def cached_call(func, *args, **kwargs):
+    """func(*args, **kwargs) through the shared results cache, keyed on the function and its arguments.
+
+    For pure calculations called from a page that are not memoized themselves (sweeps, tornado, tables);
+    the result is shared by every session and must not be modified.
+    """
+    key = (func.__module__, func.__qualname__, make_key(args), make_key(kwargs))
+    missing = object()
+    result = shared_results.get(key, missing)
+    if result is missing:
+        result = _freeze(func(*args, **kwargs))
+        shared_results.put(key, result)
+    return result
+
+
+def cached_file(loader, path, *args):
+    # loader(path, *args) read once per process and file version (the key includes the modification time)
+    key = (loader.__module__, loader.__qualname__, os.path.abspath(path), os.path.getmtime(path), make_key(args))
+    missing = object()
+    result = shared_files.get(key, missing)
+    if result is missing:
+        result = _freeze(loader(path, *args))
+        shared_files.put(key, result)
+    return result
+
+
+@memoize(maxsize=16)
+def load_image(path, max_width=600):
+    """Decode an image once per process, downsize it to max_width and return it as PNG bytes.
+
+    st.image serves bytes as they are, so the sidebar logos are neither decoded nor re-encoded on reruns.
+    """
+    import io
+
+    from PIL import Image
+
+    with Image.open(path) as image:
+        image.thumbnail((max_width, max_width * 4))
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
@@ -0,0 +1,143 @@
+#Matplotlib charts for the LC4HW pages.
+#matplotlib is imported inside each function so that pages (and batch jobs) that never draw a chart don't pay for it.
+#Charts are standalone matplotlib.figure.Figure objects, never registered with pyplot, so nothing accumulates in
+#pyplot's global figure manager under multi-user load; render_chart() turns a chart into cached PNG bytes.
+
+import io
+
+from lc4hw.cache import LRUCache, make_key
+
+# Define constants
+RED_COLOR = '#d20a11'
+NAVY_COLOR = '#00313d'
+BEIGE_COLOR = '#d8d2c4'
+render_dpi = 150
+rendered_charts = LRUCache(maxsize=128, max_bytes=64 * 1024 * 1024, name="charts")  # PNG bytes keyed on chart function and plotted data
+
+
+def _figure(figsize=None):
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    return fig, fig.subplots()
+
+
+def close(fig):
+    # Release the figure's artists and canvas right away instead of waiting for garbage collection
+    fig.clear()
+    fig.canvas = None
+
+
+def render_chart(chart, *args, **kwargs):
+    """PNG bytes of chart(*args, **kwargs), rendered once per distinct plotted data.
+
+    The key covers the chart function and all of its arguments (data, selection and styling), so an
+    unchanged chart costs one hash on rerun. The figure is closed as soon as it has been rendered.
+    """
+    key = (chart.__module__, chart.__name__, make_key(args), make_key(kwargs))
+    png = rendered_charts.get(key)
+    if png is None:
+        fig = chart(*args, **kwargs)
+        try:
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format="png", dpi=render_dpi, bbox_inches="tight", facecolor=fig.get_facecolor())
+            png = buffer.getvalue()
+        finally:
+            close(fig)
+        rendered_charts.put(key, png)
+    return png
+
+
+def bar_chart(df, column, title, color=RED_COLOR, xlabel="Options"):
+    fig, ax = _figure()
+    # Change background color
+    ax.set_facecolor(BEIGE_COLOR)
+    fig.patch.set_facecolor(BEIGE_COLOR)  # Outer background
+    df.plot(kind='bar', y=column, legend=False, ax=ax, color=color)
+    ax.set_ylabel(column)
+    ax.set_xlabel(xlabel)
+    ax.set_title(title)
+    ax.tick_params(axis='x', labelrotation=45)
+    return fig
+
+
+def line_chart(results, systems, column="Cost", ylabel="Annual Cost (£)", legend_loc="upper right", **plot_kwargs):
+    # results maps each system to a DataFrame with a 'Year' column and the plotted column
+    fig, ax = _figure(figsize=(8, 5))
+    for system in systems:
+        df = results[system]
+        ax.plot(df['Year'], df[column], label=system, **plot_kwargs)
+    ax.set_xlabel("Year")
+    ax.set_ylabel(ylabel)
+    ax.legend(loc=legend_loc)
+    ax.grid(True)
+    return fig
+
+
+def tornado_chart(labels, low, high, base, title, color_low=NAVY_COLOR, color_high=RED_COLOR):
+    # Horizontal bars of the result at -x% and +x% of each input around the base result, widest swing on top
+    import numpy as np
+
+    low, high = np.asarray(low, dtype=float), np.asarray(high, dtype=float)
+    order = np.argsort(np.abs(high - low))
+    fig, ax = _figure(figsize=(8, max(3, 0.4 * len(labels))))
+    ax.set_facecolor(BEIGE_COLOR)
+    fig.patch.set_facecolor(BEIGE_COLOR)
+    positions = np.arange(len(order))
+    ax.barh(positions, low[order] - base, left=base, color=color_low, label="Input -x%")
+    ax.barh(positions, high[order] - base, left=base, color=color_high, label="Input +x%")
+    ax.axvline(base, color="black", linewidth=1)
+    ax.set_yticks(positions)
+    ax.set_yticklabels([labels[i] for i in order])
+    ax.set_xlabel("Total Cost (£)")
+    ax.set_title(title)
+    ax.legend(loc="lower right")
+    return fig
+
+
+def sweep_chart(values, total_costs, systems, xlabel, crossings=()):
+    # Total cost of each technology along a 1-D sweep, with the crossover points marked
+    fig, ax = _figure(figsize=(8, 5))
+    for i, system in enumerate(systems):
+        ax.plot(values, total_costs[i], label=system)
+    for crossing in crossings:
+        ax.axvline(crossing["value"], color="grey", linestyle="--", linewidth=1)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel("Total Cost (£)")
+    ax.legend(loc="upper left")
+    ax.grid(True)
+    return fig
+
+
+def cheapest_map(x_values, y_values, cheapest, systems, xlabel, ylabel):
+    # Which technology is cheapest at each point of a 2-D grid (cheapest has shape (len(x), len(y)))
+    from matplotlib.colors import ListedColormap
+    from matplotlib.patches import Patch
+
+    colors = [RED_COLOR, NAVY_COLOR, "#6c9a8b", "#e0a100", "#7a5195", "#8c8c8c"]
+    colors = (colors * (len(systems) // len(colors) + 1))[:len(systems)]
+    fig, ax = _figure(figsize=(8, 5))
+    ax.pcolormesh(x_values, y_values, cheapest.T, cmap=ListedColormap(colors), vmin=-0.5, vmax=len(systems) - 0.5, shading="nearest")
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title("Cheapest Technology")
+    ax.legend(handles=[Patch(color=c, label=s) for c, s in zip(colors, systems)], loc="upper left", bbox_to_anchor=(1, 1))
+    fig.tight_layout()
+    return fig
+
+
+def payback_map(x_values, y_values, payback_time, saving, xlabel, ylabel, title):
+    # Payback time over a 2-D grid (shape (len(x), len(y)), NaN = no payback) with the lifetime break-even line
+    import numpy as np
+
+    fig, ax = _figure(figsize=(8, 5))
+    fig.patch.set_facecolor("white")
+    ax.set_facecolor(BEIGE_COLOR)  # shows through where there is no payback
+    mesh = ax.pcolormesh(x_values, y_values, np.ma.masked_invalid(payback_time).T, cmap="viridis_r", shading="nearest")
+    fig.colorbar(mesh, ax=ax, label="Payback (years)")
+    if np.nanmin(saving) < 0 < np.nanmax(saving):
+        ax.contour(x_values, y_values, saving.T, levels=[0], colors=RED_COLOR, linewidths=2)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    return fig
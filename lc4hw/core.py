@@ -0,0 +1,63 @@
+#Calculation functions shared by the LC4HW Streamlit pages.
+#This module has no UI or plotting imports so it can be used from batch jobs and services;
+#pandas is only imported when a DataFrame is actually requested.
+#The cost functions are memoized (bounded LRU, keyed on their inputs), so a Streamlit rerun in which their
+#inputs did not change gets the previous result back; returned arrays and DataFrames must not be modified.
+
+import numpy as np
+
+from lc4hw.cache import memoize
+from lc4hw.engine import annual_energy_kwh, specific_heat_capacity, kJ_to_kwh, lifecycle_costs, running_costs, total_running_cost
+from lc4hw.finance import monthly_payment
+
+lpg_energy_content = 7.08  # Energy content of LPG in the UK: one litre of LPG contains 7.08 kWh of energy
+
+
+def calculate_energy_needed(hot_temp, cold_temp, efficiency):
+    # kWh of input energy per litre of hot water
+    energy_needed = specific_heat_capacity * (hot_temp - cold_temp) * kJ_to_kwh / efficiency
+    return energy_needed
+
+
+@memoize(maxsize=256)
+def calculate_running_costs(tank_size, hot_temp, cold_temp, efficiency, fuel_cost, escalation_rate, project_lifetime, heating_days, heating_days_topup):
+    import pandas as pd
+
+    energypertank_kWh = tank_size * (hot_temp - cold_temp) * specific_heat_capacity * kJ_to_kwh
+    annual_energy_kWh = energypertank_kWh * (heating_days + heating_days_topup)
+    annual_costs, _, total_cost = running_costs(annual_energy_kWh, efficiency, fuel_cost, escalation_rate, project_lifetime)
+    years = np.arange(1, project_lifetime + 1)
+    return pd.DataFrame({"Year": years, "Cost": annual_costs}), float(total_cost), annual_energy_kWh
+
+
+@memoize(maxsize=256)
+def calculate_daily_running_costs(daily_water_usage, temp_rise, efficiency, fuel_cost, escalation_rate, years):
+    # Variant used by the H2 comparison page: demand given as litres per day, heated every day of the year
+    import pandas as pd
+
+    annual_energy_kWh = float(annual_energy_kwh(daily_water_usage, temp_rise, 0, 365))
+    annual_costs, _, total_cost = running_costs(annual_energy_kWh, efficiency, fuel_cost, escalation_rate, years)
+    return pd.DataFrame({"Year": np.arange(1, years + 1), "Cost": annual_costs}), float(total_cost)
+
+
+@memoize(maxsize=256)
+def calculate_lifecycle_cost(price, esc_rate, required_energy, project_lifetime, efficiency=1.0):
+    # esc_rate is a fraction here (0.04 for 4%), the engine takes % per year
+    return float(total_running_cost(required_energy, efficiency, price, esc_rate * 100, project_lifetime))
+
+
+@memoize(maxsize=128)
+def calculate_technology_costs(tank_size, hot_temp, cold_temp, efficiencies, fuel_costs, escalation_rates, project_lifetime, heating_days, heating_days_topup, install_costs):
+    # Main Calculator: all technologies in one call, per-technology inputs given as lists in the same order
+    return lifecycle_costs(tank_size, hot_temp, cold_temp, efficiencies, fuel_costs, escalation_rates, project_lifetime,
+                           heating_days, heating_days_topup, install_cost=install_costs)
+
+
+def calculate_emissions(annual_energy_kwh, emission_factor):
+    emission = annual_energy_kwh * emission_factor
+    return emission
+
+
+def calculate_loan_payment(principal, rate, term):
+    # rate is a fraction per year, term in years; see lc4hw.finance for schedules and whole grids of loans
+    return float(monthly_payment(principal, rate, term))
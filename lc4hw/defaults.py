@@ -0,0 +1,47 @@
+#Default inputs of the Main Calculator page (app_pages/main_calculator.py), for use outside the Streamlit page.
+
+from lc4hw.sweep import default_scenario
+
+systems = ["LPG Boiler", "Electric Boiler", "Heat Pump", "Hydrogen Boiler"]
+
+main_calculator_defaults = default_scenario(
+    systems,
+    install_costs={"LPG Boiler": 2000, "Electric Boiler": 3000, "Heat Pump": 2500, "Hydrogen Boiler": 3500},
+    efficiencies={"LPG Boiler": 0.85, "Electric Boiler": 1.00, "Heat Pump": 2.50, "Hydrogen Boiler": 0.85},
+    fuel_costs={"LPG Boiler": 0.70, "Electric Boiler": 0.18, "Heat Pump": 0.28, "Hydrogen Boiler": 2.5},
+    escalation_rates={"LPG Boiler": 3.00, "Electric Boiler": 1.50, "Heat Pump": 2.50, "Hydrogen Boiler": 2.50},
+    emission_factors={"LPG Boiler": 0.21, "Electric Boiler": 0.25, "Heat Pump": 0.08, "Hydrogen Boiler": 0.15},
+    tank_size=400,
+    hot_temp=65,
+    cold_temp=10,
+    heating_days=270,
+    heating_days_topup=20,
+    project_lifetime=15,
+)
+
+# Widget defaults of the LPG vs Electric page (prices in £, escalation rates as fractions)
+lc4hw_defaults = {
+    "tank_size": 400,
+    "heating_days": 270,
+    "hot_temp": 65.0,
+    "cold_temp": 10.0,
+    "efficiency": 0.80,
+    "lpg_efficiency": 0.80,
+    "lpg_energy_content": 7.00,
+    "lpg_price": 0.60,
+    "lpg_escalation": 0.04,
+    "electricity_price": 0.15,
+    "electricity_escalation": 0.015,
+    "project_lifetime": 15,
+}
+
+# Widget defaults of the Hydrogen Comparison page
+h2_defaults = {
+    "years": 10,
+    "daily_water_usage": 400,
+    "temp_rise": 55,
+    "install_costs": {"Electric Boiler": 2000, "LPG Boiler": 3000, "Heat Pump": 2500, "Hydrogen Boiler": 3500},
+    "efficiencies": {"Electric Boiler": 1.0, "LPG Boiler": 0.90, "Heat Pump": 3.5, "Hydrogen Boiler": 0.85},
+    "fuel_costs": {"Electric Boiler": 0.28, "LPG Boiler": 0.8, "Heat Pump": 0.28, "Hydrogen Boiler": 2.5},
+    "escalation_rate": 2,
+}
@@ -0,0 +1,215 @@
+#Stochastic hot water demand: draw-off events of many households over many years.
+#Every day, the number of draw-offs of each event type (shower, bath, basin, kitchen sink) in a household is
+#Poisson with a rate of base + per_person * occupants, a little higher in winter than in summer, and each
+#draw-off takes a gamma-distributed volume of hot water (mean `litres`, coefficient of variation `cv`). The sum
+#of n such volumes is itself one gamma draw, so the daily totals of thousands of households x years come from
+#a single vectorized pass without drawing the events one by one; the event sequences (household, year, day,
+#half-hour slot, type, litres) are only drawn when asked for, at the times of day typical of each type.
+#
+#Draw-offs are litres at hot_temp. The mains cold water temperature follows a seasonal cosine around the
+#calculators' fixed cold_temp (coldest in mid-February), so the same draw-off takes more heat in winter.
+#
+#stream_profiles() yields the same arrays a block of households at a time, each block from its own child of
+#SeedSequence(seed), so national-scale profile sets are pushed through assess_profiles() or written to disk
+#without ever being held in memory at once. A seeded run is reproducible for the same chunk size.
+#
+#Usage: python -m lc4hw.demand 1000000 results.parquet --years 15 --chunk-size 2000 --seed 1
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from lc4hw.engine import energy_per_tank_kwh, escalation_factors, first_year_cost
+from lc4hw.tou import slots_per_day
+
+days_per_year = 365
+coldest_day = 45  # day of the year (0 = 1 January) with the coldest mains water
+
+# Share of households with 1..5 occupants (England, rounded)
+default_household_sizes = {1: 0.29, 2: 0.35, 3: 0.15, 4: 0.14, 5: 0.07}
+
+
+def _hours(*ranges):
+    # Time-of-day weights of the 48 half-hour slots from (first hour, last hour, weight) ranges
+    weights = np.full(24, 0.05)
+    for first, last, weight in ranges:
+        weights[first:last] = weight
+    weights = np.repeat(weights, slots_per_day // 24)
+    return weights / weights.sum()
+
+
+# Draw-off event types: daily rate base + per_person * occupants, mean litres of hot water, cv of the volume
+default_event_types = {
+    "shower": {"base": 0.0, "per_person": 0.6, "litres": 35.0, "cv": 0.4, "time_of_day": _hours((6, 9, 1.0), (9, 12, 0.3), (18, 23, 0.6))},
+    "bath": {"base": 0.0, "per_person": 0.1, "litres": 80.0, "cv": 0.3, "time_of_day": _hours((7, 9, 0.3), (18, 22, 1.0))},
+    "basin": {"base": 1.0, "per_person": 2.0, "litres": 2.0, "cv": 0.6, "time_of_day": _hours((6, 10, 1.0), (10, 18, 0.3), (18, 23, 0.8))},
+    "kitchen": {"base": 3.0, "per_person": 1.0, "litres": 4.0, "cv": 0.6, "time_of_day": _hours((7, 9, 0.6), (12, 14, 0.6), (17, 21, 1.0))},
+}
+
+
+def cold_water_temperature(day, mean=10.0, amplitude=5.0):
+    # Mains water temperature (°C) on each day of the year, mean +- amplitude
+    return mean - amplitude * np.cos(2 * np.pi * (np.asarray(day) - coldest_day) / days_per_year)
+
+
+def seasonal_factor(day, amplitude=0.1):
+    # Relative draw-off rate on each day of the year: 1 + amplitude in the coldest week, 1 - amplitude in the warmest
+    return 1 + amplitude * np.cos(2 * np.pi * (np.asarray(day) - coldest_day) / days_per_year)
+
+
+def draw_occupants(households, rng, household_sizes=default_household_sizes):
+    sizes = np.array(list(household_sizes), dtype=float)
+    shares = np.array(list(household_sizes.values()), dtype=float)
+    return rng.choice(sizes, households, p=shares / shares.sum())
+
+
+def generate_profiles(households, years, seed=None, occupants=None, hot_temp=65.0, cold_temp=10.0, cold_amplitude=5.0,
+                      seasonality=0.1, events=False, event_types=default_event_types, household_sizes=default_household_sizes):
+    """Daily hot water draw-off of `households` households over `years` years in one vectorized pass.
+
+    seed: int, SeedSequence or None. occupants: per household (drawn from household_sizes when None).
+    Returns a dict with occupants (households,), cold_temp (365,), daily_litres and daily_kwh (heat to raise the
+    draw-off from the day's cold water temperature to hot_temp) of shape (households, years, 365) as float32,
+    and their annual sums annual_litres and annual_kwh (households, years). With events=True it also has the draw-off
+    events as flat arrays event_household, event_year, event_day, event_slot, event_type (index into
+    event_types) and event_litres, in time order within each household, whose litres sum to daily_litres.
+    """
+    rng = np.random.default_rng(seed)
+    if occupants is None:
+        occupants = draw_occupants(households, rng, household_sizes)
+    occupants = np.broadcast_to(np.asarray(occupants, dtype=float), (households,))
+    shape = (households, years, days_per_year)
+    day = np.arange(days_per_year)
+    season = seasonal_factor(day, seasonality)
+
+    daily_litres = np.zeros(shape, dtype=np.float32)  # float32 halves the memory of the daily arrays
+    found = []
+    for t, event in enumerate(event_types.values()):
+        rate = (event["base"] + event["per_person"] * occupants)[:, None, None] * season
+        counts = rng.poisson(np.broadcast_to(rate, shape))
+        shape_k = 1 / event["cv"] ** 2
+        scale = event["litres"] * event["cv"] ** 2
+        if not events:
+            daily_litres += rng.standard_gamma((counts * shape_k).astype(np.float32), dtype=np.float32) * np.float32(scale)
+            continue
+        # One record per draw-off: the flat index of its day repeated `count` times
+        nonzero = np.flatnonzero(counts)
+        index = np.repeat(nonzero, counts.ravel()[nonzero])
+        litres = rng.gamma(shape_k, scale, len(index))
+        daily_litres += np.bincount(index, weights=litres, minlength=daily_litres.size).reshape(shape).astype(np.float32)
+        slot = rng.choice(slots_per_day, len(index), p=event["time_of_day"])
+        found.append((index, slot, np.full(len(index), t, dtype=np.int8), litres))
+
+    cold = cold_water_temperature(day, cold_temp, cold_amplitude)
+    daily_kwh = energy_per_tank_kwh(daily_litres, hot_temp, cold).astype(np.float32)
+    profiles = {
+        "occupants": occupants,
+        "cold_temp": cold,
+        "daily_litres": daily_litres,
+        "daily_kwh": daily_kwh,
+        "annual_litres": daily_litres.sum(axis=-1, dtype=float),
+        "annual_kwh": daily_kwh.sum(axis=-1, dtype=float),
+    }
+    if events:
+        index, slot, kind, litres = (np.concatenate(values) for values in zip(*found))
+        order = np.lexsort((slot, index))
+        household, year, day_of_year = np.unravel_index(index[order], shape)
+        profiles.update(event_household=household, event_year=year, event_day=day_of_year, event_slot=slot[order],
+                        event_type=kind[order], event_litres=litres[order])
+    return profiles
+
+
+def stream_profiles(households, years, chunk_size=2_000, seed=None, occupants=None, **kwargs):
+    """Generator of generate_profiles() results for consecutive blocks of at most chunk_size households.
+
+    Each block has its own child of SeedSequence(seed); occupants, if given, has one entry per household and
+    is split with the blocks. Every result also has `first`, the index of its first household.
+    """
+    starts = range(0, households, chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    for start, child in zip(starts, seeds):
+        size = min(chunk_size, households - start)
+        block = None if occupants is None else np.asarray(occupants)[start:start + size]
+        profiles = generate_profiles(size, years, child, block, **kwargs)
+        profiles["first"] = start
+        yield profiles
+
+
+def assess_profiles(profiles, scenario):
+    """Lifecycle costs and emissions of every technology for each household of a profile block.
+
+    Household demand replaces the scenario's tank size, temperatures and heating days: year k of the project
+    uses profile year k (the profiles must cover project_lifetime years). Returns total_costs and
+    lifecycle_emissions of shape (technologies, households) and cheapest (index into scenario['systems']).
+    """
+    systems = scenario["systems"]
+    n_years = int(scenario["project_lifetime"])
+    annual_kwh = profiles["annual_kwh"]
+    if annual_kwh.shape[1] < n_years:
+        raise ValueError(f"The profiles cover {annual_kwh.shape[1]} years, the project lifetime is {n_years}")
+    annual_kwh = annual_kwh[None, :, :n_years]
+
+    def per_tech(name):
+        return np.array([scenario[name][system] for system in systems], dtype=float)[:, None, None]
+
+    growth = escalation_factors(per_tech("escalation_rates")[:, :, 0], n_years)  # (technologies, 1, years)
+    annual_costs = first_year_cost(annual_kwh, per_tech("efficiencies"), per_tech("fuel_costs")) * growth
+    total_costs = per_tech("install_costs")[:, :, 0] + annual_costs.sum(axis=-1)
+    return {
+        "total_costs": total_costs,
+        "lifecycle_emissions": (annual_kwh * per_tech("emission_factors")).sum(axis=-1),
+        "cheapest": np.argmin(total_costs, axis=0),
+    }
+
+
+def household_table(profiles, assessed, systems):
+    # One row per household: demand and each technology's lifecycle cost and emission
+    first = profiles.get("first", 0)
+    out = {
+        "household": np.arange(first, first + len(profiles["occupants"])),
+        "occupants": profiles["occupants"],
+        "Mean Annual Hot Water (litres)": profiles["annual_litres"].mean(axis=1),
+        "Mean Annual Heat Demand (kWh)": profiles["annual_kwh"].mean(axis=1),
+    }
+    for i, system in enumerate(systems):
+        out[f"Total Cost (£) [{system}]"] = assessed["total_costs"][i]
+    for i, system in enumerate(systems):
+        out[f"Lifecycle Emission (CO2e) [{system}]"] = assessed["lifecycle_emissions"][i]
+    out["Cheapest Technology"] = np.asarray(systems)[assessed["cheapest"]]
+    return out
+
+
+def main(argv=None):
+    from lc4hw.defaults import main_calculator_defaults
+    from lc4hw.export import TableWriter
+    from lc4hw.portfolio import _format
+
+    parser = argparse.ArgumentParser(description="Generate stochastic hot water demand for many households and assess every technology for each.")
+    parser.add_argument("households", type=int, help="Number of households")
+    parser.add_argument("output", help="Per-household results file (.csv, .parquet or .xlsx)")
+    parser.add_argument("--years", type=int, default=main_calculator_defaults["project_lifetime"], help="Years of demand = project lifetime (default 15)")
+    parser.add_argument("--chunk-size", type=int, default=2_000, help="Households per block (default 2000)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    scenario = dict(main_calculator_defaults, project_lifetime=args.years)
+    systems = scenario["systems"]
+    cheapest = np.zeros(len(systems), dtype=int)
+    start = time.perf_counter()
+    with TableWriter(args.output, _format(args.output, None)) as writer:
+        for profiles in stream_profiles(args.households, args.years, args.chunk_size, args.seed,
+                                        hot_temp=scenario["hot_temp"], cold_temp=scenario["cold_temp"]):
+            assessed = assess_profiles(profiles, scenario)
+            writer.write(household_table(profiles, assessed, systems))
+            cheapest += np.bincount(assessed["cheapest"], minlength=len(systems))
+            done = profiles["first"] + len(profiles["occupants"])
+            print(f"\r{done:,} households, {done / (time.perf_counter() - start):,.0f} households/s", end="", file=sys.stderr)
+    print(file=sys.stderr)
+    for system, count in zip(systems, cheapest):
+        print(f"{system}: cheapest for {count / args.households:.1%} of households")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#Year-by-year emissions with time-varying emission factors and an optional carbon price.
+#A technology's emission in project year k is annual_energy_kwh * emission_factor * multiplier[k]. Without a
+#pathway the multiplier is 1 every year; technologies running on grid electricity can instead follow a grid
+#decarbonisation pathway, whose multiplier is the grid carbon intensity of each calendar year relative to the
+#start year. A carbon price (£ per tonne CO2e, escalating like the fuel prices) adds to the annual costs.
+#
+#Pathway files are local CSV with a `year` column (calendar year, in any steps) and one column per pathway giving
+#the grid carbon intensity in kg CO2e/kWh; years between rows are interpolated and years after the last row keep
+#the last value.
+#data/grid_pathways.csv holds three illustrative UK-style pathways.
+
+import numpy as np
+
+from lc4hw.engine import escalation_factors
+from lc4hw.sweep import broadcast_inputs, evaluate
+
+default_pathways_path = "data/grid_pathways.csv"
+
+
+def load_pathways(source=default_pathways_path):
+    """Grid pathways from a CSV path or text file object as (names, years, intensity of shape (pathways, years))."""
+    table = np.atleast_1d(np.genfromtxt(source, delimiter=",", names=True, dtype=float, encoding="utf-8"))
+    if "year" not in table.dtype.names:
+        raise ValueError("A pathway file needs a 'year' column")
+    names = [name for name in table.dtype.names if name != "year" and not np.isnan(table[name]).all()]
+    order = np.argsort(table["year"])
+    return names, table["year"][order].astype(int), np.stack([table[name][order] for name in names])
+
+
+def pathway_multipliers(years, intensity, start_year, n_years):
+    # Intensity of project years 1..n_years relative to the start year, shape (pathways, n_years); the rows may be
+    # any calendar years: intensity is interpolated linearly between them and held at the last row after it
+    intensity = np.atleast_2d(np.asarray(intensity, dtype=float))
+    if start_year < years[0]:
+        raise ValueError(f"The pathways start in {years[0]}, after the start year {start_year}")
+    calendar = start_year + np.arange(max(n_years, 1))
+    values = np.stack([np.interp(calendar, years, row) for row in intensity])
+    start = values[:, 0]
+    if np.any(start <= 0):
+        raise ValueError(f"A pathway has no positive grid intensity in the start year {start_year}, so the later years have nothing to be relative to")
+    return values[:, :n_years] / start[:, None]
+
+
+def emission_series(annual_emission, multipliers):
+    # First-year emission (any shape) times the per-year multipliers (..., years)
+    return np.asarray(annual_emission, dtype=float)[..., None] * np.asarray(multipliers, dtype=float)
+
+
+def carbon_costs(annual_emissions, carbon_price, carbon_escalation=0.0):
+    # £ per year for emissions in kg CO2e (..., years), carbon_price in £/tCO2e escalating at carbon_escalation %/year
+    n_years = np.shape(annual_emissions)[-1]
+    return np.asarray(annual_emissions, dtype=float) / 1000 * carbon_price * escalation_factors(carbon_escalation, n_years)
+
+
+def trajectories(scenario, multipliers, on_grid, carbon_price=0.0, carbon_escalation=0.0, overrides=None):
+    """Annual emissions and carbon costs of every technology under every pathway in one broadcast call.
+
+    multipliers: (pathways, years) from pathway_multipliers, with at least project_lifetime years.
+    on_grid: one flag per technology; the others keep their emission factor constant.
+    overrides: arrays replacing scenario inputs, as in lc4hw.sweep.evaluate.
+    Arrays have shape (technologies, pathways, *grid, years) for the series and (technologies, pathways, *grid)
+    for the totals; years beyond a (swept) project lifetime are NaN in the series. Returns a dict with
+    annual_emissions, carbon_costs, lifecycle_emissions, total_costs (installation, fuel and carbon) and
+    cheapest (index into scenario['systems']).
+    """
+    overrides = overrides or {}
+    shared, per_tech = broadcast_inputs(scenario, overrides)
+    lifetime = shared["project_lifetime"][0]
+    n_years = int(np.max(lifetime))
+    multipliers = np.atleast_2d(np.asarray(multipliers, dtype=float))[:, :n_years]
+    if multipliers.shape[1] < n_years:
+        raise ValueError(f"The pathways cover {multipliers.shape[1]} years, the project lifetime is {n_years}")
+    first_year = shared["energy"] * per_tech("emission_factors")  # (technologies, *grid)
+    grid_ndim = first_year.ndim - 1
+    # (technologies, pathways, years) -> (technologies, pathways, *grid, years)
+    factor = np.where(np.asarray(on_grid, dtype=bool)[:, None, None], multipliers[None], 1.0)
+    factor = factor.reshape(factor.shape[:2] + (1,) * grid_ndim + (n_years,))
+    annual = first_year[:, None, ..., None] * factor
+    annual = np.where(np.arange(1, n_years + 1) <= lifetime[..., None], annual, np.nan)
+    carbon = carbon_costs(annual, carbon_price, carbon_escalation)
+    total_costs = evaluate(scenario, overrides)["total_costs"][:, None] + np.nansum(carbon, axis=-1)
+    return {
+        "annual_emissions": annual,
+        "carbon_costs": carbon,
+        "lifecycle_emissions": np.nansum(annual, axis=-1),
+        "total_costs": total_costs,
+        "cheapest": np.argmin(total_costs, axis=0),
+    }
@@ -0,0 +1,66 @@
+#Vectorized lifecycle cost engine for the hot water calculators.
+#All inputs broadcast against each other (e.g. technologies x scenarios) and a trailing years axis is added,
+#so a whole batch of what-if evaluations is one NumPy expression instead of a per-year Python loop.
+
+import numpy as np
+
+# Define constants
+specific_heat_capacity = 4.186  # Specific heat capacity of water in kJ/kg°C
+kJ_to_kwh = 1 / 3600  # Conversion factor from kJ to kWh
+
+
+def energy_per_tank_kwh(tank_size, hot_temp, cold_temp):
+    tank_size, hot_temp, cold_temp = (np.asarray(x, dtype=float) for x in (tank_size, hot_temp, cold_temp))
+    return tank_size * (hot_temp - cold_temp) * specific_heat_capacity * kJ_to_kwh
+
+
+def annual_energy_kwh(tank_size, hot_temp, cold_temp, heating_days, heating_days_topup=0):
+    return energy_per_tank_kwh(tank_size, hot_temp, cold_temp) * (np.asarray(heating_days) + np.asarray(heating_days_topup))
+
+
+def escalation_factors(escalation_rate, project_lifetime):
+    # (1 + g)^(year - 1) for year = 1..project_lifetime, escalation_rate in % per year as in the UI
+    growth = 1 + np.asarray(escalation_rate, dtype=float)[..., None] / 100
+    return growth ** np.arange(project_lifetime)
+
+
+def geometric_sum(escalation_rate, project_lifetime):
+    # Closed form of sum((1 + g)^k, k = 0..n-1) = ((1 + g)^n - 1) / g, with the g = 0 limit equal to n;
+    # a lifetime below zero is an empty sum, as in a loop over range(n)
+    g = np.asarray(escalation_rate, dtype=float) / 100
+    n = np.maximum(np.asarray(project_lifetime, dtype=float), 0.0)
+    safe_g = np.where(g == 0, 1.0, g)
+    return np.where(g == 0, n, np.expm1(n * np.log1p(safe_g)) / safe_g)
+
+
+def first_year_cost(annual_energy_kwh, efficiency, fuel_cost):
+    return np.asarray(annual_energy_kwh, dtype=float) / np.asarray(efficiency, dtype=float) * np.asarray(fuel_cost, dtype=float)
+
+
+def total_running_cost(annual_energy_kwh, efficiency, fuel_cost, escalation_rate, project_lifetime):
+    # Totals only: no years axis is materialised, so this is the cheapest path for large batches
+    base = first_year_cost(annual_energy_kwh, efficiency, fuel_cost)
+    return base * geometric_sum(escalation_rate, project_lifetime)
+
+
+def running_costs(annual_energy_kwh, efficiency, fuel_cost, escalation_rate, project_lifetime):
+    """Annual costs, cumulative costs and totals in one broadcast step.
+
+    Returns (annual, cumulative, total) where annual and cumulative have the broadcast input shape plus a
+    trailing axis of length project_lifetime, and total has the broadcast input shape.
+    """
+    base = first_year_cost(annual_energy_kwh, efficiency, fuel_cost)
+    base, escalation_rate = np.broadcast_arrays(base, np.asarray(escalation_rate, dtype=float))
+    annual = base[..., None] * escalation_factors(escalation_rate, project_lifetime)
+    cumulative = np.cumsum(annual, axis=-1)
+    total = base * geometric_sum(escalation_rate, project_lifetime)
+    return annual, cumulative, total
+
+
+def lifecycle_costs(tank_size, hot_temp, cold_temp, efficiency, fuel_cost, escalation_rate, project_lifetime,
+                    heating_days, heating_days_topup, install_cost=0):
+    # Same model as calculate_running_costs in lc4hw.core, plus the installation cost on the totals
+    energy = annual_energy_kwh(tank_size, hot_temp, cold_temp, heating_days, heating_days_topup)
+    annual, cumulative, total = running_costs(energy, efficiency, fuel_cost, escalation_rate, project_lifetime)
+    install_cost = np.asarray(install_cost, dtype=float)
+    return annual, cumulative + install_cost[..., None], total + install_cost, energy
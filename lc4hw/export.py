@@ -0,0 +1,208 @@
+#Streaming export of results to CSV, Parquet or Excel.
+#Rows are generated a chunk at a time straight from the result arrays and written to the destination (a path
+#or a binary file object such as io.BytesIO) as they are produced, so an export never holds a full DataFrame,
+#a CSV string and a bytes copy of the same data at once. CSV and Parquet go through pyarrow's streaming
+#writers; Excel uses openpyxl's write-only mode (optional dependency) and starts a new sheet every
+#1,048,575 rows, Excel's limit.
+#
+#Layouts for annual series: "long" has one row per scenario, technology and year; "wide" has one row per
+#scenario and year with a Cost and a CO2 Emission column per technology.
+
+import io
+
+import numpy as np
+
+formats = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+excel_max_rows = 1_048_575  # data rows per sheet, below the header
+
+
+class TableWriter:
+    """Appends chunks of columns ({name: 1-D array} or a DataFrame) to a CSV, Parquet or Excel destination.
+
+    Every chunk must have the same columns in the same order. Use as a context manager or call close().
+    """
+
+    def __init__(self, destination, fmt="csv"):
+        if fmt not in formats:
+            raise ValueError(f"Unknown export format {fmt}; use one of {', '.join(formats)}")
+        self.destination = destination
+        self.fmt = fmt
+        self.writer = None
+        self.rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, columns):
+        if hasattr(columns, "to_dict") and hasattr(columns, "columns"):
+            columns = {name: columns[name].to_numpy() for name in columns.columns}
+        if self.fmt == "xlsx":
+            self._write_excel(columns)
+        else:
+            self._write_arrow(columns)
+        self.rows += len(next(iter(columns.values()))) if columns else 0
+
+    def _write_arrow(self, columns):
+        import pyarrow as pa
+
+        # from_pandas: NaN becomes null, an empty cell in CSV and a missing value in Parquet
+        table = pa.table({name: pa.array(np.asarray(values), from_pandas=True) for name, values in columns.items()})
+        if self.writer is not None:
+            table = table.cast(self.schema)  # the types of the first chunk, e.g. when a later one is all null
+        else:
+            self.schema = table.schema
+            if self.fmt == "parquet":
+                import pyarrow.parquet as pq
+
+                self.writer = pq.ParquetWriter(self.destination, table.schema)
+            else:
+                import pyarrow.csv as pacsv
+
+                self.writer = pacsv.CSVWriter(self.destination, table.schema)
+        self.writer.write_table(table)
+
+    def _write_excel(self, columns):
+        try:
+            from openpyxl import Workbook
+        except ImportError as error:
+            raise ImportError("Excel export needs openpyxl (pip install openpyxl)") from error
+
+        if self.writer is None:
+            self.writer = Workbook(write_only=True)
+            self.header = list(columns)
+            self.sheet = None
+            self.sheet_rows = excel_max_rows
+        values = [_cells(v) for v in columns.values()]
+        for row in zip(*values):
+            if self.sheet_rows >= excel_max_rows:
+                self.sheet = self.writer.create_sheet(f"Results {len(self.writer.worksheets) + 1}" if self.writer.worksheets else "Results")
+                self.sheet.append(self.header)
+                self.sheet_rows = 0
+            self.sheet.append(row)
+            self.sheet_rows += 1
+
+    def close(self):
+        if self.writer is None:
+            return
+        if self.fmt == "xlsx":
+            self.writer.save(self.destination)
+        else:
+            self.writer.close()
+        self.writer = None
+
+
+def _cells(values):
+    # Python values for openpyxl, with None (an empty cell) in place of NaN
+    values = np.asarray(values)
+    if values.dtype.kind == "f":
+        return [None if value != value else value for value in values.tolist()]
+    return values.tolist()
+
+
+def write_chunks(destination, chunks, fmt="csv"):
+    # Write an iterable of column chunks; returns the number of rows written
+    with TableWriter(destination, fmt) as writer:
+        for columns in chunks:
+            writer.write(columns)
+    return writer.rows
+
+
+def to_bytes(chunks, fmt="csv"):
+    # Export into one in-memory buffer (for st.download_button); the buffer is returned without a further copy
+    buffer = io.BytesIO()
+    write_chunks(buffer, chunks, fmt)
+    buffer.seek(0)
+    return buffer
+
+
+def series_chunks(systems, annual_costs, annual_emissions=None, scenario_columns=None, layout="long", chunk_rows=200_000):
+    """Annual cost and emission series as row chunks.
+
+    annual_costs: (technologies, years) for one scenario or (technologies, scenarios..., years).
+    annual_emissions: broadcastable to annual_costs, with or without the years axis.
+    scenario_columns: {name: values per scenario} describing each scenario (flattened in C order).
+    Years at which a cost is NaN (e.g. beyond a shorter project lifetime) are still written, as null (empty) cells.
+    """
+    systems = list(systems)
+    costs = np.asarray(annual_costs, dtype=float)
+    n_tech, n_years = len(systems), costs.shape[-1]
+    costs = costs.reshape(n_tech, -1, n_years)
+    n_scenarios = costs.shape[1]
+    emissions = None
+    if annual_emissions is not None:
+        emissions = np.asarray(annual_emissions, dtype=float)
+        if emissions.ndim < costs.ndim or emissions.shape[-1] != n_years:
+            emissions = emissions[..., None]
+        emissions = emissions.reshape(n_tech, -1, emissions.shape[-1])
+    scenario_columns = {name: np.broadcast_to(np.asarray(values), (n_scenarios,)) for name, values in (scenario_columns or {}).items()}
+    years = np.arange(1, n_years + 1)
+    rows_per_scenario = n_tech * n_years if layout == "long" else n_years
+    step = max(1, chunk_rows // rows_per_scenario)
+
+    for start in range(0, n_scenarios, step):
+        block = slice(start, min(start + step, n_scenarios))
+        n = block.stop - block.start
+        chunk_costs = costs[:, block, :]
+        chunk_emissions = None
+        if emissions is not None:
+            chunk_emissions = np.broadcast_to(emissions[:, block if emissions.shape[1] > 1 else slice(None), :], chunk_costs.shape)
+        out = {}
+        if layout == "long":
+            for name, values in scenario_columns.items():
+                out[name] = np.repeat(values[block], n_tech * n_years)
+            out["System"] = np.tile(np.repeat(np.asarray(systems), n_years), n)
+            out["Year"] = np.tile(years, n * n_tech)
+            out["Cost"] = chunk_costs.transpose(1, 0, 2).ravel()
+            if chunk_emissions is not None:
+                out["CO2 Emission"] = chunk_emissions.transpose(1, 0, 2).ravel()
+        elif layout == "wide":
+            for name, values in scenario_columns.items():
+                out[name] = np.repeat(values[block], n_years)
+            out["Year"] = np.tile(years, n)
+            for i, system in enumerate(systems):
+                out[f"Cost [{system}]"] = chunk_costs[i].ravel()
+            if chunk_emissions is not None:
+                for i, system in enumerate(systems):
+                    out[f"CO2 Emission [{system}]"] = chunk_emissions[i].ravel()
+        else:
+            raise ValueError(f"Unknown layout {layout}; use 'long' or 'wide'")
+        yield out
+
+
+def cube_chunks(cube, systems, labels, layout="long", chunk_rows=200_000):
+    """Totals of a grid sweep (lc4hw.sweep.grid_sweep) as row chunks, one row per grid point (and technology if long).
+
+    labels gives the column name of each swept axis, in the order of cube['axes'].
+    """
+    axes = list(cube["axes"].values())
+    shape = tuple(len(values) for values in axes)
+    n_points = int(np.prod(shape))
+    n_tech = len(systems)
+    total_costs = np.broadcast_to(cube["total_costs"], (n_tech,) + shape).reshape(n_tech, -1)
+    emissions = np.broadcast_to(cube["emissions"], (n_tech,) + shape).reshape(n_tech, -1)
+    step = max(1, chunk_rows // (n_tech if layout == "long" else 1))
+
+    for start in range(0, n_points, step):
+        points = np.arange(start, min(start + step, n_points))
+        index = np.unravel_index(points, shape)
+        out = {}
+        repeat = n_tech if layout == "long" else 1
+        for label, values, i in zip(labels, axes, index):
+            out[label] = np.repeat(values[i], repeat)
+        if layout == "long":
+            out["System"] = np.tile(np.asarray(list(systems)), len(points))
+            out["Total Cost (£)"] = total_costs[:, points].T.ravel()
+            out["Annual Emission (CO2e)"] = emissions[:, points].T.ravel()
+        else:
+            for k, system in enumerate(systems):
+                out[f"Total Cost (£) [{system}]"] = total_costs[k, points]
+            for k, system in enumerate(systems):
+                out[f"Annual Emission (CO2e) [{system}]"] = emissions[k, points]
+        yield out
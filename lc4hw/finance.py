@@ -0,0 +1,166 @@
+#Loan financing, discounting and levelized cost of hot water.
+#A loan can be attached to any technology's installation cost: the deposit is paid up front and the rest is
+#repaid monthly. Interest and discount rates are fractions per year (0.05 for 5%, as in calculate_loan_payment);
+#price escalation stays in % per year as in the engine. Every function broadcasts, so grids of
+#rate x term x deposit for all technologies are single NumPy expressions with no months or years axis,
+#and only amortization_schedule materialises the monthly arrays.
+
+import numpy as np
+
+from lc4hw.engine import annual_energy_kwh, first_year_cost, geometric_sum
+
+
+def _months(term_years):
+    return np.rint(np.asarray(term_years, dtype=float) * 12)
+
+
+def annuity_factor(rate, periods):
+    # Present value of 1 paid at the end of each of `periods` periods: (1 - (1 + r)^-n) / r, equal to n at r = 0
+    r = np.asarray(rate, dtype=float)
+    n = np.asarray(periods, dtype=float)
+    safe_r = np.where(r == 0, 1.0, r)
+    return np.where(r == 0, n, -np.expm1(-n * np.log1p(safe_r)) / safe_r)
+
+
+def monthly_payment(principal, annual_rate, term_years):
+    # Level monthly repayment of a loan at a nominal annual rate compounded monthly; NaN for a term under a month,
+    # which has no repayment rather than a free loan
+    n = _months(term_years)
+    factor = annuity_factor(np.asarray(annual_rate, dtype=float) / 12, n)
+    return np.asarray(principal, dtype=float) / np.where(n > 0, factor, np.nan)
+
+
+def amortization_schedule(principal, annual_rate, term_years, n_months=None):
+    """Monthly amortization schedules for any broadcast shape of loans.
+
+    Returns a dict of arrays with the loans' broadcast shape plus a trailing months axis (n_months, by default
+    the longest term): payment, interest, principal (repaid) and the balance left after each month.
+    Months after a loan's term are zero.
+    """
+    principal = np.asarray(principal, dtype=float)
+    r = np.asarray(annual_rate, dtype=float) / 12
+    n = _months(term_years)
+    principal, r, n = np.broadcast_arrays(principal, r, n)
+    payment = monthly_payment(principal, r * 12, n / 12)
+    if n_months is None:
+        n_months = int(n.max(initial=0))
+    month = np.arange(1, n_months + 1)
+
+    # Closed form of the balance after k payments: P(1 + r)^k - A((1 + r)^k - 1) / r, or P - kA at r = 0
+    k = month.astype(float)
+    growth = np.exp(k * np.log1p(r)[..., None])
+    safe_r = np.where(r == 0, 1.0, r)[..., None]
+    balance = np.where(r[..., None] == 0, principal[..., None] - k * payment[..., None],
+                       principal[..., None] * growth - payment[..., None] * (growth - 1) / safe_r)
+    active = k <= n[..., None]
+    balance = np.where(active, np.maximum(balance, 0.0), 0.0)
+    opening = np.concatenate([principal[..., None], balance[..., :-1]], axis=-1)
+    interest = np.where(active, opening * r[..., None], 0.0)
+    payment = np.where(active, payment[..., None], 0.0)
+    return {"month": month, "payment": payment, "interest": interest, "principal": payment - interest, "balance": balance}
+
+
+def yearly_schedule(schedule):
+    # Monthly schedule -> totals per loan year (payment, interest, principal) and the balance at each year end
+    n_months = schedule["payment"].shape[-1]
+    n_years = -(-n_months // 12)
+    pad = n_years * 12 - n_months
+
+    def per_year(values, how):
+        values = np.pad(values, [(0, 0)] * (values.ndim - 1) + [(0, pad)])
+        values = values.reshape(values.shape[:-1] + (n_years, 12))
+        return values.sum(axis=-1) if how == "sum" else values[..., -1]
+
+    return {
+        "year": np.arange(1, n_years + 1),
+        "payment": per_year(schedule["payment"], "sum"),
+        "interest": per_year(schedule["interest"], "sum"),
+        "principal": per_year(schedule["principal"], "sum"),
+        "balance": per_year(schedule["balance"], "last"),
+    }
+
+
+def present_value_running_costs(first_year, escalation_rate, discount_rate, project_lifetime):
+    # sum of first_year (1 + g)^(y - 1) / (1 + d)^y over y = 1..n: a geometric series with ratio (1 + g) / (1 + d)
+    g = np.asarray(escalation_rate, dtype=float) / 100
+    d = np.asarray(discount_rate, dtype=float)
+    ratio_pct = ((1 + g) / (1 + d) - 1) * 100
+    return np.asarray(first_year, dtype=float) / (1 + d) * geometric_sum(ratio_pct, project_lifetime)
+
+
+def present_value_loan(principal, annual_rate, term_years, discount_rate):
+    # Monthly repayments discounted at the monthly rate equivalent to the annual discount rate
+    monthly_discount = np.expm1(np.log1p(np.asarray(discount_rate, dtype=float)) / 12)
+    n = _months(term_years)
+    return monthly_payment(principal, annual_rate, term_years) * annuity_factor(monthly_discount, n)
+
+
+def financed_costs(scenario, annual_rate, term_years, deposit_fraction, discount_rate=0.035):
+    """Lifecycle cost of every technology with its installation cost financed by a loan.
+
+    annual_rate, term_years and deposit_fraction (share of the installation cost paid up front, 1 for cash)
+    broadcast against each other; results have a leading technologies axis followed by their broadcast shape.
+    The scenario is a Main Calculator scenario dict (lc4hw.sweep.default_scenario).
+
+    Returns a dict with deposit, loan, monthly_payment, total_interest, total_cost (undiscounted, as in the
+    Main Calculator), npv (present value of all costs at discount_rate) and lcoh (levelized cost of hot water:
+    npv over the discounted heat delivered, £ per kWh).
+    """
+    systems = scenario["systems"]
+    annual_rate, term_years, deposit_fraction = (np.asarray(x, dtype=float) for x in (annual_rate, term_years, deposit_fraction))
+    ndim = max(annual_rate.ndim, term_years.ndim, deposit_fraction.ndim)
+
+    def per_tech(name):
+        return np.array([scenario[name][system] for system in systems], dtype=float).reshape((-1,) + (1,) * ndim)
+
+    lifetime = scenario["project_lifetime"]
+    energy = annual_energy_kwh(scenario["tank_size"], scenario["hot_temp"], scenario["cold_temp"],
+                               scenario["heating_days"], scenario["heating_days_topup"])
+    first_year = first_year_cost(energy, per_tech("efficiencies"), per_tech("fuel_costs"))
+    running = first_year * geometric_sum(per_tech("escalation_rates"), lifetime)
+    running_pv = present_value_running_costs(first_year, per_tech("escalation_rates"), discount_rate, lifetime)
+
+    install = per_tech("install_costs")
+    deposit = install * np.clip(deposit_fraction, 0.0, 1.0)
+    loan = install - deposit
+    payment = monthly_payment(loan, annual_rate, term_years)
+    repaid = payment * _months(term_years)
+    npv = deposit + present_value_loan(loan, annual_rate, term_years, discount_rate) + running_pv
+    heat_pv = energy * annuity_factor(discount_rate, lifetime)
+
+    deposit, loan, payment, repaid, running, npv = np.broadcast_arrays(deposit, loan, payment, repaid, running, npv)
+    return {
+        "deposit": deposit,
+        "loan": loan,
+        "monthly_payment": payment,
+        "total_interest": repaid - loan,
+        "total_cost": deposit + repaid + running,
+        "npv": npv,
+        "lcoh": npv / np.where(heat_pv > 0, heat_pv, np.nan),
+    }
+
+
+def financing_grid(scenario, rates, terms, deposits, discount_rate=0.035):
+    # Every combination of loan rate x term x deposit for all technologies: arrays of shape (technologies, R, T, D)
+    rates, terms, deposits = (np.atleast_1d(np.asarray(x, dtype=float)) for x in (rates, terms, deposits))
+    result = financed_costs(scenario, rates[:, None, None], terms[None, :, None], deposits[None, None, :], discount_rate)
+    result["axes"] = {"rate": rates, "term": terms, "deposit": deposits}
+    return result
+
+
+def grid_to_frame(grid, systems):
+    # Long-format comparison table of financing_grid: one row per technology and loan product
+    import pandas as pd
+
+    rate, term, deposit = np.meshgrid(*grid["axes"].values(), indexing="ij")
+    n_tech = len(systems)
+    frame = {
+        "System": np.repeat(systems, rate.size),
+        "Interest Rate (%)": np.tile(rate.ravel() * 100, n_tech),
+        "Term (years)": np.tile(term.ravel(), n_tech),
+        "Deposit (%)": np.tile(deposit.ravel() * 100, n_tech),
+    }
+    for key, label in [("monthly_payment", "Monthly Payment (£)"), ("total_interest", "Total Interest (£)"),
+                       ("total_cost", "Total Cost (£)"), ("npv", "NPV of Costs (£)"), ("lcoh", "LCOH (£/kWh)")]:
+        frame[label] = grid[key].reshape(n_tech, -1).ravel()
+    return pd.DataFrame(frame)
@@ -0,0 +1,188 @@
+#Dependency-tracked incremental evaluation of the Main Calculator.
+#The calculation is a graph of named nodes: inputs (set from the page widgets) and computed nodes, each a
+#function of other nodes. Every node keeps its last value and a version number; a computed node is only
+#recomputed when the version of one of its dependencies changed since it was last computed, and its own
+#version only moves when its new value differs from the old one. Changing one input therefore recomputes
+#only the nodes downstream of it, and stops early where a result does not change (e.g. the cost ranking
+#after an emission factor change).
+#
+#Main Calculator graph, per technology s:
+#    inputs -> energy -> input_energy[s] -> running_costs[s] -> total_cost[s] -> cost_table -> cheapest
+#                                                             -> results[s] (chart data) <- emissions[s]
+#    energy, emission_factors[s] -> emission[s] (first year) -> emissions[s] (per year) -> emission_table
+#    grid_pathway, on_grid[s] -> emissions[s] -> carbon_costs[s] -> total_cost[s], results[s]
+#The emission inputs (grid_pathway, on_grid[s], carbon_price, carbon_escalation) default to constant emission
+#factors and no carbon price; see emission_inputs and lc4hw.emissions.
+
+import numpy as np
+
+from lc4hw.cache import make_key, memoize
+from lc4hw.emissions import carbon_costs, emission_series
+from lc4hw.engine import annual_energy_kwh, running_costs
+from lc4hw.sweep import scalar_inputs, tech_inputs
+
+
+class Graph:
+
+    def __init__(self):
+        self.functions = {}  # computed node -> (function, dependencies)
+        self.values = {}
+        self.keys = {}  # make_key of each value, to tell whether a new value differs
+        self.versions = {}
+        self.seen = {}  # computed node -> dependency versions it was last computed from
+        self.verified = set()  # nodes brought up to date in the current pass
+        self.computed = 0
+        self.reused = 0
+
+    def add(self, name, function, dependencies):
+        self.functions[name] = (function, tuple(dependencies))
+
+    def _store(self, name, value):
+        key = make_key(value)
+        if name not in self.values or self.keys[name] != key:
+            self.values[name] = value
+            self.keys[name] = key
+            self.versions[name] = self.versions.get(name, 0) + 1
+
+    def set(self, name, value):
+        if name in self.functions:
+            raise KeyError(f"{name} is a computed node, not an input")
+        self._store(name, value)
+
+    def update(self, inputs):
+        # Set many inputs at once and start a new evaluation pass with fresh counters
+        for name, value in inputs.items():
+            self.set(name, value)
+        self.verified.clear()
+        self.computed = 0
+        self.reused = 0
+
+    def get(self, name):
+        if name not in self.functions:
+            if name not in self.values:
+                raise KeyError(f"Input {name} has not been set")
+            return self.values[name]
+        if name in self.verified:
+            return self.values[name]
+        function, dependencies = self.functions[name]
+        arguments = [self.get(dependency) for dependency in dependencies]
+        dependency_versions = tuple(self.versions[dependency] for dependency in dependencies)
+        if self.seen.get(name) == dependency_versions:
+            self.reused += 1
+        else:
+            self._store(name, function(*arguments))
+            self.seen[name] = dependency_versions
+            self.computed += 1
+        self.verified.add(name)
+        return self.values[name]
+
+    def __getitem__(self, name):
+        return self.get(name)
+
+    def downstream(self, name):
+        # Every computed node that depends on `name`, directly or indirectly
+        found = set()
+        frontier = [name]
+        while frontier:
+            current = frontier.pop()
+            for node, (_, dependencies) in self.functions.items():
+                if current in dependencies and node not in found:
+                    found.add(node)
+                    frontier.append(node)
+        return found
+
+    def counters(self):
+        return {"computed": self.computed, "reused": self.reused, "nodes": len(self.functions)}
+
+
+def scenario_inputs(scenario):
+    # Flat graph inputs of a Main Calculator scenario: shared inputs by name, the others as input[System]
+    inputs = {name: scenario[name] for name in scalar_inputs}
+    for name in tech_inputs:
+        for system in scenario["systems"]:
+            inputs[f"{name}[{system}]"] = scenario[name][system]
+    return inputs
+
+
+def emission_inputs(systems, multipliers=(), on_grid=(), carbon_price=0.0, carbon_escalation=0.0):
+    # multipliers: per-year factors of the chosen grid pathway (lc4hw.emissions.pathway_multipliers), () for none
+    inputs = {"grid_pathway": tuple(float(m) for m in multipliers), "carbon_price": carbon_price, "carbon_escalation": carbon_escalation}
+    for system in systems:
+        inputs[f"on_grid[{system}]"] = system in on_grid
+    return inputs
+
+
+def _emissions(emission, on_grid, pathway, project_lifetime):
+    multipliers = np.asarray(pathway[:project_lifetime]) if on_grid and pathway else np.ones(project_lifetime)
+    return emission_series(emission, multipliers)
+
+
+def _cost_table(systems, *totals):
+    import pandas as pd
+
+    return pd.DataFrame({"Total Cost (£)": totals}, index=systems).sort_values(by="Total Cost (£)")
+
+
+def _emission_table(systems, *emissions):
+    import pandas as pd
+
+    return pd.DataFrame({"Total Emission (CO2e)": emissions}, index=systems).sort_values(by="Total Emission (CO2e)")
+
+
+def _results(costs, carbon, emissions, project_lifetime):
+    # Annual cost including the carbon cost, which is also given on its own
+    import pandas as pd
+
+    return pd.DataFrame({"Year": np.arange(1, project_lifetime + 1), "Cost": costs[0] + carbon, "Carbon Cost": carbon, "CO2 Emission": emissions})
+
+
+def main_calculator_graph(systems):
+    graph = Graph()
+    systems = list(systems)
+    graph.add("energy", lambda *args: float(annual_energy_kwh(*args)),
+              ["tank_size", "hot_temp", "cold_temp", "heating_days", "heating_days_topup"])
+    for system in systems:
+        graph.add(f"input_energy[{system}]", lambda energy, efficiency: energy / efficiency, ["energy", f"efficiencies[{system}]"])
+        # (annual cost series, total running cost) over the project lifetime
+        graph.add(f"running_costs[{system}]",
+                  lambda energy, fuel_cost, escalation_rate, project_lifetime:
+                      tuple(running_costs(energy, 1.0, fuel_cost, escalation_rate, project_lifetime)[0::2]),
+                  [f"input_energy[{system}]", f"fuel_costs[{system}]", f"escalation_rates[{system}]", "project_lifetime"])
+        graph.add(f"emission[{system}]", lambda energy, factor: energy * factor, ["energy", f"emission_factors[{system}]"])
+        graph.add(f"emissions[{system}]", _emissions, [f"emission[{system}]", f"on_grid[{system}]", "grid_pathway", "project_lifetime"])
+        graph.add(f"carbon_costs[{system}]", carbon_costs, [f"emissions[{system}]", "carbon_price", "carbon_escalation"])
+        graph.add(f"total_cost[{system}]", lambda costs, carbon, install_cost: float(costs[1]) + float(carbon.sum()) + install_cost,
+                  [f"running_costs[{system}]", f"carbon_costs[{system}]", f"install_costs[{system}]"])
+        graph.add(f"results[{system}]", _results, [f"running_costs[{system}]", f"carbon_costs[{system}]", f"emissions[{system}]", "project_lifetime"])
+    graph.set("systems", tuple(systems))
+    for name, value in emission_inputs(systems).items():
+        graph.set(name, value)
+    graph.add("cost_table", _cost_table, ["systems"] + [f"total_cost[{system}]" for system in systems])
+    # Lifecycle emissions: the sum of the annual series
+    graph.add("emission_table", lambda systems, *emissions: _emission_table(systems, *(float(e.sum()) for e in emissions)),
+              ["systems"] + [f"emissions[{system}]" for system in systems])
+    graph.add("cheapest", lambda table: table.index[0], ["cost_table"])
+    return graph
+
+
+def main_calculator_record(graph):
+    # The results as arrays (technologies on axis 0, years last), as kept in the scenario store (lc4hw.store)
+    systems = list(graph["systems"])
+    return {
+        "annual_energy_kwh": np.array(graph["energy"]),
+        "running_costs": np.array([graph[f"running_costs[{system}]"][0] for system in systems]),
+        "carbon_costs": np.array([graph[f"carbon_costs[{system}]"] for system in systems]),
+        "annual_emissions": np.array([graph[f"emissions[{system}]"] for system in systems]),
+        "total_costs": np.array([graph[f"total_cost[{system}]"] for system in systems]),
+    }
+
+
+@memoize(maxsize=32)
+def record_frames(systems, record):
+    # Chart data per technology, cost table and emission table of a record, as the results[s], cost_table and emission_table nodes
+    lifetime = record["running_costs"].shape[-1]
+    results = {system: _results((record["running_costs"][i],), record["carbon_costs"][i], record["annual_emissions"][i], lifetime)
+               for i, system in enumerate(systems)}
+    cost_table = _cost_table(systems, *record["total_costs"].tolist())
+    emission_table = _emission_table(systems, *record["annual_emissions"].sum(axis=-1).tolist())
+    return results, cost_table, emission_table
@@ -0,0 +1,154 @@
+#Weather-driven heat pump performance: hourly CoP from the outdoor temperature and a manufacturer curve.
+#A heat pump's CoP falls as the outdoor air gets colder and as the flow temperature it has to reach rises; for
+#hot water the flow has to be a few degrees above the tank temperature. The hourly CoP over a year of weather
+#is weighted by the hot water heat drawn in each hour (time of day from the demand profile, more heat in winter
+#when the mains water is colder) into one seasonal CoP, which the cost and emission calculations then use as the
+#Heat Pump efficiency.
+#
+#Weather files are EPW (dry-bulb temperature, field 7 of each data row) or CSV with a `temperature` column, one
+#row per hour of a year; leap years lose 29 February. Parsed years are kept as float32 .npy files in
+#cache/weather (or LC4HW_WEATHER_CACHE), keyed on the file's path, size and modification time, so many
+#locations are loaded without re-parsing text. data/weather_sample.csv is an illustrative UK-like year.
+#
+#Manufacturer curves are CSV with an `outdoor_temp` column and one column per flow temperature named
+#flow_<°C> giving the CoP; the curve is interpolated linearly in both and held flat beyond its edges.
+#
+#Usage: python -m lc4hw.heatpump weather1.epw weather2.csv ... [--curve CURVE] [--hot-temp 65]
+
+import argparse
+import hashlib
+import io
+import os
+
+import numpy as np
+
+from lc4hw.demand import cold_water_temperature, seasonal_factor
+
+hours_per_year = 8760
+default_weather_path = "data/weather_sample.csv"
+default_curve_path = "data/heat_pump_curve.csv"
+default_weather_cache = os.environ.get("LC4HW_WEATHER_CACHE", os.path.join("cache", "weather"))
+flow_approach = 5.0  # K between the tank's hot water temperature and the heat pump flow temperature
+temperature_columns = ("temperature", "dry_bulb", "temp_air", "t2m")
+
+
+def parse_weather(source):
+    """Hourly outdoor temperatures (°C, float32, shape (8760,)) from an EPW or CSV path, text or binary file object."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            data = f.read()
+    else:
+        data = source.read()
+    text = data.decode("utf-8-sig") if isinstance(data, bytes) else data
+    if text.startswith("LOCATION"):
+        # 8 header records, then comma-separated hourly data with the dry-bulb temperature in field 7
+        temperature = np.loadtxt(io.StringIO(text), delimiter=",", skiprows=8, usecols=6, dtype=np.float32, ndmin=1)
+    else:
+        table = np.atleast_1d(np.genfromtxt(io.StringIO(text), delimiter=",", names=True, dtype=float, encoding="utf-8"))
+        names = [name for name in table.dtype.names if name.lower() in temperature_columns]
+        if not names:
+            raise ValueError(f"A weather CSV needs one of the columns {', '.join(temperature_columns)}")
+        temperature = table[names[0]].astype(np.float32)
+    if len(temperature) == hours_per_year + 24:
+        temperature = np.delete(temperature, np.s_[59 * 24:60 * 24])  # 29 February
+    if len(temperature) != hours_per_year:
+        raise ValueError(f"A weather file must have {hours_per_year} hourly rows, not {len(temperature)}")
+    return temperature
+
+
+def load_weather(path, cache_dir=default_weather_cache):
+    # Parsed once per file version; afterwards a ~35 kB binary read
+    stat = os.stat(path)
+    key = hashlib.blake2b(f"{os.path.abspath(path)}\n{stat.st_size}\n{stat.st_mtime_ns}".encode(), digest_size=16).hexdigest()
+    cached = os.path.join(cache_dir, f"{key}.npy")
+    try:
+        return np.load(cached)
+    except (OSError, ValueError):
+        pass
+    temperature = parse_weather(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    partial = f"{cached}.{os.getpid()}.tmp"
+    with open(partial, "wb") as f:
+        np.save(f, temperature)
+    os.replace(partial, cached)  # other processes see the whole file or none of it
+    return temperature
+
+
+def load_locations(paths, cache_dir=default_weather_cache):
+    # Hourly temperatures of several locations, shape (locations, 8760)
+    return np.stack([load_weather(path, cache_dir) for path in paths])
+
+
+def load_curve(source=default_curve_path):
+    """Manufacturer curve from a CSV path or file object as (outdoor temperatures, flow temperatures, CoP table)."""
+    table = np.atleast_1d(np.genfromtxt(source, delimiter=",", names=True, dtype=float, encoding="utf-8"))
+    flows = sorted((float(name[5:]), name) for name in table.dtype.names if name.startswith("flow_"))
+    if "outdoor_temp" not in table.dtype.names or not flows:
+        raise ValueError("A heat pump curve needs an 'outdoor_temp' column and flow_<°C> CoP columns")
+    order = np.argsort(table["outdoor_temp"])
+    cop = np.stack([table[name][order] for _, name in flows], axis=1)
+    return table["outdoor_temp"][order], np.array([flow for flow, _ in flows]), cop
+
+
+def hourly_cop(temperature, flow_temp, curve):
+    # CoP at each outdoor temperature (any shape) for one flow temperature
+    outdoor, flows, cop = curve
+    temperature = np.asarray(temperature, dtype=float)
+    if len(flows) == 1:
+        return np.interp(temperature, outdoor, cop[:, 0])
+    i = int(np.clip(np.searchsorted(flows, flow_temp) - 1, 0, len(flows) - 2))
+    w = float(np.clip((flow_temp - flows[i]) / (flows[i + 1] - flows[i]), 0.0, 1.0))
+    column = cop[:, i] * (1 - w) + cop[:, i + 1] * w
+    return np.interp(temperature, outdoor, column)
+
+
+def demand_weights(hot_temp, cold_temp, cold_amplitude=5.0, demand_profile=None):
+    """Share of the year's hot water heat drawn in each hour, shape (8760,).
+
+    Time of day from a half-hourly demand profile (lc4hw.tou.load_demand_profile; flat when None), and per day
+    the seasonal draw-off rate times the temperature rise from that day's mains water (lc4hw.demand).
+    """
+    day = np.arange(hours_per_year // 24)
+    daily = seasonal_factor(day) * np.maximum(hot_temp - cold_water_temperature(day, cold_temp, cold_amplitude), 0.0)
+    if demand_profile is None:
+        hourly = np.full((len(day), 24), 1 / 24)
+    else:
+        hourly = np.asarray(demand_profile, dtype=float).reshape(len(day), 24, -1).sum(axis=-1)
+    weights = (daily[:, None] * hourly).ravel()
+    return weights / weights.sum()
+
+
+def seasonal_cop(temperature, hot_temp, curve, weights=None):
+    """Seasonal CoP: heat delivered over electricity used, for hourly temperatures (..., 8760) of one or more locations.
+
+    weights: heat drawn in each hour (demand_weights(); every hour alike when None).
+    """
+    cop = hourly_cop(temperature, hot_temp + flow_approach, curve)
+    weights = np.full(hours_per_year, 1 / hours_per_year) if weights is None else np.asarray(weights, dtype=float)
+    return weights.sum() / (weights / cop).sum(axis=-1)
+
+
+def main(argv=None):
+    from lc4hw.defaults import main_calculator_defaults
+    from lc4hw.sweep import evaluate
+    from lc4hw.tou import load_demand_profile
+
+    parser = argparse.ArgumentParser(description="Seasonal heat pump CoP and lifecycle cost for each weather file.")
+    parser.add_argument("weather", nargs="+", help="Weather files (.epw or .csv with an hourly temperature column)")
+    parser.add_argument("--curve", default=default_curve_path, help=f"Manufacturer curve (default {default_curve_path})")
+    parser.add_argument("--hot-temp", type=float, default=main_calculator_defaults["hot_temp"], help="Hot water temperature (°C)")
+    parser.add_argument("--cold-temp", type=float, default=main_calculator_defaults["cold_temp"], help="Mean mains water temperature (°C)")
+    args = parser.parse_args(argv)
+
+    scenario = dict(main_calculator_defaults, hot_temp=args.hot_temp, cold_temp=args.cold_temp)
+    weights = demand_weights(args.hot_temp, args.cold_temp, demand_profile=load_demand_profile("data/demand_profile.csv"))
+    scop = seasonal_cop(load_locations(args.weather), args.hot_temp, load_curve(args.curve), weights)
+    i = scenario["systems"].index("Heat Pump")
+    totals = evaluate(scenario, {("efficiencies", "Heat Pump"): scop})["total_costs"][i]
+    print(f"{'weather file':40s} {'seasonal CoP':>12s} {'Heat Pump total cost (£)':>25s}")
+    for path, value, total in zip(args.weather, scop, totals):
+        print(f"{os.path.basename(path):40s} {value:12.2f} {total:25,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+#Monte Carlo uncertainty analysis for the Main Calculator.
+#Fuel prices, escalation rates, efficiencies (CoP) and emission factors are sampled from user-specified
+#distributions and every technology is evaluated for a whole chunk of draws in one vectorized step.
+#Each chunk is reduced to running sums, counts and fixed-bin histograms of the total costs and emissions, so
+#memory stays bounded by the chunk size however many draws are made; percentiles are read off the histograms.
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from lc4hw.engine import total_running_cost
+
+# Uncertain inputs of the Main Calculator and the lowest value each one may take after sampling
+uncertain_inputs = {
+    "fuel_costs": 0.0,
+    "escalation_rates": -100.0,
+    "efficiencies": 1e-3,
+    "emission_factors": 0.0,
+}
+default_percentiles = (5, 25, 50, 75, 95)
+parallel_threshold = 400_000  # Draws per technology above which a process pool pays for its start-up
+histogram_bins = 4096  # Per technology and output; percentiles are accurate to about one bin
+pilot_draws = 10_000  # Draws used to place the histogram bins
+
+
+def sample(spec, size, rng):
+    """Draw `size` values from a distribution spec.
+
+    A spec is either a plain number (no uncertainty) or a tuple:
+    ("normal", mean, sd), ("uniform", low, high), ("triangular", low, mode, high) or ("lognormal", mean, sigma)
+    where the lognormal mean is the mean of the distribution itself, not of the underlying normal.
+    """
+    if not isinstance(spec, (tuple, list)):
+        return np.full(size, float(spec))
+    kind, *params = spec
+    if kind == "fixed":
+        return np.full(size, float(params[0]))
+    if kind == "normal":
+        return rng.normal(params[0], params[1], size)
+    if kind == "uniform":
+        return rng.uniform(params[0], params[1], size)
+    if kind == "triangular":
+        low, mode, high = params
+        if low == high:
+            return np.full(size, float(mode))
+        return rng.triangular(low, mode, high, size)
+    if kind == "lognormal":
+        mean, sigma = params
+        return rng.lognormal(np.log(mean) - sigma ** 2 / 2, sigma, size)
+    raise ValueError(f"Unknown distribution '{kind}'")
+
+
+def spread_spec(value, kind, spread_pct):
+    # Distribution centred on a point value with a relative spread, as offered by the UI
+    spread = abs(value) * spread_pct / 100
+    if spread == 0 or kind == "fixed":
+        return value
+    if kind == "normal":
+        return ("normal", value, spread)
+    if kind == "uniform":
+        return ("uniform", value - spread, value + spread)
+    if kind == "triangular":
+        return ("triangular", value - spread, value, value + spread)
+    if kind == "lognormal":
+        return ("lognormal", value, spread_pct / 100)
+    raise ValueError(f"Unknown distribution '{kind}'")
+
+
+def build_model(systems, install_costs, annual_energy_kwh, project_lifetime, fuel_costs, escalation_rates, efficiencies, emission_factors):
+    # Plain dict so it can be sent to worker processes
+    return {
+        "systems": list(systems),
+        "install_costs": np.array([install_costs[system] for system in systems], dtype=float),
+        "annual_energy_kwh": float(annual_energy_kwh),
+        "project_lifetime": int(project_lifetime),
+        "specs": {
+            "fuel_costs": [fuel_costs[system] for system in systems],
+            "escalation_rates": [escalation_rates[system] for system in systems],
+            "efficiencies": [efficiencies[system] for system in systems],
+            "emission_factors": [emission_factors[system] for system in systems],
+        },
+    }
+
+
+def evaluate_chunk(model, seed, size):
+    # Returns (total costs, annual emissions), each of shape (technologies, size)
+    rng = np.random.default_rng(seed)
+    draws = {}
+    for name, lower in uncertain_inputs.items():
+        draws[name] = np.maximum(np.stack([sample(spec, size, rng) for spec in model["specs"][name]]), lower)
+
+    totals = total_running_cost(model["annual_energy_kwh"], draws["efficiencies"], draws["fuel_costs"],
+                                draws["escalation_rates"], model["project_lifetime"])
+    totals += model["install_costs"][:, None]
+    emissions = model["annual_energy_kwh"] * draws["emission_factors"]
+    return totals, emissions
+
+
+def _edges(model, seed):
+    # Bin edges (technologies, bins + 1) for costs and emissions from a pilot sample, widened by half its range on
+    # each side; later draws outside them are still counted in the end bins, and the exact extremes are kept
+    def edges(values):
+        low, high = values.min(axis=1), values.max(axis=1)
+        pad = np.maximum(high - low, np.abs(high) * 1e-6 + 1e-9) / 2
+        return np.linspace(low - pad, high + pad, histogram_bins + 1, axis=1)
+
+    totals, emissions = evaluate_chunk(model, seed, pilot_draws)
+    return edges(totals), edges(emissions)
+
+
+def _histogram(values, edges):
+    width = (edges[:, -1] - edges[:, 0]) / histogram_bins
+    index = np.clip(((values - edges[:, :1]) / width[:, None]).astype(np.intp), 0, histogram_bins - 1)
+    return np.stack([np.bincount(row, minlength=histogram_bins) for row in index])
+
+
+def reduce_chunk(model, seed, size, cost_edges, emission_edges):
+    # Evaluate one chunk and keep only what the summary needs: sums, extremes, histograms and cheapest counts
+    totals, emissions = evaluate_chunk(model, seed, size)
+    return {
+        "draws": size,
+        "cost_sum": totals.sum(axis=1),
+        "cost_min": totals.min(axis=1),
+        "cost_max": totals.max(axis=1),
+        "cost_histogram": _histogram(totals, cost_edges),
+        "emission_min": emissions.min(axis=1),
+        "emission_max": emissions.max(axis=1),
+        "emission_histogram": _histogram(emissions, emission_edges),
+        "cheapest": np.bincount(np.argmin(totals, axis=0), minlength=len(model["systems"])),
+    }
+
+
+def _percentiles(histogram, edges, low, high, percentiles):
+    # Percentiles (len(percentiles), technologies) interpolated linearly within the histogram bins
+    out = np.empty((len(percentiles), len(histogram)))
+    for i, counts in enumerate(histogram):
+        bounds = edges[i].copy()
+        bounds[0], bounds[-1] = min(bounds[0], low[i]), max(bounds[-1], high[i])
+        cumulative = np.cumsum(counts)
+        for j, q in enumerate(percentiles):
+            rank = q / 100 * cumulative[-1]
+            b = min(int(np.searchsorted(cumulative, rank)), len(counts) - 1)
+            before = cumulative[b] - counts[b]
+            fraction = (rank - before) / counts[b] if counts[b] else 0.0
+            out[j, i] = bounds[b] + fraction * (bounds[b + 1] - bounds[b])
+    return np.clip(out, low, high)
+
+
+def _summary(model, state, cost_edges, emission_edges, percentiles):
+    systems = model["systems"]
+    done = state["draws"]
+    cost_pct = _percentiles(state["cost_histogram"], cost_edges, state["cost_min"], state["cost_max"], percentiles)
+    emission_pct = _percentiles(state["emission_histogram"], emission_edges, state["emission_min"], state["emission_max"], percentiles)
+    return {
+        "draws": done,
+        "percentiles": list(percentiles),
+        "cost_percentiles": {system: cost_pct[:, i] for i, system in enumerate(systems)},
+        "emission_percentiles": {system: emission_pct[:, i] for i, system in enumerate(systems)},
+        "mean_cost": dict(zip(systems, (state["cost_sum"] / done).tolist())),
+        "p_cheapest": dict(zip(systems, (state["cheapest"] / done).tolist())),
+    }
+
+
+def run_monte_carlo(model, n_draws, seed=None, chunk_size=100_000, processes=None, percentiles=default_percentiles):
+    """Generator yielding a summary after every completed chunk of draws.
+
+    Each chunk gets its own child of SeedSequence(seed), so a seeded run gives identical results whether it
+    runs serially or on a process pool. Runs of at least `parallel_threshold` draws use a pool of
+    `processes` workers (all cores when None); pass processes=1 to stay in-process. Only per-chunk reductions
+    are kept, so memory does not grow with n_draws; percentiles come from histograms whose bins are placed
+    by a pilot sample.
+    """
+    sizes = [min(chunk_size, n_draws - start) for start in range(0, n_draws, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes) + 1)  # the last child seeds the pilot sample
+    cost_edges, emission_edges = _edges(model, seeds[-1])
+    state = None
+
+    def collect(chunk):
+        nonlocal state
+        if state is None:
+            state = chunk
+        else:
+            for name in ("draws", "cost_sum", "cost_histogram", "emission_histogram", "cheapest"):
+                state[name] = state[name] + chunk[name]
+            for name in ("cost_min", "emission_min"):
+                state[name] = np.minimum(state[name], chunk[name])
+            for name in ("cost_max", "emission_max"):
+                state[name] = np.maximum(state[name], chunk[name])
+        return _summary(model, state, cost_edges, emission_edges, percentiles)
+
+    processes = processes or os.cpu_count() or 1
+    if processes > 1 and n_draws >= parallel_threshold and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=min(processes, len(sizes))) as pool:
+            futures = [pool.submit(reduce_chunk, model, seeds[i], size, cost_edges, emission_edges) for i, size in enumerate(sizes)]
+            for future in as_completed(futures):
+                yield collect(future.result())
+    else:
+        for i, size in enumerate(sizes):
+            yield collect(reduce_chunk(model, seeds[i], size, cost_edges, emission_edges))
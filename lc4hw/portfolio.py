@@ -0,0 +1,143 @@
+#Batch portfolio assessment: stream a file of sites through the Main Calculator logic.
+#Each row is one site; columns override the Main Calculator inputs for that site and anything missing,
+#whether a column or a blank cell, falls back to the scenario defaults. Shared inputs use their plain name (tank_size, hot_temp, cold_temp,
+#heating_days, heating_days_topup, project_lifetime) and per-technology inputs are written as
+#input[System], e.g. fuel_costs[Electric Boiler] or efficiencies[Heat Pump].
+#
+#Usage: python -m lc4hw.portfolio sites.csv results.parquet --chunk-size 50000 --processes 4
+
+import argparse
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from lc4hw.defaults import main_calculator_defaults
+from lc4hw.export import TableWriter
+from lc4hw.sweep import evaluate, scalar_inputs, tech_inputs
+
+id_columns = ("site_id", "site", "building", "name")
+
+
+def _format(path, fmt):
+    if fmt:
+        return fmt
+    name = str(getattr(path, "name", path)).lower()
+    if name.endswith(".xlsx"):
+        return "xlsx"
+    return "parquet" if name.endswith((".parquet", ".pq")) else "csv"
+
+
+def read_sites(source, chunk_size=50_000, fmt=None, scenario=None):
+    # Yields DataFrames of at most chunk_size sites; source may be a path or a file-like object (e.g. an upload).
+    # CSV input columns are read as numbers and every other column (site ids, names) as text, so that all
+    # chunks have the same column types whatever values each chunk happens to hold
+    import pandas as pd
+
+    if _format(source, fmt) == "parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        systems = (scenario or main_calculator_defaults)["systems"]
+        numeric = list(scalar_inputs) + [f"{name}[{system}]" for name in tech_inputs for system in systems]
+        yield from pd.read_csv(source, chunksize=chunk_size, dtype=defaultdict(lambda: str, dict.fromkeys(numeric, float)))
+
+
+def evaluate_sites(sites, scenario=None):
+    # Per-site lifecycle cost, annual emission and cheapest technology for one chunk of sites
+    import pandas as pd
+
+    scenario = scenario or main_calculator_defaults
+    systems = scenario["systems"]
+    overrides = {}
+    for name in scalar_inputs:
+        if name in sites:
+            overrides[name] = sites[name].fillna(scenario[name]).to_numpy(dtype=float)
+    for name in tech_inputs:
+        for system in systems:
+            column = f"{name}[{system}]"
+            if column in sites:
+                overrides[(name, system)] = sites[column].fillna(scenario[name][system]).to_numpy(dtype=float)
+
+    result = evaluate(scenario, overrides)
+    shape = (len(systems), len(sites))
+    total_costs = np.broadcast_to(result["total_costs"].reshape(len(systems), -1), shape)
+    emissions = np.broadcast_to(result["emissions"].reshape(len(systems), -1), shape)
+    cheapest = np.broadcast_to(result["cheapest"].reshape(-1), (len(sites),))
+
+    out = {}
+    for column in id_columns:
+        if column in sites:
+            out[column] = sites[column].to_numpy()
+            break
+    for i, system in enumerate(systems):
+        out[f"Total Cost (£) [{system}]"] = total_costs[i]
+    for i, system in enumerate(systems):
+        out[f"Annual Emission (CO2e) [{system}]"] = emissions[i]
+    # A site whose inputs still give no cost for some technology (e.g. a zero efficiency) has no cheapest one
+    invalid = ~np.isfinite(total_costs).all(axis=0)
+    out["Cheapest Technology"] = np.where(invalid, "", np.asarray(systems)[cheapest])
+    out["Cheapest Total Cost (£)"] = np.where(invalid, np.nan, total_costs[cheapest, np.arange(len(sites))])
+    return pd.DataFrame(out, index=sites.index)
+
+
+def process_portfolio(source, destination, scenario=None, chunk_size=50_000, processes=1, input_format=None,
+                      output_format=None, progress=None):
+    """Stream sites from `source` to per-site results in `destination`.
+
+    Only a bounded number of chunks (two per worker) is in memory at once; results are written in input
+    order. progress(rows, seconds) is called after every chunk. Returns rows, seconds and rows_per_second.
+    """
+    writer = TableWriter(destination, _format(destination, output_format))
+    chunks = read_sites(source, chunk_size, input_format, scenario)
+    rows = 0
+    start = time.perf_counter()
+
+    def done(frame):
+        nonlocal rows
+        writer.write(frame)
+        rows += len(frame)
+        if progress:
+            progress(rows, time.perf_counter() - start)
+
+    try:
+        if processes > 1:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                pending = []
+                for sites in chunks:
+                    pending.append(pool.submit(evaluate_sites, sites, scenario))
+                    if len(pending) >= 2 * processes:
+                        done(pending.pop(0).result())
+                for future in pending:
+                    done(future.result())
+        else:
+            for sites in chunks:
+                done(evaluate_sites(sites, scenario))
+    finally:
+        writer.close()
+
+    seconds = time.perf_counter() - start
+    return {"rows": rows, "seconds": seconds, "rows_per_second": rows / seconds if seconds else float("inf")}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lifecycle cost, emissions and cheapest technology for every site in a CSV/Parquet file.")
+    parser.add_argument("sites", help="Input site file (.csv or .parquet)")
+    parser.add_argument("output", help="Output results file (.csv, .parquet or .xlsx)")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Sites per chunk (default 50000)")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes (default 1)")
+    args = parser.parse_args(argv)
+
+    def report(rows, seconds):
+        print(f"\r{rows:,} sites, {rows / max(seconds, 1e-9):,.0f} rows/s", end="", file=sys.stderr)
+
+    stats = process_portfolio(args.sites, args.output, chunk_size=args.chunk_size, processes=args.processes, progress=report)
+    print(f"\nProcessed {stats['rows']:,} sites in {stats['seconds']:.2f} s ({stats['rows_per_second']:,.0f} rows/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
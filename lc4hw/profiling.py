@@ -0,0 +1,128 @@
+#Per-rerun profiling of the Streamlit pages.
+#A Profiler records wall time and memory for named stages of one script run, either as `with
+#profiler.stage(name):` blocks or as laps (`profiler.lap(name)` closes the stage that started at the previous
+#lap), which suits the flat page scripts. When disabled every call returns immediately, and memory is only
+#traced (tracemalloc) while a profiler is enabled.
+#
+#Finished runs are appended to a JSONL log, one object per rerun:
+#{"time", "session", "page", "changed", "total_s", "stages": [{"stage", "seconds", "memory_kb", "peak_kb"}]}
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+default_log_path = os.path.join("logs", "profile.jsonl")
+_disabled_stage = nullcontext()
+_tracing = 0  # enabled profilers that are tracing memory; tracemalloc is stopped when the last one finishes
+_tracing_lock = threading.Lock()
+
+
+class Profiler:
+
+    def __init__(self, enabled=False, trace_memory=True):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.stages = []
+        if not enabled:
+            return
+        if self.trace_memory:
+            global _tracing
+            with _tracing_lock:
+                _tracing += 1
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+        self.start = self.last = time.perf_counter()
+        self.last_memory = self._memory()
+
+    def _memory(self):
+        if not self.trace_memory:
+            return 0
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        return current
+
+    def _record(self, name, started, memory_before):
+        now = time.perf_counter()
+        entry = {"stage": name, "seconds": now - started}
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            entry["memory_kb"] = (current - memory_before) / 1024
+            entry["peak_kb"] = (peak - memory_before) / 1024
+            tracemalloc.reset_peak()
+            self.last_memory = current
+        self.stages.append(entry)
+        self.last = time.perf_counter()
+
+    def lap(self, name):
+        # Close the stage that started at the previous lap (or at creation) under `name`
+        if self.enabled:
+            self._record(name, self.last, self.last_memory)
+
+    def stage(self, name):
+        if not self.enabled:
+            return _disabled_stage
+        return self._stage(name)
+
+    @contextmanager
+    def _stage(self, name):
+        # Time spent before the block since the last lap is kept as its own "(other)" stage
+        if time.perf_counter() - self.last > 1e-4:
+            self.lap("(other)")
+        started, memory_before = time.perf_counter(), self._memory()
+        try:
+            yield
+        finally:
+            self._record(name, started, memory_before)
+
+    def total(self):
+        return time.perf_counter() - self.start if self.enabled else 0.0
+
+    def finish(self, session=None, page=None, changed=None, log_path=default_log_path):
+        """Append this run to the JSONL log and return the record (None when disabled)."""
+        if not self.enabled:
+            return None
+        if self.trace_memory:
+            global _tracing
+            with _tracing_lock:
+                _tracing -= 1
+                if _tracing <= 0 and tracemalloc.is_tracing():
+                    tracemalloc.stop()
+            self.trace_memory = False
+        record = {
+            "time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "session": session,
+            "page": page,
+            "changed": list(changed or []),
+            "total_s": self.total(),
+            "stages": self.stages,
+        }
+        if log_path:
+            os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        return record
+
+
+def changed_inputs(previous, current):
+    # Names of the inputs whose value differs from the previous run (every input on the first run)
+    if previous is None:
+        return list(current)
+    return [name for name, value in current.items() if name not in previous or previous[name] != value]
+
+
+def read_log(log_path=default_log_path):
+    # Stage rows of a profile log as a DataFrame, one row per rerun and stage
+    import pandas as pd
+
+    rows = []
+    with open(log_path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            for stage in record["stages"]:
+                rows.append({"time": record["time"], "session": record["session"], "page": record["page"],
+                             "changed": ", ".join(record["changed"]), "total_s": record["total_s"], **stage})
+    return pd.DataFrame(rows)
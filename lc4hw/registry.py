@@ -0,0 +1,120 @@
+#Technology registry: any number of technologies or product variants stored as one NumPy column per attribute.
+#The Main Calculator compares four technologies held in parallel dicts; the registry holds the same
+#attributes for hundreds of models (e.g. several heat pumps with different CoP) and evaluates all of them in
+#one broadcast call through the engine, with the shared inputs (tank, temperatures, days, lifetime) allowed
+#to be arrays as well.
+#
+#Catalog files are CSV with the columns name, category and the attributes below; data/technologies.csv
+#lists the four Main Calculator defaults and a set of example variants.
+
+import csv
+
+import numpy as np
+
+from lc4hw.engine import annual_energy_kwh, first_year_cost, geometric_sum
+
+default_catalog_path = "data/technologies.csv"
+
+# Catalog column -> Main Calculator scenario key (lc4hw.sweep.tech_inputs)
+attributes = {
+    "install_cost": "install_costs",
+    "efficiency": "efficiencies",
+    "fuel_cost": "fuel_costs",
+    "escalation_rate": "escalation_rates",
+    "emission_factor": "emission_factors",
+}
+
+
+class TechnologyRegistry:
+
+    def __init__(self, names, categories, **columns):
+        self.names = np.asarray(names, dtype=str)
+        self.categories = np.asarray(categories, dtype=str)
+        missing = set(attributes) - set(columns)
+        if missing:
+            raise ValueError(f"Missing technology attributes: {', '.join(sorted(missing))}")
+        self.columns = {name: np.asarray(columns[name], dtype=float) for name in attributes}
+        for name, values in self.columns.items():
+            if values.shape != self.names.shape:
+                raise ValueError(f"Column {name} has {values.size} entries for {self.names.size} technologies")
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, attribute):
+        return self.columns[attribute]
+
+    @classmethod
+    def from_csv(cls, source=default_catalog_path):
+        # source is a path or a text file object (e.g. a decoded upload)
+        if isinstance(source, str):
+            with open(source, newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+        else:
+            rows = list(csv.DictReader(source))
+        return cls.from_records(rows)
+
+    @classmethod
+    def from_records(cls, records):
+        # List of dicts (CSV rows, DataFrame.to_dict("records")); a missing category defaults to the name
+        records = list(records)
+        return cls([r["name"] for r in records], [r.get("category") or r["name"] for r in records],
+                   **{name: [float(r[name]) for r in records] for name in attributes})
+
+    @classmethod
+    def from_scenario(cls, scenario):
+        # The technologies of a Main Calculator scenario (lc4hw.sweep.default_scenario)
+        systems = scenario["systems"]
+        return cls(systems, systems, **{name: [scenario[key][system] for system in systems] for name, key in attributes.items()})
+
+    def select(self, which):
+        # Subset by boolean mask, index array or list of names
+        which = np.asarray(which)
+        if which.dtype.kind in "US":
+            which = np.flatnonzero(np.isin(self.names, which))
+        return TechnologyRegistry(self.names[which], self.categories[which], **{name: values[which] for name, values in self.columns.items()})
+
+    def to_scenario(self, tank_size, hot_temp, cold_temp, heating_days, heating_days_topup, project_lifetime):
+        # Main Calculator scenario of these technologies, for sweeps, Monte Carlo and the service (names must be unique)
+        from lc4hw.sweep import default_scenario
+
+        names = self.names.tolist()
+        per_tech = {key: dict(zip(names, self.columns[name].tolist())) for name, key in attributes.items()}
+        return default_scenario(names, tank_size=tank_size, hot_temp=hot_temp, cold_temp=cold_temp, heating_days=heating_days,
+                                heating_days_topup=heating_days_topup, project_lifetime=project_lifetime, **per_tech)
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame({"name": self.names, "category": self.categories, **self.columns})
+
+    def evaluate(self, tank_size, hot_temp, cold_temp, heating_days, heating_days_topup, project_lifetime):
+        """Lifecycle cost and emissions of every technology in one broadcast call.
+
+        Shared inputs may be arrays; results have a leading technologies axis followed by their broadcast
+        shape. Returns a dict with annual_energy_kwh, first_year_cost, running_cost, total_cost (including
+        installation), annual_emission and lifecycle_emission, plus cheapest (index per shared-input point).
+        """
+        energy = annual_energy_kwh(tank_size, hot_temp, cold_temp, heating_days, heating_days_topup)
+        ndim = np.ndim(energy)
+
+        def column(name):
+            return self.columns[name].reshape((-1,) + (1,) * ndim)
+
+        first_year = first_year_cost(energy, column("efficiency"), column("fuel_cost"))
+        running = first_year * geometric_sum(column("escalation_rate"), project_lifetime)
+        total = running + column("install_cost")
+        emission = energy * column("emission_factor")
+        return {
+            "annual_energy_kwh": energy,
+            "first_year_cost": first_year,
+            "running_cost": running,
+            "total_cost": total,
+            "annual_emission": emission,
+            "lifecycle_emission": emission * np.asarray(project_lifetime, dtype=float),
+            "cheapest": np.argmin(total, axis=0),
+        }
+
+
+def load_catalog(source=default_catalog_path):
+    return TechnologyRegistry.from_csv(source)
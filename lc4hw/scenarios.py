@@ -0,0 +1,76 @@
+#Result records of the three calculator pages, as kept in the scenario store (lc4hw.store).
+#Each calculator has a kind, an inputs dict built by its page and a function computing the record (a dict of
+#arrays) from those inputs; the pages call the same functions through ScenarioStore.fetch, so a stored record
+#and a freshly computed one are interchangeable. default_scenarios() gives each page's inputs as it
+#builds them before anything is changed, for pre-warming the store.
+
+import numpy as np
+
+from lc4hw.core import calculate_daily_running_costs, calculate_energy_needed, calculate_lifecycle_cost
+from lc4hw.defaults import h2_defaults, lc4hw_defaults, main_calculator_defaults
+
+
+def main_calculator_inputs(scenario, on_grid=(), multipliers=(), carbon_price=0.0, carbon_escalation=0.0):
+    # Store inputs of the Main Calculator page: the graph inputs plus the technology order
+    from lc4hw.graph import emission_inputs, scenario_inputs
+
+    inputs = {"systems": list(scenario["systems"])}
+    inputs.update(scenario_inputs(scenario))
+    inputs.update(emission_inputs(scenario["systems"], multipliers, on_grid, carbon_price, carbon_escalation))
+    return inputs
+
+
+def main_calculator_record(inputs):
+    # Evaluated on a new dependency graph; the page uses its session's graph instead (lc4hw.graph.main_calculator_record)
+    from lc4hw.graph import main_calculator_graph, main_calculator_record as graph_record
+
+    graph = main_calculator_graph(inputs["systems"])
+    graph.update({name: value for name, value in inputs.items() if name != "systems"})
+    return graph_record(graph)
+
+
+def lc4hw_inputs(lpg_price, lpg_escalation, electricity_price, electricity_escalation, annual_lpg_litres, annual_electricity_kwh, project_lifetime):
+    # Store inputs of the LPG vs Electric page (prices in £, escalation rates as fractions)
+    return {"lpg_price": lpg_price, "lpg_escalation": lpg_escalation, "electricity_price": electricity_price,
+            "electricity_escalation": electricity_escalation, "annual_lpg_litres": annual_lpg_litres,
+            "annual_electricity_kwh": annual_electricity_kwh, "project_lifetime": project_lifetime}
+
+
+def lc4hw_record(inputs):
+    return {
+        "lpg_lifecycle_cost": np.array(calculate_lifecycle_cost(inputs["lpg_price"], inputs["lpg_escalation"], inputs["annual_lpg_litres"], inputs["project_lifetime"])),
+        "electricity_lifecycle_cost": np.array(calculate_lifecycle_cost(inputs["electricity_price"], inputs["electricity_escalation"],
+                                                                        inputs["annual_electricity_kwh"], inputs["project_lifetime"])),
+    }
+
+
+def h2_record(inputs):
+    # Annual running costs (technologies, years) and totals including installation, technologies in install_costs order
+    annual, totals = [], []
+    for system, install_cost in inputs["install_costs"].items():
+        df, total_cost = calculate_daily_running_costs(inputs["daily_water_usage"], inputs["temp_rise"], inputs["efficiencies"][system],
+                                                       inputs["fuel_costs"][system], inputs["escalation_rate"], inputs["years"])
+        annual.append(df["Cost"].to_numpy())
+        totals.append(total_cost + install_cost)
+    return {"annual_costs": np.array(annual), "total_costs": np.array(totals)}
+
+
+calculators = {
+    "main_calculator": main_calculator_record,
+    "lc4hw": lc4hw_record,
+    "h2_comparison": h2_record,
+}
+
+
+def default_scenarios():
+    # [(kind, inputs)] of each page as first opened
+    d = lc4hw_defaults
+    energy_per_liter = calculate_energy_needed(d["hot_temp"], d["cold_temp"], d["efficiency"])
+    annual_hot_water_kwh = d["tank_size"] * d["heating_days"] * energy_per_liter * d["efficiency"]
+    annual_lpg_liters = annual_hot_water_kwh / (d["lpg_efficiency"] * d["lpg_energy_content"])
+    return [
+        ("main_calculator", main_calculator_inputs(main_calculator_defaults, on_grid=("Electric Boiler", "Heat Pump"))),
+        ("lc4hw", lc4hw_inputs(d["lpg_price"], d["lpg_escalation"], d["electricity_price"], d["electricity_escalation"],
+                               annual_lpg_liters, annual_hot_water_kwh, d["project_lifetime"])),
+        ("h2_comparison", dict(h2_defaults)),
+    ]
@@ -0,0 +1,165 @@
+#Cheapest feasible heating schedule for electric boilers and heat pumps under half-hourly prices.
+#Dynamic programming over a discretized tank state. Every day of the year (and every site) is an independent
+#row of one batch: the backward and forward passes loop over the 48 slots of a day while the arithmetic runs
+#on (start levels x days x tank states x heater settings) arrays, so a full year costs 2 x 48 NumPy steps
+#rather than a Python loop over 17,520 slots.
+#
+#Days are cyclic: each day starts with the tank at one of `start_fractions` of capacity and must end at least
+#as full, so consecutive optimal days chain together; the best start level is picked per day. The backward
+#pass stores the value of every tank state and the forward pass picks the heater setting at the actual state
+#against it, so the schedule is exact in the tank state and only the value function is interpolated.
+#The defaults (21 levels, 5 heater settings) solve a site-year in roughly a quarter of a second and land
+#within a percent or two of a grid twice as fine.
+
+import numpy as np
+
+from lc4hw.tou import slot_hours, slots_per_day
+
+
+def _daily(values, n_days):
+    # (sites, slots) -> (sites * days, 48)
+    values = np.asarray(values, dtype=float)
+    return values.reshape(values.shape[0], n_days, slots_per_day).reshape(-1, slots_per_day)
+
+
+def _per_row(values, n_sites, n_days):
+    # Per-site parameter -> one value per (site, day) row
+    return np.repeat(np.broadcast_to(np.asarray(values, dtype=float), (n_sites,)), n_days)
+
+
+def _solve_days(prices, demand, capacity, max_heat, efficiency, keep, levels, heat_levels, start_fractions, penalty):
+    # prices, demand: (rows, 48); capacity, max_heat, efficiency, keep, penalty: (rows,).
+    # Tank states and heat are in units of the tank's capacity, costs in £.
+    rows = prices.shape[0]
+    n_start = len(start_fractions)
+    grid = np.linspace(0.0, 1.0, levels)
+    heat = np.linspace(0.0, 1.0, heat_levels)[None, :] * (max_heat / capacity)[:, None]          # (rows, H)
+    demand = demand / capacity[:, None]
+    buy = prices * (capacity / efficiency)[:, None]                                               # £ per unit of heat
+    penalty = penalty * capacity / efficiency
+    starts = np.asarray(start_fractions, dtype=float)
+
+    # Terminal cost: the day must end at least as full as it started
+    value = np.maximum(starts[:, None, None] - grid[None, None, :], 0.0) * penalty[None, :, None]  # (C, rows, L)
+    values = np.empty((slots_per_day + 1, n_start, rows, levels))
+    values[slots_per_day] = value
+    row_offset = (np.arange(rows) * levels)[:, None, None]
+
+    # Heater settings that would overfill the tank are ruled out once, for every slot
+    heated = grid[None, :, None] + heat[:, None, :]                                                # (rows, L, H)
+    blocked = np.where(heated > 1.0 + 1e-9, np.inf, 0.0)
+    kept = heated * keep[:, None, None]
+    for t in range(slots_per_day - 1, -1, -1):
+        after = kept - demand[:, t][:, None, None]
+        position = np.clip(after, 0.0, 1.0) * (levels - 1)
+        lower = np.minimum(position.astype(np.intp), levels - 2)
+        weight = (position - lower).ravel()
+        # Linear interpolation of the next slot's value; one flat gather shared by all start levels
+        flat = (lower + row_offset).ravel()
+        value = value.reshape(n_start, -1)
+        below = value[:, flat]
+        continuation = below + (value[:, flat + 1] - below) * weight
+        cost = (heat[:, None, :] * buy[:, t][:, None, None] + np.maximum(-after, 0.0) * penalty[:, None, None] + blocked).ravel() + continuation
+        value = values[t] = cost.reshape(n_start, rows, levels, heat_levels).min(axis=-1)
+
+    # Forward pass from every start level, then keep the cheapest start per day
+    row = np.arange(rows)
+    state = np.repeat(starts[:, None], rows, axis=1)                                               # (C, rows)
+    heat_used = np.empty((slots_per_day, n_start, rows))
+    unmet = np.zeros((n_start, rows))
+    for t in range(slots_per_day):
+        # Best heater setting at the actual tank state, against the interpolated value of the next slot
+        h = np.minimum(heat[None, :, :], 1.0 - state[..., None])                                  # (C, rows, H)
+        after = (state[..., None] + h) * keep[:, None] - demand[:, t][:, None]
+        position = np.clip(after, 0.0, 1.0) * (levels - 1)
+        lower = np.minimum(position.astype(np.intp), levels - 2)
+        weight = position - lower
+        following = values[t + 1]
+        below = np.take_along_axis(following, lower, axis=-1)
+        continuation = below + (np.take_along_axis(following, lower + 1, axis=-1) - below) * weight
+        cost = h * buy[:, t][:, None] + np.maximum(-after, 0.0) * penalty[:, None] + continuation
+        choice = cost.argmin(axis=-1)[..., None]
+        h = np.take_along_axis(h, choice, axis=-1)[..., 0]
+        after = np.take_along_axis(after, choice, axis=-1)[..., 0]
+        unmet += np.maximum(-after, 0.0)
+        state = np.maximum(after, 0.0)
+        heat_used[t] = h
+
+    # Any end-of-day deficit against the start level is bought back in the day's cheapest slots, each topped up
+    # to the heater's maximum before the next; what even that cannot cover is left as unmet
+    makeup = np.maximum(starts[:, None] - state, 0.0)
+    order = np.argsort(buy, axis=1)                                                                # (rows, 48)
+    headroom = np.take_along_axis(np.maximum(heat[:, -1][None, :, None] - heat_used.transpose(1, 2, 0), 0.0), order[None], axis=-1)
+    before = np.cumsum(headroom, axis=-1) - headroom
+    extra = np.clip(makeup[..., None] - before, 0.0, headroom)                                     # (C, rows, 48), cheapest first
+    unmet += makeup - extra.sum(axis=-1)
+    day_cost = (heat_used * buy.T[:, None, :]).sum(axis=0) + (extra * np.take_along_axis(buy, order, axis=1)).sum(axis=-1) + unmet * penalty
+    best = np.argmin(day_cost, axis=0)
+    schedule = heat_used[:, best, row].T                                                           # (rows, 48)
+    np.put_along_axis(schedule, order, schedule[row[:, None], order] + extra[best, row], axis=1)
+    return schedule * (capacity / efficiency)[:, None], unmet[best, row] * capacity
+
+
+def baseline_cost(prices, demand_kwh, power_kw, efficiency, standing_loss_kwh_per_day=1.5, baseline_slot=0):
+    """Daily cost of the heat-once-a-day assumption behind calculate_running_costs.
+
+    Each day's draw-offs plus a full tank's standing losses are bought back in consecutive slots starting at
+    `baseline_slot`, at full heater power. prices and demand_kwh have shape (sites, slots); returns (sites, days).
+    """
+    prices = np.asarray(prices, dtype=float)
+    n_sites, n_slots = prices.shape
+    n_days = n_slots // slots_per_day
+    daily_heat = np.asarray(demand_kwh, dtype=float).reshape(n_sites, n_days, slots_per_day).sum(axis=-1) + standing_loss_kwh_per_day
+    max_input = np.broadcast_to(np.asarray(power_kw, dtype=float), (n_sites,))[:, None, None] * slot_hours
+    input_kwh = (daily_heat / np.broadcast_to(np.asarray(efficiency, dtype=float), (n_sites,))[:, None])[..., None]
+    steps = np.arange(slots_per_day)
+    per_slot = np.clip(input_kwh - steps * max_input, 0.0, max_input)                              # (sites, days, 48)
+    # Slot k of the daily heat falls at baseline_slot + k, running into the next day if needed
+    index = (np.arange(n_days)[:, None] * slots_per_day + baseline_slot + steps[None, :]) % n_slots
+    return (per_slot * prices[:, index]).sum(axis=-1)
+
+
+def optimal_schedule(prices, demand_kwh, capacity_kwh, power_kw, efficiency, standing_loss_kwh_per_day=1.5,
+                     levels=21, heat_levels=5, start_fractions=(0.0, 0.25, 0.5, 1.0), baseline_slot=0,
+                     penalty_factor=100.0, batch_rows=730):
+    """Cheapest heating schedule for one or many sites.
+
+    prices and demand_kwh: shape (slots,) or (sites, slots), slots a multiple of 48 (a year is 17,520).
+    capacity_kwh, power_kw (heater input), efficiency (or CoP) and standing_loss_kwh_per_day: scalars or
+    one value per site. Unmet demand is charged at penalty_factor x the site's highest price and is only left
+    when the heater cannot keep up. Rows of (site, day) are solved batch_rows at a time to bound memory.
+
+    Returns a dict with the heater input per slot (kWh), its cost, unmet demand, the cost of the
+    heat-once-a-day baseline and the savings against it, all per site.
+    """
+    prices = np.atleast_2d(np.asarray(prices, dtype=float))
+    n_sites, n_slots = prices.shape
+    demand_kwh = np.broadcast_to(np.atleast_2d(np.asarray(demand_kwh, dtype=float)), prices.shape)
+    n_days = n_slots // slots_per_day
+    if n_days * slots_per_day != n_slots:
+        raise ValueError(f"Number of slots must be a multiple of {slots_per_day}, not {n_slots}")
+
+    capacity = _per_row(capacity_kwh, n_sites, n_days)
+    efficiency_rows = _per_row(efficiency, n_sites, n_days)
+    max_heat = _per_row(power_kw, n_sites, n_days) * slot_hours * efficiency_rows
+    keep = 1 - _per_row(standing_loss_kwh_per_day, n_sites, n_days) / capacity / slots_per_day
+    penalty = penalty_factor * np.repeat(prices.max(axis=1), n_days)
+    daily_prices, daily_demand = _daily(prices, n_days), _daily(demand_kwh, n_days)
+
+    schedule = np.empty_like(daily_prices)
+    unmet = np.empty(len(daily_prices))
+    for start in range(0, len(daily_prices), batch_rows):
+        rows = slice(start, start + batch_rows)
+        schedule[rows], unmet[rows] = _solve_days(daily_prices[rows], daily_demand[rows], capacity[rows], max_heat[rows],
+                                                  efficiency_rows[rows], keep[rows], levels, heat_levels, start_fractions, penalty[rows])
+
+    input_kwh = schedule.reshape(n_sites, n_slots)
+    cost = (input_kwh * prices).sum(axis=1)
+    baseline = baseline_cost(prices, demand_kwh, power_kw, efficiency, standing_loss_kwh_per_day, baseline_slot).sum(axis=1)
+    return {
+        "input_kwh": input_kwh,
+        "cost": cost,
+        "unmet_kwh": unmet.reshape(n_sites, n_days).sum(axis=1),
+        "baseline_cost": baseline,
+        "savings": baseline - cost,
+    }
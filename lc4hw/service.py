@@ -0,0 +1,283 @@
+#Local HTTP/JSON service for the Main Calculator, Hot Water Energy Calculator and Loan Calculator.
+#Standard library only (asyncio streams, HTTP/1.1 with keep-alive). Requests to the same endpoint that arrive
+#within `window` seconds of each other are coalesced into one vectorized evaluation, identical requests in
+#flight share one result, and responses are kept in an LRU cache keyed on the canonicalized inputs (every
+#input filled in from the defaults and converted to float, so {"tank_size": 400} and {} are the same request).
+#
+#Endpoints (POST with a JSON object, answers in JSON):
+#    /lifecycle  Main Calculator inputs, e.g. {"tank_size": 300, "fuel_costs": {"Heat Pump": 0.25}}
+#    /energy     {"hot_temp": 65, "cold_temp": 10, "efficiency": 0.9, "litres": 100}
+#    /loan       {"principal": 10000, "rate": 0.05, "term": 10}   (rate as a fraction per year)
+#    GET /health, GET /stats
+#
+#Usage: python -m lc4hw.service --port 8765
+
+import argparse
+import asyncio
+import json
+import math
+import time
+
+import numpy as np
+
+from lc4hw.cache import LRUCache
+from lc4hw.core import calculate_energy_needed, lpg_energy_content
+from lc4hw.defaults import main_calculator_defaults
+from lc4hw.engine import annual_energy_kwh
+from lc4hw.finance import monthly_payment
+from lc4hw.sweep import base_value, evaluate, parameters, scalar_inputs, tech_inputs
+
+max_body_bytes = 1 << 20
+reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    # Invalid request input, answered with 400 and the message
+    pass
+
+
+def _number(body, name, default):
+    value = body.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise RequestError(f"'{name}' must be a number")
+    if not math.isfinite(value):
+        raise RequestError(f"'{name}' must be finite")
+    return float(value)
+
+
+def _positive(value, name):
+    if value <= 0:
+        raise RequestError(f"'{name}' must be positive")
+    return value
+
+
+# Canonicalization: each endpoint turns a JSON body into a tuple of floats in a fixed order
+
+lifecycle_params = parameters(main_calculator_defaults)
+
+
+def lifecycle_key(body):
+    unknown = set(body) - set(scalar_inputs) - set(tech_inputs)
+    if unknown:
+        raise RequestError(f"Unknown inputs: {', '.join(sorted(unknown))}")
+    for name in tech_inputs:
+        if name in body:
+            if not isinstance(body[name], dict):
+                raise RequestError(f"'{name}' must be an object keyed by technology")
+            bad = set(body[name]) - set(main_calculator_defaults["systems"])
+            if bad:
+                raise RequestError(f"Unknown technologies in '{name}': {', '.join(sorted(bad))}")
+    values = []
+    for param in lifecycle_params:
+        default = base_value(main_calculator_defaults, param)
+        if isinstance(param, tuple):
+            value = _number(body.get(param[0], {}), param[1], default)
+            values.append(_positive(value, f"{param[0]}.{param[1]}") if param[0] == "efficiencies" else value)
+        else:
+            values.append(_number(body, param, default))
+    return tuple(values)
+
+
+def energy_key(body):
+    hot_temp, cold_temp, efficiency, litres = (_number(body, name, default) for name, default in
+                                               [("hot_temp", 65.0), ("cold_temp", 10.0), ("efficiency", 0.9), ("litres", 100.0)])
+    return hot_temp, cold_temp, _positive(efficiency, "efficiency"), litres
+
+
+def loan_key(body):
+    principal, rate, term = (_number(body, name, default) for name, default in [("principal", 10000.0), ("rate", 0.05), ("term", 10.0)])
+    return principal, rate, _positive(term, "term")
+
+
+# Vectorized evaluation of a batch of canonical inputs (one row per request)
+
+def evaluate_lifecycle(keys):
+    table = np.array(keys, dtype=float)
+    overrides = {param: table[:, j] for j, param in enumerate(lifecycle_params)}
+    result = evaluate(main_calculator_defaults, overrides)
+    column = {param: j for j, param in enumerate(lifecycle_params)}
+    energy = annual_energy_kwh(*(table[:, column[name]] for name in ("tank_size", "hot_temp", "cold_temp", "heating_days", "heating_days_topup")))
+    systems = main_calculator_defaults["systems"]
+    total_costs, emissions = result["total_costs"].tolist(), result["emissions"].tolist()
+    return [{
+        "systems": systems,
+        "total_cost": {system: total_costs[i][k] for i, system in enumerate(systems)},
+        "annual_emission": {system: emissions[i][k] for i, system in enumerate(systems)},
+        "annual_energy_kwh": float(energy[k]),
+        "cheapest": systems[int(result["cheapest"][k])],
+    } for k in range(len(keys))]
+
+
+def evaluate_energy(keys):
+    hot, cold, efficiency, litres = np.array(keys, dtype=float).T
+    per_litre = calculate_energy_needed(hot, cold, efficiency)
+    return [{"kwh_per_litre": float(e), "kwh": float(e * n), "lpg_litres": float(e * n / lpg_energy_content)}
+            for e, n in zip(per_litre, litres)]
+
+
+def evaluate_loan(keys):
+    principal, rate, term = np.array(keys, dtype=float).T
+    payment = monthly_payment(principal, rate, term)
+    total = payment * np.rint(term * 12)
+    return [{"monthly_payment": float(p), "total_paid": float(t), "total_interest": float(t - b)}
+            for p, t, b in zip(payment, total, principal)]
+
+
+class Batcher:
+    """Coalesces concurrent requests into one call of evaluate(list of keys) -> list of results.
+
+    The first request of a batch starts a timer of `window` seconds; the batch is evaluated when it fires or
+    as soon as max_batch requests are waiting. Evaluation runs on the event loop: one vectorized call for a
+    batch is far cheaper than handing it to a thread.
+    """
+
+    def __init__(self, evaluate, window=0.002, max_batch=1024):
+        self.evaluate = evaluate
+        self.window = window
+        self.max_batch = max_batch
+        self.pending = {}
+        self.timer = None
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, key):
+        # Future of the result for key; identical keys already waiting share the same future
+        future = self.pending.get(key)
+        if future is None:
+            future = self.pending[key] = asyncio.get_running_loop().create_future()
+            if len(self.pending) >= self.max_batch:
+                self.flush()
+            elif self.timer is None:
+                self.timer = asyncio.get_running_loop().call_later(self.window, self.flush)
+        return future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        batch, self.pending = self.pending, {}
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = self.evaluate(list(batch))
+        except Exception as error:
+            for future in batch.values():
+                future.set_exception(error)
+        else:
+            for future, result in zip(batch.values(), results):
+                future.set_result(result)
+
+
+class CalculationService:
+
+    def __init__(self, window=0.002, max_batch=1024, cache_size=10_000):
+        self.cache = LRUCache(cache_size)
+        self.endpoints = {
+            "/lifecycle": (lifecycle_key, Batcher(evaluate_lifecycle, window, max_batch)),
+            "/energy": (energy_key, Batcher(evaluate_energy, window, max_batch)),
+            "/loan": (loan_key, Batcher(evaluate_loan, window, max_batch)),
+        }
+        self.requests = 0
+        self.started = time.time()
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "uptime_s": time.time() - self.started,
+            "cache": self.cache.stats(),
+            "batches": {path: {"batches": b.batches, "items": b.items, "mean_size": b.items / b.batches if b.batches else 0.0}
+                        for path, (_, b) in self.endpoints.items()},
+        }
+
+    async def handle(self, method, path, body):
+        # (status, payload) for one request; body is the raw request body
+        self.requests += 1
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/stats":
+            return 200, self.stats()
+        if path not in self.endpoints:
+            return 404, {"error": f"Unknown endpoint {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST with a JSON object"}
+        try:
+            data = json.loads(body or b"{}")
+            if not isinstance(data, dict):
+                raise RequestError("The request body must be a JSON object")
+            canonical, batcher = self.endpoints[path]
+            key = canonical(data)
+        except (ValueError, RequestError) as error:
+            return 400, {"error": str(error)}
+        cache_key = (path, key)
+        result = self.cache.get(cache_key)
+        if result is None:
+            result = await batcher.submit(key)
+            self.cache.put(cache_key, result)
+        return 200, result
+
+    async def connection(self, reader, writer):
+        # One HTTP/1.1 connection; requests are answered in order until the client closes it
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > max_body_bytes:
+                    status, payload = 413, {"error": "Request body too large"}
+                    body = None
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    try:
+                        status, payload = await self.handle(method, path.split("?")[0], body)
+                    except Exception as error:
+                        status, payload = 500, {"error": str(error)}
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1" and body is not None
+                content = json.dumps(payload).encode()
+                writer.write(f"HTTP/1.1 {status} {reasons[status]}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(content)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + content)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765, ready=None):
+        server = await asyncio.start_server(self.connection, host, port, backlog=1024)
+        if ready is not None:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP/JSON service for the LC4HW lifecycle cost, energy and loan calculations.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port (default 8765)")
+    parser.add_argument("--window-ms", type=float, default=2.0, help="Batching window in milliseconds (default 2)")
+    parser.add_argument("--max-batch", type=int, default=1024, help="Largest batch evaluated at once (default 1024)")
+    parser.add_argument("--cache-size", type=int, default=10_000, help="Cached responses (default 10000)")
+    args = parser.parse_args(argv)
+
+    service = CalculationService(args.window_ms / 1000, args.max_batch, args.cache_size)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
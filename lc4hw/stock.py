@@ -0,0 +1,255 @@
+#National housing stock scale-out: the Main Calculator comparison for millions of dwellings, totalled by region.
+#The stock is a table of per-dwelling columns (region, current technology and any Main Calculator input, named
+#as in lc4hw.portfolio: tank_size, cold_temp, fuel_costs[Heat Pump], ...). It is split into shards and its
+#columns are copied once into one block of shared memory, which every worker process maps when it starts, so a
+#shard is handed over as a (start, stop) pair instead of a pickled copy of its rows. Each worker evaluates its
+#shard in one vectorized call (lc4hw.sweep.evaluate) and reduces it to regional aggregates: dwellings,
+#lifecycle cost and annual emissions with the current technology and with the cheapest one, and the number of
+#dwellings switching from each technology to each other. Only these small arrays travel back to be summed,
+#together with each shard's timing.
+#
+#The current technology is already installed, so its installation cost is left out of its lifecycle cost.
+#synthetic_stock() draws an illustrative stock of English, Welsh, Scottish and Northern Irish dwellings.
+#
+#Usage: python -m lc4hw.stock --dwellings 5000000 --processes 8 --shards 64 [--output regions.csv] [--timings]
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from lc4hw.defaults import main_calculator_defaults
+from lc4hw.demand import default_event_types, draw_occupants
+from lc4hw.sweep import evaluate, scalar_inputs, tech_inputs
+
+# Share of dwellings and mean mains water temperature (°C) of each region (illustrative)
+default_regions = {
+    "North East": (0.045, 9.5),
+    "North West": (0.12, 10.0),
+    "Yorkshire and The Humber": (0.09, 10.0),
+    "East Midlands": (0.08, 10.5),
+    "West Midlands": (0.09, 10.5),
+    "East of England": (0.10, 11.0),
+    "London": (0.12, 12.0),
+    "South East": (0.14, 11.5),
+    "South West": (0.09, 11.5),
+    "Wales": (0.05, 10.5),
+    "Scotland": (0.09, 9.0),
+    "Northern Ireland": (0.03, 9.5),
+}
+# Share of dwellings heating their hot water with each technology today (off the gas grid, illustrative)
+default_current_shares = {"LPG Boiler": 0.35, "Electric Boiler": 0.5, "Heat Pump": 0.15}
+aggregates = ("dwellings", "current_cost", "cheapest_cost", "current_emissions", "cheapest_emissions")
+
+_shared = None  # (SharedMemory, {column: array}) of a worker process, set by _attach
+
+
+def synthetic_stock(dwellings, seed=None, scenario=None, regions=default_regions, current_shares=default_current_shares):
+    """Per-dwelling columns of a synthetic stock, as {name: array} with region codes into list(regions).
+
+    Each dwelling has a number of occupants and the daily hot water they draw on average (lc4hw.demand) as
+    tank_size, a regional cold water temperature, its own heating days and an electricity tariff that scales
+    the Electric Boiler and Heat Pump prices. Its current technology is an index into scenario['systems'].
+    """
+    scenario = scenario or main_calculator_defaults
+    systems = scenario["systems"]
+    rng = np.random.default_rng(seed)
+    shares = np.array([share for share, _ in regions.values()])
+    region = rng.choice(len(regions), dwellings, p=shares / shares.sum()).astype(np.int16)
+    occupants = draw_occupants(dwellings, rng)
+    daily_litres = sum((event["base"] + event["per_person"] * occupants) * event["litres"] for event in default_event_types.values())
+    current = np.array([current_shares.get(system, 0.0) for system in systems])
+    tariff = rng.uniform(0.85, 1.15, dwellings)
+    columns = {
+        "region": region,
+        "current": rng.choice(len(systems), dwellings, p=current / current.sum()).astype(np.int8),
+        "tank_size": daily_litres.astype(np.float32),
+        "cold_temp": (np.array([cold for _, cold in regions.values()])[region] + rng.normal(0, 0.5, dwellings)).astype(np.float32),
+        "heating_days": rng.integers(240, 366, dwellings).astype(np.float32),
+    }
+    for system in ("Electric Boiler", "Heat Pump"):
+        if system in systems:
+            columns[f"fuel_costs[{system}]"] = (scenario["fuel_costs"][system] * tariff).astype(np.float32)
+    return columns
+
+
+def assess_dwellings(columns, scenario, n_regions):
+    # Regional aggregates of one block of dwellings
+    systems = scenario["systems"]
+    overrides = {name: columns[name] for name in scalar_inputs if name in columns}
+    for name in tech_inputs:
+        for system in systems:
+            if f"{name}[{system}]" in columns:
+                overrides[(name, system)] = columns[f"{name}[{system}]"]
+    result = evaluate(scenario, overrides)
+    n = len(columns["region"])
+    shape = (len(systems), n)
+    installed = np.array([scenario["install_costs"][system] for system in systems], dtype=float)
+    current = columns["current"].astype(np.intp)
+    total_costs = np.broadcast_to(result["total_costs"].reshape(len(systems), -1), shape).copy()
+    total_costs[current, np.arange(n)] -= installed[current]  # already installed
+    emissions = np.broadcast_to(result["emissions"].reshape(len(systems), -1), shape)
+    cheapest = np.argmin(total_costs, axis=0)
+    rows = np.arange(n)
+    region = columns["region"].astype(np.intp)
+    n_tech = len(systems)
+    return {
+        "dwellings": np.bincount(region, minlength=n_regions).astype(float),
+        "current_cost": np.bincount(region, weights=total_costs[current, rows], minlength=n_regions),
+        "cheapest_cost": np.bincount(region, weights=total_costs[cheapest, rows], minlength=n_regions),
+        "current_emissions": np.bincount(region, weights=emissions[current, rows], minlength=n_regions),
+        "cheapest_emissions": np.bincount(region, weights=emissions[cheapest, rows], minlength=n_regions),
+        "switches": np.bincount((region * n_tech + current) * n_tech + cheapest,
+                                minlength=n_regions * n_tech * n_tech).reshape(n_regions, n_tech, n_tech),
+    }
+
+
+def share_columns(columns):
+    """Copy the columns into one new block of shared memory; returns (SharedMemory, layout).
+
+    layout is [(name, dtype, length, offset)], enough for attach_columns() to map the same arrays.
+    """
+    layout, offset = [], 0
+    for name, values in columns.items():
+        values = np.asarray(values)
+        layout.append((name, values.dtype.str, len(values), offset))
+        offset += -(-values.nbytes // 64) * 64  # keep every column 64-byte aligned
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for (name, dtype, length, start), values in zip(layout, columns.values()):
+        np.ndarray(length, dtype=dtype, buffer=shm.buf, offset=start)[:] = values
+    return shm, layout
+
+
+def attach_columns(shm, layout):
+    # Arrays over the shared block, without copying
+    return {name: np.ndarray(length, dtype=dtype, buffer=shm.buf, offset=offset) for name, dtype, length, offset in layout}
+
+
+def _attach(name, layout):
+    # Worker initializer: map the shared block once per process
+    global _shared
+    shm = shared_memory.SharedMemory(name=name)
+    _shared = (shm, attach_columns(shm, layout))
+
+
+def evaluate_shard(scenario, n_regions, shard, start, stop, columns=None):
+    # Aggregates of dwellings start:stop of the shared columns (or of `columns`), with the shard's timing
+    begin = time.perf_counter()
+    columns = columns if columns is not None else _shared[1]
+    result = assess_dwellings({name: values[start:stop] for name, values in columns.items()}, scenario, n_regions)
+    result["timing"] = {"shard": shard, "rows": stop - start, "seconds": time.perf_counter() - begin, "pid": os.getpid()}
+    return result
+
+
+def run_stock(columns, n_regions, scenario=None, processes=None, shards=None, progress=None):
+    """Regional aggregates of a whole stock, evaluated shard by shard on `processes` workers (all cores when None).
+
+    shards defaults to four per worker, so that a slow shard does not hold up the others. processes=1 runs
+    in-process on the columns themselves. progress(shards done, shards) is called after every shard.
+    Returns the summed aggregates, timings (one dict per shard: shard, rows, seconds, pid), the wall-clock
+    seconds and rows_per_second.
+    """
+    scenario = scenario or main_calculator_defaults
+    processes = processes or os.cpu_count() or 1
+    shards = shards or 4 * processes
+    n = len(columns["region"])
+    bounds = np.linspace(0, n, shards + 1).astype(int)
+    results = []
+    start = time.perf_counter()
+
+    def done(result):
+        results.append(result)
+        if progress:
+            progress(len(results), shards)
+
+    if processes == 1:
+        for i in range(shards):
+            done(evaluate_shard(scenario, n_regions, i, bounds[i], bounds[i + 1], columns))
+    else:
+        shm, layout = share_columns(columns)
+        try:
+            with ProcessPoolExecutor(max_workers=processes, initializer=_attach, initargs=(shm.name, layout)) as pool:
+                futures = [pool.submit(evaluate_shard, scenario, n_regions, i, bounds[i], bounds[i + 1]) for i in range(shards)]
+                for future in as_completed(futures):
+                    done(future.result())
+        finally:
+            shm.close()
+            shm.unlink()
+
+    seconds = time.perf_counter() - start
+    totals = {name: sum(result[name] for result in results) for name in aggregates + ("switches",)}
+    totals["timings"] = sorted((result["timing"] for result in results), key=lambda timing: timing["shard"])
+    totals["seconds"] = seconds
+    totals["rows_per_second"] = n / seconds if seconds else float("inf")
+    return totals
+
+
+def region_table(totals, regions, systems):
+    # One row per region (and a total row): cost and emissions now and with the cheapest technology, and switches
+    names = list(regions) + ["Total"]
+
+    def with_total(values):
+        return np.append(values, values.sum(axis=0, keepdims=True), axis=0)
+
+    switches = with_total(totals["switches"])
+    staying = np.trace(switches, axis1=1, axis2=2)
+    out = {
+        "Region": np.array(names),
+        "Dwellings": with_total(totals["dwellings"]),
+        "Lifecycle Cost, Current (£m)": with_total(totals["current_cost"]) / 1e6,
+        "Lifecycle Cost, Cheapest (£m)": with_total(totals["cheapest_cost"]) / 1e6,
+        "Annual Emission, Current (tCO2e)": with_total(totals["current_emissions"]) / 1000,
+        "Annual Emission, Cheapest (tCO2e)": with_total(totals["cheapest_emissions"]) / 1000,
+        "Dwellings Switching": with_total(totals["dwellings"]) - staying,
+    }
+    for i, system in enumerate(systems):
+        out[f"Switching to {system}"] = switches[:, :, i].sum(axis=1) - switches[:, i, i]
+    return out
+
+
+def main(argv=None):
+    import pandas as pd
+
+    from lc4hw.export import TableWriter
+    from lc4hw.portfolio import _format
+
+    parser = argparse.ArgumentParser(description="Regional lifecycle cost, emissions and fuel switching over a synthetic national housing stock.")
+    parser.add_argument("--dwellings", type=int, default=1_000_000, help="Dwellings in the stock (default 1000000)")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--shards", type=int, default=None, help="Shards (default: four per worker)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", help="Also write the regional table to this file (.csv, .parquet or .xlsx)")
+    parser.add_argument("--timings", action="store_true", help="Print the timing of every shard")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    columns = synthetic_stock(args.dwellings, args.seed)
+    print(f"Generated {args.dwellings:,} dwellings in {time.perf_counter() - start:.2f} s", file=sys.stderr)
+    totals = run_stock(columns, len(default_regions), processes=args.processes, shards=args.shards,
+                       progress=lambda done, shards: print(f"\r{done}/{shards} shards", end="", file=sys.stderr))
+    print(file=sys.stderr)
+
+    table = region_table(totals, default_regions, main_calculator_defaults["systems"])
+    with pd.option_context("display.width", 200, "display.max_columns", None, "display.float_format", "{:,.1f}".format):
+        print(pd.DataFrame(table).set_index("Region"))
+    if args.output:
+        with TableWriter(args.output, _format(args.output, None)) as writer:
+            writer.write(table)
+
+    timings = totals["timings"]
+    shard_seconds = np.array([timing["seconds"] for timing in timings])
+    workers = len({timing["pid"] for timing in timings})
+    if args.timings:
+        for timing in timings:
+            print(f"shard {timing['shard']:4d}: {timing['rows']:>10,} rows in {timing['seconds'] * 1000:8.1f} ms (pid {timing['pid']})")
+    print(f"\n{args.dwellings:,} dwellings in {totals['seconds']:.2f} s ({totals['rows_per_second']:,.0f} dwellings/s) on {workers} worker(s); "
+          f"{len(timings)} shards of {np.median(shard_seconds) * 1000:.1f} ms median (min {shard_seconds.min() * 1000:.1f}, "
+          f"max {shard_seconds.max() * 1000:.1f}); busy {shard_seconds.sum() / (totals['seconds'] * workers):.0%} of the workers' time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#Persistent scenario store: computed results of calculator scenarios kept in a local SQLite file.
+#A scenario is the full input set of one calculator (`kind`), canonicalized to JSON (keys sorted, numbers as
+#floats rounded to 12 significant digits, so 400 and 400.0 are the same input) and hashed; its results, a dict
+#of NumPy arrays, are stored as one compressed binary blob under that hash. Repeated or shared scenarios, and
+#everything computed before a restart, are then loaded instead of recomputed.
+#
+#The file is bounded to `max_bytes` of blobs; least recently used scenarios are evicted first. Recently used
+#records are also kept unpacked in memory, so a rerun with unchanged inputs costs one hash. The default path
+#is cache/scenarios.sqlite, or LC4HW_STORE if set.
+#
+#Usage: python -m lc4hw.store [--prewarm] [--clear] [--path PATH]   (prints the store statistics)
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from lc4hw.cache import LRUCache
+
+default_store_path = os.environ.get("LC4HW_STORE", os.path.join("cache", "scenarios.sqlite"))
+default_max_bytes = 64 * 1024 * 1024
+model_version = 2  # part of every hash: bump when a calculator's results change for the same inputs
+
+schema = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    hash TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    results BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS scenarios_accessed ON scenarios (accessed);
+"""
+
+
+def _plain(value):
+    # JSON-ready copy of an input value: numbers become rounded floats, tuples and arrays become lists
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(f"{float(value):.12g}")
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_plain(v) for v in value]
+    return value
+
+
+def canonical(inputs):
+    return json.dumps(_plain(inputs), sort_keys=True, separators=(",", ":"))
+
+
+def scenario_hash(kind, inputs):
+    return hashlib.blake2b(f"{model_version}\n{kind}\n{canonical(inputs)}".encode(), digest_size=16).hexdigest()
+
+
+def pack(arrays):
+    # {name: array} -> zlib(header length, JSON header of names, dtypes and shapes, raw array bytes)
+    arrays = {name: np.asarray(values) for name, values in arrays.items()}  # tobytes() writes C order
+    header = json.dumps([[name, values.dtype.str, values.shape] for name, values in arrays.items()]).encode()
+    return zlib.compress(struct.pack("<I", len(header)) + header + b"".join(values.tobytes() for values in arrays.values()))
+
+
+def unpack(blob):
+    data = zlib.decompress(blob)
+    (length,) = struct.unpack_from("<I", data)
+    offset = 4 + length
+    arrays = {}
+    for name, dtype, shape in json.loads(data[4:offset]):
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape))
+        values = np.frombuffer(data, dtype=dtype, count=count, offset=offset).reshape(tuple(shape))
+        offset += count * dtype.itemsize
+        arrays[name] = values  # read-only views of the decompressed buffer, like memoized results
+    return arrays
+
+
+class ScenarioStore:
+
+    def __init__(self, path=default_store_path, max_bytes=default_max_bytes, memory_entries=256):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        # One named cache per store file (and per in-memory store), so that each counts towards the budget
+        self.memory = LRUCache(memory_entries, name=f"scenario store {path}" if path != ":memory:" else f"scenario store :memory: {id(self):x}")
+        self.lock = threading.Lock()  # one connection shared by the server's script threads; also guards the counters
+        self.connection = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        if path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode=WAL")  # several server processes may share the file
+        self.connection.executescript(schema)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, kind, inputs):
+        # Stored results of the scenario, or None
+        key = scenario_hash(kind, inputs)
+        record = self.memory.get(key)
+        if record is not None:
+            with self.lock:
+                self.hits += 1
+            return record
+        with self.lock:
+            row = self.connection.execute("SELECT results FROM scenarios WHERE hash = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.connection.execute("UPDATE scenarios SET accessed = ?, hits = hits + 1 WHERE hash = ?", (time.time(), key))
+            self.hits += 1
+        record = unpack(row[0])
+        self.memory.put(key, record)
+        return record
+
+    def put(self, kind, inputs, arrays):
+        key = scenario_hash(kind, inputs)
+        blob = pack(arrays)
+        now = time.time()
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO scenarios (hash, kind, inputs, results, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, kind, canonical(inputs), blob, len(blob), now, now))
+            self._evict()
+        self.memory.put(key, unpack(blob))
+        return key
+
+    def fetch(self, kind, inputs, compute):
+        # Stored results, or compute(inputs) stored for next time
+        record = self.get(kind, inputs)
+        if record is None:
+            self.put(kind, inputs, compute(inputs))
+            record = self.get(kind, inputs)
+        return record
+
+    def _evict(self):
+        # Drop least recently used scenarios until the blobs fit in max_bytes (lock held by the caller)
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM scenarios").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.connection.execute("SELECT hash, size FROM scenarios ORDER BY accessed").fetchall()
+        dropped = []
+        for key, size in rows[:-1]:  # the newest scenario always stays
+            if total <= self.max_bytes:
+                break
+            dropped.append((key,))
+            total -= size
+        self.connection.executemany("DELETE FROM scenarios WHERE hash = ?", dropped)
+        self.evictions += len(dropped)
+        self.memory.clear()
+
+    def stats(self):
+        with self.lock:
+            entries, size = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM scenarios").fetchone()
+            kinds = dict(self.connection.execute("SELECT kind, COUNT(*) FROM scenarios GROUP BY kind").fetchall())
+        return {"path": self.path, "entries": entries, "bytes": size, "max_bytes": self.max_bytes, "kinds": kinds,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def clear(self):
+        with self.lock:
+            self.connection.execute("DELETE FROM scenarios")
+        self.memory.clear()
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+def prewarm(store, scenarios=None):
+    """Compute and store the given [(kind, inputs)] (default: the default scenario of every calculator page).
+
+    Scenarios already in the store are left as they are; returns the number that were computed.
+    """
+    from lc4hw.scenarios import calculators, default_scenarios
+
+    computed = 0
+    for kind, inputs in scenarios if scenarios is not None else default_scenarios():
+        if store.get(kind, inputs) is None:
+            store.put(kind, inputs, calculators[kind](inputs))
+            computed += 1
+    return computed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect, pre-warm or clear the LC4HW scenario store.")
+    parser.add_argument("--path", default=default_store_path, help=f"Store file (default {default_store_path})")
+    parser.add_argument("--prewarm", action="store_true", help="Compute the default scenarios of every calculator")
+    parser.add_argument("--clear", action="store_true", help="Remove every stored scenario")
+    args = parser.parse_args(argv)
+
+    store = ScenarioStore(args.path)
+    if args.clear:
+        store.clear()
+    if args.prewarm:
+        start = time.perf_counter()
+        computed = prewarm(store)
+        print(f"Pre-warmed {computed} scenarios in {time.perf_counter() - start:.2f} s")
+    print(json.dumps(store.stats(), indent=2))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
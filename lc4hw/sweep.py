@@ -0,0 +1,183 @@
+#Parameter sweeps and tornado sensitivity for the Main Calculator.
+#A scenario is a dict of the Main Calculator inputs; any of them can be replaced by an array and the whole
+#grid is evaluated by broadcasting through the running-cost and emission formulas (technologies on axis 0).
+
+import numpy as np
+
+from lc4hw.engine import annual_energy_kwh, escalation_factors, first_year_cost, total_running_cost
+
+# Inputs given per technology; every other scenario key is a single value shared by all technologies
+tech_inputs = ("install_costs", "efficiencies", "fuel_costs", "escalation_rates", "emission_factors")
+scalar_inputs = ("tank_size", "hot_temp", "cold_temp", "heating_days", "heating_days_topup", "project_lifetime")
+labels = {
+    "install_costs": "Installation Cost (£)",
+    "efficiencies": "Efficiency",
+    "fuel_costs": "Energy Price",
+    "escalation_rates": "Price Escalation (%)",
+    "emission_factors": "Emission Factor",
+    "tank_size": "Hot Water Demand/Tank (litres)",
+    "hot_temp": "Hot Water Temperature (°C)",
+    "cold_temp": "Cold Water Temperature (°C)",
+    "heating_days": "Heating Days per Year",
+    "heating_days_topup": "Top-up Heating Days per Year",
+    "project_lifetime": "Project Lifetime (years)",
+}
+
+
+def default_scenario(systems, install_costs, efficiencies, fuel_costs, escalation_rates, emission_factors,
+                     tank_size, hot_temp, cold_temp, heating_days, heating_days_topup, project_lifetime):
+    return {
+        "systems": list(systems),
+        "install_costs": dict(install_costs),
+        "efficiencies": dict(efficiencies),
+        "fuel_costs": dict(fuel_costs),
+        "escalation_rates": dict(escalation_rates),
+        "emission_factors": dict(emission_factors),
+        "tank_size": tank_size,
+        "hot_temp": hot_temp,
+        "cold_temp": cold_temp,
+        "heating_days": heating_days,
+        "heating_days_topup": heating_days_topup,
+        "project_lifetime": project_lifetime,
+    }
+
+
+def parameters(scenario):
+    # Every sweepable input: plain names for shared inputs, (input, system) pairs for per-technology ones
+    return list(scalar_inputs) + [(name, system) for name in tech_inputs for system in scenario["systems"]]
+
+
+def parameter_label(param):
+    if isinstance(param, tuple):
+        return f"{param[1]} {labels[param[0]]}"
+    return labels[param]
+
+
+def base_value(scenario, param):
+    if isinstance(param, tuple):
+        return scenario[param[0]][param[1]]
+    return scenario[param]
+
+
+def broadcast_inputs(scenario, overrides):
+    # Shared inputs (with a leading axis of 1) and a per_tech(name) lookup, all broadcast to the override grid
+    ndim = max([np.ndim(values) for values in overrides.values()], default=0)
+
+    def value(param):
+        # Left-pad to the grid's number of dimensions so the technologies axis always lines up
+        values = np.asarray(overrides.get(param, base_value(scenario, param)), dtype=float)
+        return values.reshape((1,) * (ndim - values.ndim) + values.shape)
+
+    def per_tech(name):
+        return np.stack(np.broadcast_arrays(*[value((name, system)) for system in scenario["systems"]]))
+
+    shared = {name: value(name)[None] for name in scalar_inputs}
+    shared["energy"] = annual_energy_kwh(shared["tank_size"], shared["hot_temp"], shared["cold_temp"],
+                                         shared["heating_days"], shared["heating_days_topup"])
+    return shared, per_tech
+
+
+def grid_overrides(axes):
+    # One axis per swept parameter, in the order given
+    overrides = {}
+    for i, (param, values) in enumerate(axes.items()):
+        shape = [1] * len(axes)
+        shape[i] = -1
+        overrides[param] = np.asarray(values, dtype=float).reshape(shape)
+    return overrides
+
+
+def evaluate(scenario, overrides=None):
+    """Evaluate a scenario with some inputs replaced by arrays.
+
+    All override arrays must broadcast together; the results have a leading technologies axis followed by
+    their broadcast shape. Returns a dict with total_costs, emissions (annual, as in calculate_emissions)
+    and cheapest (index into scenario['systems']).
+    """
+    shared, per_tech = broadcast_inputs(scenario, overrides or {})
+    energy = shared["energy"]
+    total_costs = per_tech("install_costs") + total_running_cost(
+        energy, per_tech("efficiencies"), per_tech("fuel_costs"), per_tech("escalation_rates"), shared["project_lifetime"])
+    emissions = energy * per_tech("emission_factors")
+    total_costs, emissions = np.broadcast_arrays(total_costs, emissions)
+    return {"total_costs": total_costs, "emissions": emissions, "cheapest": np.argmin(total_costs, axis=0)}
+
+
+def grid_sweep(scenario, axes):
+    """Evaluate the Cartesian grid of `axes` (dict of parameter -> 1-D values).
+
+    Returns the results cube of evaluate() with one axis per swept parameter, in the order given.
+    """
+    cube = evaluate(scenario, grid_overrides(axes))
+    cube["axes"] = {param: np.asarray(values, dtype=float) for param, values in axes.items()}
+    return cube
+
+
+def grid_series(scenario, axes):
+    """Annual cost and emission series over the Cartesian grid of `axes`, for exports.
+
+    Returns (annual_costs, annual_emissions) of shape (technologies, *grid, years). When project_lifetime is
+    swept the years axis covers the longest lifetime and later years of shorter ones are NaN.
+    """
+    shared, per_tech = broadcast_inputs(scenario, grid_overrides(axes))
+    energy, lifetime = shared["energy"], shared["project_lifetime"]
+    n_years = int(lifetime.max())
+    first_year = first_year_cost(energy, per_tech("efficiencies"), per_tech("fuel_costs"))
+    annual = first_year[..., None] * escalation_factors(per_tech("escalation_rates"), n_years)
+    annual = np.where(np.arange(1, n_years + 1) <= lifetime[..., None], annual, np.nan)
+    emissions = np.where(np.isnan(annual), np.nan, (energy * per_tech("emission_factors"))[..., None])
+    return annual, emissions
+
+
+def tornado(scenario, params, pct=10.0):
+    """One-at-a-time ±pct% perturbation of each parameter, evaluated in a single broadcast call.
+
+    Returns (low, high) total cost arrays of shape (technologies, len(params)).
+    """
+    n = len(params)
+    overrides = {}
+    for i, param in enumerate(params):
+        values = np.full(2 * n, float(base_value(scenario, param)))
+        values[2 * i] *= 1 - pct / 100
+        values[2 * i + 1] *= 1 + pct / 100
+        if param == "project_lifetime":
+            values = np.round(values)
+        overrides[param] = values
+    total_costs = evaluate(scenario, overrides)["total_costs"]
+    return total_costs[:, 0::2], total_costs[:, 1::2]
+
+
+def crossover_points(values, total_costs, systems):
+    """Points along a 1-D sweep where the cheapest technology changes.
+
+    total_costs has shape (technologies, len(values)); the crossing value is linearly interpolated between
+    the two grid points on either side of the change.
+    """
+    values = np.asarray(values, dtype=float)
+    cheapest = np.argmin(total_costs, axis=0)
+    crossings = []
+    for j in np.flatnonzero(cheapest[1:] != cheapest[:-1]):
+        a, b = cheapest[j], cheapest[j + 1]
+        gap = total_costs[a] - total_costs[b]
+        # gap goes from <= 0 at j to > 0 at j + 1
+        t = gap[j] / (gap[j] - gap[j + 1]) if gap[j] != gap[j + 1] else 0.0
+        crossings.append({
+            "value": float(values[j] + t * (values[j + 1] - values[j])),
+            "from": systems[a],
+            "to": systems[b],
+        })
+    return crossings
+
+
+def cube_to_frame(cube, systems):
+    # Long-format table of a grid sweep: one row per grid point and technology
+    import pandas as pd
+
+    names = [parameter_label(param) for param in cube["axes"]]
+    grids = np.meshgrid(*cube["axes"].values(), indexing="ij")
+    n_tech = len(systems)
+    frame = {name: np.tile(grid.ravel(), n_tech) for name, grid in zip(names, grids)}
+    frame["System"] = np.repeat(systems, grids[0].size)
+    frame["Total Cost (£)"] = cube["total_costs"].reshape(n_tech, -1).ravel()
+    frame["Annual Emission (CO2e)"] = cube["emissions"].reshape(n_tech, -1).ravel()
+    return pd.DataFrame(frame)
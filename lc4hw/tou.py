@@ -0,0 +1,133 @@
+#Half-hourly time-of-use simulation of a hot water tank.
+#The tank energy balance (heater input, standing losses, draw-offs) is stepped over the 17,520 half-hour
+#slots of a year for all technologies x tariff scenarios at once; the tariff and demand pattern repeat every
+#year, so the project lifetime follows from the annual result and the price escalation rates.
+#
+#Tariff tables and demand profiles are local CSV files with a `slot` column and either 48 rows (one day,
+#repeated) or 17,520 rows (a full year). Every other numeric column of a tariff file is one tariff scenario
+#in £/kWh; a demand profile has a `fraction` column giving the share of the daily draw-off in each slot.
+
+import numpy as np
+
+from lc4hw.engine import energy_per_tank_kwh, escalation_factors
+
+slots_per_day = 48
+slots_per_year = 365 * slots_per_day
+slot_hours = 0.5
+
+
+def _read_table(path):
+    # Structured array of the CSV; non-numeric columns (like a time label) are read as NaN and ignored
+    table = np.genfromtxt(path, delimiter=",", names=True, dtype=float, encoding="utf-8")
+    return np.atleast_1d(table)
+
+
+def _expand_to_year(values, name):
+    values = np.asarray(values, dtype=float)
+    if len(values) == slots_per_day:
+        return np.tile(values, 365)
+    if len(values) == slots_per_year:
+        return values
+    raise ValueError(f"{name} must have {slots_per_day} or {slots_per_year} rows, not {len(values)}")
+
+
+def load_tariffs(path):
+    """Tariff scenarios from a CSV file as (names, prices) with prices of shape (17520, scenarios)."""
+    table = _read_table(path)
+    names = [name for name in table.dtype.names if name != "slot" and not np.isnan(table[name]).all()]
+    prices = np.stack([_expand_to_year(table[name], path) for name in names], axis=1)
+    return names, prices
+
+
+def load_demand_profile(path):
+    """Share of the daily draw-off in each half-hour slot of the year, shape (17520,); every day sums to 1."""
+    table = _read_table(path)
+    fraction = _expand_to_year(table["fraction"], path)
+    daily = fraction.reshape(365, slots_per_day)
+    return (daily / daily.sum(axis=1, keepdims=True)).ravel()
+
+
+def simulate_tank(demand_kwh, prices, capacity_kwh, power_kw, efficiency, standing_loss_kwh_per_day,
+                  offpeak_only, reserve_fraction=0.3):
+    """Step the tank energy balance over every slot for all technologies x scenarios at once.
+
+    demand_kwh: heat drawn off per slot, shape (slots,) or (slots, scenarios).
+    prices: £ per kWh of heater input for each slot, shape (slots, technologies or 1, scenarios).
+    capacity_kwh: heat stored by a full tank above the cold water temperature.
+    power_kw, efficiency, offpeak_only: per technology, shape (technologies,). Heaters flagged offpeak_only
+    run only in the slots at their tariff's lowest price (its off-peak band), unless the tank falls below
+    `reserve_fraction` of capacity; the others keep the tank topped up whenever it is not full.
+    Standing losses are proportional to the stored heat and equal standing_loss_kwh_per_day for a full tank.
+
+    Returns a dict with per-slot heater input (kWh), stored heat at the end of each slot, and annual
+    input energy, standing losses and unmet demand per technology and scenario.
+    """
+    n_slots = len(demand_kwh)
+    power_kw = np.asarray(power_kw, dtype=float)[:, None]
+    efficiency = np.asarray(efficiency, dtype=float)[:, None]
+    offpeak_only = np.asarray(offpeak_only, dtype=bool)[:, None]
+    prices = np.asarray(prices, dtype=float)
+    prices = np.broadcast_to(prices, (n_slots, len(power_kw), prices.shape[2]))
+    demand_kwh = np.asarray(demand_kwh, dtype=float).reshape(n_slots, 1, -1)
+
+    # Slots in which each off-peak heater may run, decided from its own tariff
+    allowed = (prices <= prices.min(axis=0)) | ~offpeak_only
+
+    keep = 1 - standing_loss_kwh_per_day / capacity_kwh / slots_per_day
+    max_heat = power_kw * slot_hours * efficiency
+    reserve = reserve_fraction * capacity_kwh
+
+    stored = np.full(prices.shape[1:], float(capacity_kwh))
+    heat_in = np.empty(prices.shape)
+    state = np.empty(prices.shape)
+    unmet = np.zeros(prices.shape[1:])
+    losses = np.zeros(prices.shape[1:])
+    for t in range(n_slots):
+        on = allowed[t] | (stored < reserve)
+        heat = np.where(on, np.minimum(max_heat, capacity_kwh - stored), 0.0)
+        stored = stored + heat
+        loss = stored * (1 - keep)
+        stored = stored - loss - demand_kwh[t]
+        unmet -= np.minimum(stored, 0.0)
+        stored = np.maximum(stored, 0.0)
+        heat_in[t] = heat
+        state[t] = stored
+        losses += loss
+
+    input_kwh = heat_in / efficiency
+    return {
+        "input_kwh": input_kwh,
+        "stored_kwh": state,
+        "annual_input_kwh": input_kwh.sum(axis=0),
+        "annual_cost": (input_kwh * prices).sum(axis=0),
+        "standing_loss_kwh": losses,
+        "unmet_kwh": unmet,
+    }
+
+
+def simulate_lifetime(tank_size, hot_temp, cold_temp, daily_draw_litres, demand_profile, tariff_prices,
+                      uses_tariff, flat_prices, power_kw, efficiency, escalation_rates, project_lifetime,
+                      standing_loss_kwh_per_day=1.5, offpeak_only=None):
+    """Time-of-use running costs of each technology under each tariff scenario over the project lifetime.
+
+    Technologies with uses_tariff=True pay the half-hourly tariff (electric boiler, heat pump); the others pay
+    their flat fuel price per kWh of input (LPG, hydrogen). Off-peak-only control defaults to the tariff users.
+    Returns the simulate_tank() results plus annual_costs (technologies, scenarios, years) and total_cost.
+    """
+    capacity_kwh = float(energy_per_tank_kwh(tank_size, hot_temp, cold_temp))
+    litre_kwh = capacity_kwh / tank_size
+    demand_kwh = np.asarray(demand_profile, dtype=float) * daily_draw_litres * litre_kwh
+
+    uses_tariff = np.asarray(uses_tariff, dtype=bool)
+    tariff_prices = np.asarray(tariff_prices, dtype=float)
+    prices = np.where(uses_tariff[None, :, None], tariff_prices[:, None, :],
+                      np.asarray(flat_prices, dtype=float)[None, :, None])
+    if offpeak_only is None:
+        offpeak_only = uses_tariff
+
+    result = simulate_tank(demand_kwh, prices, capacity_kwh, power_kw, efficiency, standing_loss_kwh_per_day, offpeak_only)
+    growth = escalation_factors(np.asarray(escalation_rates, dtype=float)[:, None], project_lifetime)
+    result["annual_costs"] = result["annual_cost"][..., None] * growth
+    result["total_cost"] = result["annual_costs"].sum(axis=-1)
+    result["capacity_kwh"] = capacity_kwh
+    return result
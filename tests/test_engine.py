@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from lc4hw.core import calculate_lifecycle_cost, calculate_running_costs
+from lc4hw.engine import specific_heat_capacity, kJ_to_kwh
+
+
+def loop_lifecycle_cost(price, esc_rate, required_energy, project_lifetime, efficiency=1.0):
+    # The per-year loop of the original LPG vs Electric page
+    total_cost = 0
+    current_price = price
+    for _ in range(project_lifetime):
+        total_cost += (required_energy / efficiency) * current_price
+        current_price *= (1 + esc_rate)
+    return total_cost
+
+
+def loop_running_costs(tank_size, hot_temp, cold_temp, efficiency, fuel_cost, escalation_rate, project_lifetime, heating_days, heating_days_topup):
+    # The per-year loop of the original Main Calculator
+    annual_energy_kWh = tank_size * (hot_temp - cold_temp) * specific_heat_capacity * kJ_to_kwh * (heating_days + heating_days_topup)
+    annual_costs = []
+    total_cost = 0
+    for year in range(1, project_lifetime + 1):
+        cost = (annual_energy_kWh / efficiency) * fuel_cost
+        total_cost += cost
+        annual_costs.append(cost)
+        fuel_cost *= (1 + escalation_rate / 100)
+    return annual_costs, total_cost
+
+
+@pytest.mark.parametrize("esc_rate", [0.0, 0.04, -0.02])
+@pytest.mark.parametrize("project_lifetime", [0, 1, 15, 40, -2])
+def test_lifecycle_cost_matches_loop(esc_rate, project_lifetime):
+    expected = loop_lifecycle_cost(0.6, esc_rate, 1000, project_lifetime, 0.9)
+    assert calculate_lifecycle_cost(0.6, esc_rate, 1000, project_lifetime, 0.9) == pytest.approx(expected, rel=1e-12, abs=1e-9)
+
+
+@pytest.mark.parametrize("escalation_rate", [0.0, 3.0])
+@pytest.mark.parametrize("project_lifetime", [0, 1, 15])
+def test_running_costs_match_loop(escalation_rate, project_lifetime):
+    inputs = (200, 60, 10, 3.0, 0.25, escalation_rate, project_lifetime, 300, 20)
+    annual, total = loop_running_costs(*inputs)
+    frame, total_cost, _ = calculate_running_costs(*inputs)
+    assert np.allclose(frame["Cost"], annual, rtol=1e-12)
+    assert total_cost == pytest.approx(total, rel=1e-12, abs=1e-9)
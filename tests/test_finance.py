@@ -0,0 +1,14 @@
+import numpy as np
+import pytest
+
+from lc4hw.finance import monthly_payment
+
+
+def test_monthly_payment_matches_annuity_formula():
+    r, n = 0.05 / 12, 120
+    assert monthly_payment(10_000, 0.05, 10) == pytest.approx(10_000 * r / (1 - (1 + r) ** -n), rel=1e-12)
+    assert monthly_payment(1_200, 0.0, 1) == pytest.approx(100.0)
+
+
+def test_monthly_payment_has_no_value_without_a_term():
+    assert np.all(np.isnan(monthly_payment(10_000, 0.05, [0, -1])))
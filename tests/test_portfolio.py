@@ -0,0 +1,17 @@
+import io
+
+import pyarrow.parquet as pq
+
+from lc4hw.portfolio import process_portfolio
+
+
+def test_parquet_output_with_mixed_site_ids_across_chunks():
+    # Numeric ids in the first chunk and text ids in a later one must still share one Parquet schema
+    sites = io.StringIO("site_id,tank_size,efficiencies[Heat Pump]\n1,200,3.0\n2,,\nB7,300,2.5\n")
+    output = io.BytesIO()
+    stats = process_portfolio(sites, output, chunk_size=2, output_format="parquet")
+    output.seek(0)
+    table = pq.read_table(output)
+    assert stats["rows"] == 3
+    assert table.column("site_id").to_pylist() == ["1", "2", "B7"]
+    assert "" not in table.column("Cheapest Technology").to_pylist()
@@ -0,0 +1,19 @@
+import os
+
+import numpy as np
+
+from lc4hw.defaults import main_calculator_defaults as defaults
+from lc4hw.tou import load_demand_profile, load_tariffs, simulate_lifetime
+
+data = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def test_economy7_beats_flat_for_offpeak_heater():
+    names, prices = load_tariffs(os.path.join(data, "tariffs.csv"))
+    profile = load_demand_profile(os.path.join(data, "demand_profile.csv"))
+    # One off-peak-only Electric Boiler at 3 kW
+    sim = simulate_lifetime(defaults["tank_size"], defaults["hot_temp"], defaults["cold_temp"], 320.0, profile, prices,
+                            [True], [defaults["fuel_costs"]["Electric Boiler"]], [3.0], [1.0], [0.0], 1)
+    annual = sim["annual_cost"][0]
+    assert annual[names.index("economy7")] < annual[names.index("flat")]
+    assert np.all(sim["unmet_kwh"] < 1e-6 * sim["annual_input_kwh"].max())